@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+"""Validate sales funnel configs against the config-parser-rules.
+
+Each file is parsed once with `json`. Every `system_prompt` (the router and
+each stage) is its own scope: a symbol table of the `variables` it defines and
+the `{name}` references its prompt makes. Prompts and variable values are
+scanned by a single-pass tokenizer (no regex, linear in the text length),
+which classifies each `{...}` as a variable, dotted name, index access,
+double-braced or invalid name.
+
+Findings (severity / code):
+  error    json, schema, undefined, cross_stage, dotted, indexed, nested, non_scalar
+  warning  unused, double_braces, invalid_name, bad_definition_name
+
+Usage:
+  python validate_config.py bildanov_config.json
+  python validate_config.py "Sales AI/configs" --workers 8 --format jsonl > report.jsonl
+  python validate_config.py configs/ --format text [--strict]
+
+Exit code is 1 when any file has errors (or warnings with --strict).
+"""
+import argparse
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+NAME_CHARS = frozenset('abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789_')
+# A `{` not closed within this many characters (or before a newline) is literal text.
+MAX_TOKEN = 128
+# Braces around text containing these are prose/JSON examples, not attempted variables.
+LITERAL_HINTS = frozenset('"\':{}\n\t')
+
+REQUIRED_TOP = ('company_name', 'router', 'stages')
+REQUIRED_STAGE = {'enabled': bool, 'model': str, 'system_prompt': dict, 'required_fields': dict}
+
+FIXES = {
+    'undefined': 'Add "{name}" to {scope}.variables or fix the typo in the prompt.',
+    'cross_stage': 'Variables are stage-local: duplicate "{name}" into {scope}.variables.',
+    'dotted': 'Flatten the object: use {{{flat}}} and define "{flat}" in variables.',
+    'indexed': 'Flatten the list into numbered variables, e.g. {{{flat}}}.',
+    'nested': 'The parser does one pass: inline the value or reference both variables in the prompt.',
+    'non_scalar': 'Variable values must be strings; flatten into separate variables.',
+    'unused': 'Remove "{name}" from {scope}.variables.',
+    'double_braces': 'Use single braces: {{{name}}}.',
+    'invalid_name': 'Names may only contain letters, digits and underscores.',
+    'bad_definition_name': 'Rename to letters, digits and underscores only.',
+    'encoding': 'Re-save the file as UTF-8.',
+}
+
+
+def tokenize(text):
+    """Yield (kind, name, offset) for each `{...}` in `text`, in one left-to-right pass.
+
+    kind is `var`, `dotted`, `indexed`, `double` or `invalid`; braces that
+    look like literal text (multi-line, quotes, colons, unclosed) yield nothing.
+    """
+    n = len(text)
+    i = text.find('{')
+    while i != -1:
+        if i + 1 < n and text[i + 1] == '{':
+            end = text.find('}}', i + 2, i + 2 + MAX_TOKEN)
+            inner = text[i + 2:end] if end != -1 else ''
+            if inner and all(c in NAME_CHARS for c in inner):
+                yield 'double', inner, i
+                i = text.find('{', end + 2)
+            else:
+                i = text.find('{', i + 2)
+            continue
+        j = i + 1
+        limit = min(n, i + 1 + MAX_TOKEN)
+        plain = dots = brackets = True
+        has_dot = has_bracket = False
+        literal = False
+        while j < limit:
+            c = text[j]
+            if c == '}' or c == '{':
+                break
+            if c in NAME_CHARS:
+                pass
+            elif c == '.':
+                has_dot = True
+                plain = False
+            elif c in '[]':
+                has_bracket = True
+                plain = dots = False
+            else:
+                plain = dots = brackets = False
+                if c in LITERAL_HINTS:
+                    literal = True
+                    break
+            j += 1
+        if j < n and text[j] == '}' and j > i + 1 and not literal:
+            name = text[i + 1:j]
+            if plain:
+                yield 'var', name, i
+            elif has_bracket and brackets:
+                yield 'indexed', name, i
+            elif has_dot and dots:
+                yield 'dotted', name, i
+            else:
+                yield 'invalid', name, i
+            i = text.find('{', j + 1)
+        else:
+            # Resume at the next brace: never rescan characters already seen.
+            i = text.find('{', j if j < n and text[j] == '{' else j + 1)
+
+
+def flat_name(name):
+    """`pricing.basic` -> `pricing_basic`, `users[0].name` -> `users_0_name`."""
+    out = []
+    for c in name:
+        if c in NAME_CHARS:
+            out.append(c)
+        elif out and out[-1] != '_':
+            out.append('_')
+    return ''.join(out).strip('_')
+
+
+class Report:
+    def __init__(self, path):
+        self.path = str(path)
+        self.findings = []
+        self.checks = 0
+
+    def add(self, severity, code, where, message, name=None, scope=None, offset=None):
+        item = {'severity': severity, 'code': code, 'path': where, 'message': message}
+        if name is not None:
+            item['variable'] = name
+        if offset is not None:
+            item['offset'] = offset
+        fix = FIXES.get(code)
+        if fix:
+            item['fix'] = fix.format(name=name or '', scope=scope or '', flat=flat_name(name or ''))
+        self.findings.append(item)
+
+    def result(self):
+        errors = sum(1 for f in self.findings if f['severity'] == 'error')
+        return {
+            'file': self.path,
+            'ok': errors == 0,
+            'errors': errors,
+            'warnings': len(self.findings) - errors,
+            'checks': self.checks,
+            'findings': self.findings,
+        }
+
+
+def collect_scopes(config, report, base):
+    """Return {scope: (json_path, system_prompt dict)} and check the schema on the way."""
+    scopes = {}
+    for key in REQUIRED_TOP:
+        report.checks += 1
+        if key not in config:
+            report.add('error', 'schema', base.rstrip('.') or '$', f'missing required field "{key}"')
+    router = config.get('router')
+    if isinstance(router, dict) and isinstance(router.get('system_prompt'), dict):
+        scopes['router'] = (f'{base}router.system_prompt', router['system_prompt'])
+    stages = config.get('stages')
+    if stages is not None and not isinstance(stages, dict):
+        report.add('error', 'schema', f'{base}stages', '"stages" must be an object')
+        return scopes
+    for stage, body in (stages or {}).items():
+        where = f'{base}stages.{stage}'
+        if not isinstance(body, dict):
+            report.add('error', 'schema', where, 'stage must be an object')
+            continue
+        for key, typ in REQUIRED_STAGE.items():
+            report.checks += 1
+            if key not in body:
+                report.add('error', 'schema', where, f'missing required field "{key}"')
+            elif not isinstance(body[key], typ):
+                report.add('error', 'schema', f'{where}.{key}', f'"{key}" must be {typ.__name__}')
+        if isinstance(body.get('system_prompt'), dict):
+            scopes[stage] = (f'{where}.system_prompt', body['system_prompt'])
+    return scopes
+
+
+def check_scope(scope, where, prompt_obj, defined_in, report):
+    """Symbol-table checks for one system_prompt; `defined_in` maps name -> scopes defining it."""
+    prompt = prompt_obj.get('prompt')
+    variables = prompt_obj.get('variables', {})
+    report.checks += 1
+    if not isinstance(prompt, str):
+        report.add('error', 'schema', f'{where}.prompt', '"prompt" must be a string')
+        prompt = ''
+    if not isinstance(variables, dict):
+        report.add('error', 'schema', f'{where}.variables', '"variables" must be an object')
+        variables = {}
+
+    used = set()
+    for kind, name, offset in tokenize(prompt):
+        report.checks += 1
+        if kind == 'var':
+            used.add(name)
+            if name in variables:
+                continue
+            others = [s for s in defined_in.get(name, ()) if s != scope]
+            if others:
+                report.add('error', 'cross_stage', f'{where}.prompt',
+                           f'{{{name}}} is defined in {", ".join(others)}, not in {scope}',
+                           name, where, offset)
+            else:
+                report.add('error', 'undefined', f'{where}.prompt', f'{{{name}}} is not defined',
+                           name, where, offset)
+        elif kind == 'dotted':
+            used.add(name.split('.', 1)[0])
+            report.add('error', 'dotted', f'{where}.prompt', f'dot notation {{{name}}} is not supported',
+                       name, where, offset)
+        elif kind == 'indexed':
+            used.add(name.split('[', 1)[0])
+            report.add('error', 'indexed', f'{where}.prompt', f'index access {{{name}}} is not supported',
+                       name, where, offset)
+        elif kind == 'double':
+            report.add('warning', 'double_braces', f'{where}.prompt',
+                       f'{{{{{name}}}}} is literal text, not a variable', name, where, offset)
+        else:
+            report.add('warning', 'invalid_name', f'{where}.prompt',
+                       f'{{{name}}} is not a valid variable name and stays literal', name, where, offset)
+
+    for name, value in variables.items():
+        vpath = f'{where}.variables.{name}'
+        report.checks += 2
+        if not name or any(c not in NAME_CHARS for c in name):
+            report.add('warning', 'bad_definition_name', vpath, f'"{name}" can never be referenced', name, where)
+        if isinstance(value, (dict, list)):
+            report.add('error', 'non_scalar', vpath, f'"{name}" is {type(value).__name__}, not a string',
+                       name, where)
+            continue
+        if isinstance(value, str):
+            for kind, ref, offset in tokenize(value):
+                if kind in ('var', 'dotted', 'indexed'):
+                    report.add('error', 'nested', vpath, f'value of "{name}" references {{{ref}}}',
+                               name, where, offset)
+                    break
+        if name not in used:
+            report.add('warning', 'unused', vpath, f'"{name}" is defined but not used in the prompt',
+                       name, where)
+
+
+def validate_data(data, path='<config>'):
+    report = Report(path)
+    report.checks += 1
+    if not isinstance(data, dict):
+        report.add('error', 'schema', '$', 'config must be a JSON object')
+        return report.result()
+    if isinstance(data.get('config'), dict):
+        config, base = data['config'], 'config.'
+        report.checks += 1
+        if 'agent_name' not in data:
+            report.add('error', 'schema', '$', 'missing required field "agent_name"')
+    else:
+        config, base = data, ''
+    scopes = collect_scopes(config, report, base)
+    defined_in = {}
+    for scope, (_, obj) in scopes.items():
+        variables = obj.get('variables')
+        if isinstance(variables, dict):
+            for name in variables:
+                defined_in.setdefault(name, []).append(scope)
+    for scope, (where, obj) in scopes.items():
+        check_scope(scope, where, obj, defined_in, report)
+    return report.result()
+
+
+def validate_file(path):
+    """Validate one config file; unreadable files become an `io`, `encoding` or `json` finding."""
+    try:
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        report = Report(path)
+        report.checks += 1
+        report.add('error', 'json', f'line {e.lineno}, column {e.colno}', e.msg)
+        return report.result()
+    except UnicodeDecodeError as e:
+        report = Report(path)
+        report.checks += 1
+        report.add('error', 'encoding', f'byte {e.start}', f'not valid UTF-8: {e.reason}')
+        return report.result()
+    except OSError as e:
+        report = Report(path)
+        report.checks += 1
+        report.add('error', 'io', '$', e.strerror or str(e))
+        return report.result()
+    return validate_data(data, path)
+
+
+def iter_configs(paths):
+    for raw in paths:
+        if os.path.isdir(raw):
+            for dirpath, dirnames, filenames in os.walk(raw):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith('.') and d != 'node_modules')
+                for name in sorted(filenames):
+                    if name.endswith('.json'):
+                        yield os.path.join(dirpath, name)
+        else:
+            yield raw
+
+
+def validate_many(paths, workers=None, chunksize=64):
+    """Yield results in input order; thousands of files are spread over a process pool."""
+    paths = list(paths)
+    if workers == 1 or len(paths) < 2 * chunksize:
+        yield from map(validate_file, paths)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(validate_file, paths, chunksize=chunksize)
+
+
+def format_text(result):
+    lines = [f"## Validation Report: {result['file']}", '']
+    if result['ok'] and not result['warnings']:
+        lines.append(f"✅ PASSED ({result['checks']} checks)")
+    else:
+        lines.append(f"{'✅' if result['ok'] else '❌'} {result['errors']} error(s), "
+                     f"{result['warnings']} warning(s), {result['checks']} checks")
+    for f in result['findings']:
+        icon = '❌' if f['severity'] == 'error' else '⚠️'
+        lines.append(f"- {icon} [{f['code']}] {f['path']}: {f['message']}")
+        if f.get('fix'):
+            lines.append(f"  Fix: {f['fix']}")
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    p = argparse.ArgumentParser(description='Validate sales funnel configs (config-parser-rules)')
+    p.add_argument('paths', nargs='+', help='Config JSON files or directories')
+    p.add_argument('--workers', type=int, help='Process pool size (default: CPU count)')
+    p.add_argument('--format', choices=('json', 'jsonl', 'text'), default='json')
+    p.add_argument('--strict', action='store_true', help='Treat warnings as failures')
+    p.add_argument('--quiet', action='store_true', help='Only report files with findings')
+    args = p.parse_args()
+
+    failed = total = 0
+    summary = {'files': 0, 'failed': 0, 'errors': 0, 'warnings': 0, 'by_code': {}}
+    results = []
+    for result in validate_many(iter_configs(args.paths), args.workers):
+        total += 1
+        bad = result['errors'] or (args.strict and result['warnings'])
+        failed += bool(bad)
+        summary['errors'] += result['errors']
+        summary['warnings'] += result['warnings']
+        for f in result['findings']:
+            summary['by_code'][f['code']] = summary['by_code'].get(f['code'], 0) + 1
+        if args.quiet and not result['findings']:
+            continue
+        if args.format == 'jsonl':
+            print(json.dumps(result, ensure_ascii=False), flush=True)
+        elif args.format == 'text':
+            print(format_text(result))
+        else:
+            results.append(result)
+    summary.update(files=total, failed=failed)
+
+    if args.format == 'json':
+        print(json.dumps({'summary': summary, 'results': results}, ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps(summary, ensure_ascii=False), file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
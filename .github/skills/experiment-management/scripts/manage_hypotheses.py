@@ -4,15 +4,58 @@
 Usage:
   python manage_hypotheses.py create "Title" --owner "Name" --segment "persona"
   python manage_hypotheses.py update path/to/hypothesis.md --status complete --insight "..."
+  python manage_hypotheses.py batch updates.jsonl   # {"path": ..., "status": ..., "insight": ...} per line
+  python manage_hypotheses.py list --status running
+  python manage_hypotheses.py query --status running --segment "persona" --since 2026-01-01 [--json]
+
+Frontmatter of all hypothesis files is indexed in a SQLite registry
+(`experiments/.registry.sqlite`), kept in sync incrementally by mtime/size and
+on every create/update, so list/query do not read every file.
+
+Updates are safe for parallel CI jobs: they hold a per-directory file lock,
+edit only the frontmatter block via an atomic rename, and append insights with
+a single append write.
 """
 import argparse
+import contextlib
+import json
 import os
 import datetime
+import importlib.util
+import shutil
+import sqlite3
+import tempfile
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
 
 
 BASE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), '..', '..', '..')
 KB_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), '..', '..', '..', 'knowledge-base'))
 EXPERIMENTS_DIR = os.path.join(os.path.dirname(KB_DIR), 'knowledge-base', 'experiments')
+REGISTRY_PATH = os.path.join(EXPERIMENTS_DIR, '.registry.sqlite')
+REGISTRY_FIELDS = ('title', 'author', 'date_created', 'status', 'owner', 'segment')
+# Shared modules from skill-creator/scripts (compiled template engine, frontmatter
+# reader); optional, so the skill still works when packaged on its own: hypotheses
+# are then rendered with str.format and frontmatter is read by _parse_flat_frontmatter.
+SHARED_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'skill-creator', 'scripts')
+
+
+def _load_shared(name):
+    try:
+        spec = importlib.util.spec_from_file_location(name, os.path.join(SHARED_DIR, name + '.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except (OSError, ImportError):
+        return None
+    return module
+
+
+templating = _load_shared('templating')
+frontmatter = _load_shared('frontmatter')
 
 
 def ensure_dir(path):
@@ -23,16 +66,8 @@ def slugify(s):
     return ''.join(c if c.isalnum() else '-' for c in s).lower()
 
 
-def create_hypothesis(title, owner, segment):
-    ensure_dir(EXPERIMENTS_DIR)
-    date = datetime.date.today().isoformat()
-    filename = f"{date}-{slugify(title)}.md"
-    path = os.path.join(EXPERIMENTS_DIR, filename)
-    if os.path.exists(path):
-        print('Hypothesis already exists:', path)
-        return path
-    content = f"""---
-title: \"{title}\"
+HYPOTHESIS_TEMPLATE = '''---
+title: "{title}"
 author: {owner}
 date_created: {date}
 status: draft
@@ -65,29 +100,287 @@ segment: {segment}
 - Decision: 
 - Next steps: 
 
-"""
+'''
+
+if templating:
+    render_hypothesis = templating.Template(
+        HYPOTHESIS_TEMPLATE, names={'title', 'owner', 'segment', 'date'}, name='hypothesis').render
+else:
+    render_hypothesis = HYPOTHESIS_TEMPLATE.format
+
+
+def create_hypothesis(title, owner, segment):
+    ensure_dir(EXPERIMENTS_DIR)
+    date = datetime.date.today().isoformat()
+    filename = f"{date}-{slugify(title)}.md"
+    path = os.path.join(EXPERIMENTS_DIR, filename)
+    if os.path.exists(path):
+        print('Hypothesis already exists:', path)
+        return path
+    content = render_hypothesis(title=title, owner=owner, segment=segment, date=date)
     with open(path, 'w', encoding='utf-8') as f:
         f.write(content)
+    register(path)
     print('Created hypothesis:', path)
     return path
 
 
+LOCK_NAME = '.hypotheses.lock'
+
+
+@contextlib.contextmanager
+def file_lock(directory):
+    """Exclusive advisory lock on `<directory>/.hypotheses.lock` (fcntl or msvcrt)."""
+    ensure_dir(directory)
+    with open(os.path.join(directory, LOCK_NAME), 'a+') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def set_frontmatter_fields(text, fields):
+    """Return `text` with `key: value` lines set inside the frontmatter block only.
+
+    Existing keys are replaced in place, missing keys are added before the
+    closing `---`; the body is never touched. A header is created if absent.
+    """
+    lines = text.splitlines(keepends=True)
+    newline = '\r\n' if lines and lines[0].endswith('\r\n') else '\n'
+    if not lines or lines[0].strip() != '---':
+        header = ''.join(f'{k}: {v}{newline}' for k, v in fields.items())
+        return f'---{newline}{header}---{newline}{newline}' + text
+    end = next((i for i in range(1, len(lines)) if lines[i].strip() == '---'), None)
+    if end is None:
+        raise ValueError('Unterminated frontmatter block')
+    pending = dict(fields)
+    for i in range(1, end):
+        key = lines[i].split(':', 1)[0].strip()
+        if ':' in lines[i] and key in pending and not lines[i][:1].isspace():
+            lines[i] = f'{key}: {pending.pop(key)}{newline}'
+    extra = [f'{k}: {v}{newline}' for k, v in pending.items()]
+    return ''.join(lines[:end] + extra + lines[end:])
+
+
+def atomic_write(path, text):
+    """Write `text` to a temp file in the same directory, fsync, then rename over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.tmp-', suffix='.md', dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def _apply_update(path, status=None, insight=None):
+    """Apply one update; caller holds the lock. Header edits are atomic, insights are appends."""
+    if status:
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            txt = f.read()
+        atomic_write(path, set_frontmatter_fields(txt, {'status': status}))
+    if insight:
+        # A single O_APPEND write: no read-modify-write of the body.
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(f"\n\n### Update {datetime.date.today().isoformat()}\n{insight}\n")
+
+
 def update_hypothesis(path, status=None, insight=None):
     if not os.path.exists(path):
         print('Not found:', path)
         return
-    with open(path, 'r', encoding='utf-8') as f:
-        txt = f.read()
-    if status:
-        txt = txt.replace('status: draft', f'status: {status}')
-        txt = txt.replace('status: running', f'status: {status}')
-    if insight:
-        txt += f"\n\n### Update {datetime.date.today().isoformat()}\n{insight}\n"
-    with open(path, 'w', encoding='utf-8') as f:
-        f.write(txt)
+    with file_lock(os.path.dirname(os.path.abspath(path))):
+        _apply_update(path, status=status, insight=insight)
+        register(path)
     print('Updated hypothesis:', path)
 
 
+def update_many(updates):
+    """Apply many updates in one pass.
+
+    `updates` is an iterable of dicts with `path` and optional `status` /
+    `insight`. Updates are grouped per file (last status wins, insights are
+    concatenated), each directory is locked once, and the registry is
+    refreshed in a single transaction. Returns the list of updated paths.
+    """
+    merged = {}
+    for u in updates:
+        entry = merged.setdefault(os.path.abspath(u['path']), {'status': None, 'insights': []})
+        if u.get('status'):
+            entry['status'] = u['status']
+        if u.get('insight'):
+            entry['insights'].append(u['insight'])
+    by_dir = {}
+    for path, entry in merged.items():
+        by_dir.setdefault(os.path.dirname(path), []).append((path, entry))
+
+    done = []
+    for directory, items in by_dir.items():
+        with file_lock(directory):
+            for path, entry in items:
+                if not os.path.exists(path):
+                    print('Not found:', path)
+                    continue
+                insight = '\n\n'.join(entry['insights']) or None
+                _apply_update(path, status=entry['status'], insight=insight)
+                done.append(path)
+            register(*[p for p, _ in items if p in done])
+    return done
+
+
+def _parse_flat_frontmatter(path):
+    """Flat `key: value` frontmatter block; used when the shared reader is absent."""
+    meta = {}
+    with open(path, 'r', encoding='utf-8-sig') as f:
+        if f.readline().strip() != '---':
+            return meta
+        for line in f:
+            line = line.strip()
+            if line == '---':
+                break
+            key, sep, value = line.partition(':')
+            if not sep:
+                continue
+            value = value.strip()
+            if len(value) >= 2 and value[0] == value[-1] and value[0] in '"\'':
+                value = value[1:-1]
+            meta[key.strip()] = value
+    return meta
+
+
+def read_frontmatter(path):
+    """Frontmatter of a hypothesis file as text fields ({} if absent or unparsable)."""
+    if frontmatter is None:
+        return _parse_flat_frontmatter(path)
+    try:
+        meta = frontmatter.load_frontmatter(path)
+    except Exception as e:  # YAML errors, or PyYAML missing for non-flat frontmatter
+        print(f'Unreadable frontmatter in {path}: {e}')
+        return {}
+    if not isinstance(meta, dict):
+        return {}
+    return {k: None if v is None else str(v) for k, v in meta.items()}
+
+
+def open_registry(path=None):
+    path = path or REGISTRY_PATH
+    ensure_dir(os.path.dirname(path))
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE IF NOT EXISTS hypotheses (
+            path TEXT PRIMARY KEY, mtime_ns INTEGER, size INTEGER,
+            title TEXT, author TEXT, date_created TEXT, status TEXT, owner TEXT, segment TEXT
+        );
+        CREATE INDEX IF NOT EXISTS hyp_status ON hypotheses(status);
+        CREATE INDEX IF NOT EXISTS hyp_owner ON hypotheses(owner);
+        CREATE INDEX IF NOT EXISTS hyp_segment ON hypotheses(segment);
+        CREATE INDEX IF NOT EXISTS hyp_date ON hypotheses(date_created);
+    """)
+    return conn
+
+
+def _index_file(conn, path, st=None):
+    st = st or os.stat(path)
+    meta = read_frontmatter(path)
+    conn.execute(
+        'INSERT OR REPLACE INTO hypotheses(path, mtime_ns, size, title, author, date_created, status, owner, segment) '
+        'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+        (os.path.basename(path), st.st_mtime_ns, st.st_size) + tuple(meta.get(k) for k in REGISTRY_FIELDS),
+    )
+
+
+def sync_registry(conn, experiments_dir=None):
+    """Re-index new/changed hypothesis files and drop deleted ones."""
+    experiments_dir = experiments_dir or EXPERIMENTS_DIR
+    known = {row[0]: (row[1], row[2]) for row in conn.execute('SELECT path, mtime_ns, size FROM hypotheses')}
+    seen = set()
+    with conn:
+        for entry in os.scandir(experiments_dir):
+            if not entry.is_file() or not entry.name.endswith('.md') or entry.name.lower() == 'readme.md':
+                continue
+            seen.add(entry.name)
+            st = entry.stat()
+            if known.get(entry.name) != (st.st_mtime_ns, st.st_size):
+                _index_file(conn, entry.path, st)
+        for name in known.keys() - seen:
+            conn.execute('DELETE FROM hypotheses WHERE path = ?', (name,))
+
+
+def register(*paths):
+    """Update the registry entries for hypothesis files after create/update."""
+    experiments_dir = os.path.abspath(EXPERIMENTS_DIR)
+    paths = [p for p in paths if os.path.dirname(os.path.abspath(p)) == experiments_dir]
+    if not paths:
+        return
+    conn = open_registry()
+    try:
+        with conn:
+            for path in paths:
+                _index_file(conn, path)
+    finally:
+        conn.close()
+
+
+def query_hypotheses(status=None, owner=None, segment=None, since=None, until=None, sync=True):
+    """Return registry rows (dicts) matching all given filters, newest first.
+
+    `since`/`until` are ISO dates compared against `date_created`.
+    """
+    conn = open_registry()
+    try:
+        if sync:
+            sync_registry(conn)
+        clauses, params = [], []
+        for column, value in (('status', status), ('owner', owner), ('segment', segment)):
+            if value:
+                clauses.append(f'{column} = ?')
+                params.append(value)
+        if since:
+            clauses.append('date_created >= ?')
+            params.append(since)
+        if until:
+            clauses.append('date_created <= ?')
+            params.append(until)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ''
+        rows = conn.execute(
+            f'SELECT path, {", ".join(REGISTRY_FIELDS)} FROM hypotheses {where} ORDER BY date_created DESC, path',
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+    return [dict(zip(('path',) + REGISTRY_FIELDS, row)) for row in rows]
+
+
+def print_hypotheses(rows, as_json=False):
+    if as_json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+        return
+    for r in rows:
+        print(f"{r['date_created'] or '-':<10}  {r['status'] or '-':<9}  {r['owner'] or '-':<12}  "
+              f"{r['segment'] or '-':<16}  {r['title'] or r['path']}  ({r['path']})")
+    print(f'{len(rows)} hypothesis(es)')
+
+
 def main():
     parser = argparse.ArgumentParser()
     sub = parser.add_subparsers(dest='cmd')
@@ -99,12 +392,38 @@ def main():
     p2.add_argument('path')
     p2.add_argument('--status')
     p2.add_argument('--insight')
+    p5 = sub.add_parser('batch')
+    p5.add_argument('file', help='JSONL (or JSON list) of {"path", "status", "insight"} updates')
+    p3 = sub.add_parser('list')
+    p3.add_argument('--status')
+    p3.add_argument('--json', action='store_true')
+    p4 = sub.add_parser('query')
+    p4.add_argument('--status')
+    p4.add_argument('--owner')
+    p4.add_argument('--segment')
+    p4.add_argument('--since', help='date_created >= YYYY-MM-DD')
+    p4.add_argument('--until', help='date_created <= YYYY-MM-DD')
+    p4.add_argument('--json', action='store_true')
 
     args = parser.parse_args()
     if args.cmd == 'create':
         create_hypothesis(args.title, args.owner, args.segment)
     elif args.cmd == 'update':
         update_hypothesis(args.path, status=args.status, insight=args.insight)
+    elif args.cmd == 'batch':
+        with open(args.file, 'r', encoding='utf-8') as f:
+            raw = f.read()
+        if raw.lstrip().startswith('['):
+            updates = json.loads(raw)
+        else:
+            updates = [json.loads(line) for line in raw.splitlines() if line.strip()]
+        done = update_many(updates)
+        print(f'Updated {len(done)} hypothesis file(s)')
+    elif args.cmd == 'list':
+        print_hypotheses(query_hypotheses(status=args.status), args.json)
+    elif args.cmd == 'query':
+        rows = query_hypotheses(args.status, args.owner, args.segment, args.since, args.until)
+        print_hypotheses(rows, args.json)
     else:
         parser.print_help()
 
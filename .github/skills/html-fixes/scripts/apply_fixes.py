@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""Apply html-fixes output (`patches` and `file_changes`) to a site in bulk.
+
+Input is one or more JSON/JSONL files, each holding objects in the html-fixes
+format:
+
+  {"patches": [{"file": "...", "patch": "--- a/...\\n+++ b/...\\n@@ ..."}],
+   "file_changes": [{"file": "...", "before": "...", "after": "...", "note": "..."}]}
+
+Everything is grouped by file first, so each file is read once and written
+once. Unified-diff hunks are applied in offset order: a hunk is looked up at
+its line number shifted by the drift of earlier hunks, then at growing offsets
+(up to `--max-offset` lines), then with up to `--fuzz` context lines dropped
+from each end, like `patch` (never all of it). Hunks that land at an offset or
+need fuzz are listed under `inexact` with their `offset` and `fuzz`. Hunks whose
+result is already present are skipped as applied. `before`/`after` fragments are then located in the patched
+text; each must occur exactly once and fragments may not overlap.
+
+Any conflict leaves the file untouched (unless `--partial`). Writes are atomic
+(temp file + rename) and files are processed in a process pool; the report
+lists every conflict with the hunk, reason and expected line.
+
+Usage:
+  python apply_fixes.py fixes.json --root site/ [--dry-run] [--workers 8]
+  python apply_fixes.py batch1.jsonl batch2.json --root site/ --report conflicts.json
+"""
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HUNK_RE = re.compile(r'^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@')
+MAX_OFFSET = 200
+FUZZ = 2
+
+
+class PatchError(ValueError):
+    """A patch that cannot be parsed."""
+
+
+# -- input ---------------------------------------------------------------------
+def load_fixes(paths):
+    """Collect {file: {"hunks": [...], "changes": [...]}} from html-fixes JSON/JSONL files."""
+    by_file = {}
+    for path in paths:
+        with open(path, encoding='utf-8') as f:
+            if path.endswith('.jsonl'):
+                docs = [json.loads(line) for line in f if line.strip()]
+            else:
+                data = json.load(f)
+                docs = data if isinstance(data, list) else [data]
+        for doc in docs:
+            for entry in doc.get('patches', []):
+                for name, hunks in parse_patch(entry['patch'], entry.get('file')):
+                    by_file.setdefault(name, {'hunks': [], 'changes': []})['hunks'].extend(hunks)
+            for entry in doc.get('file_changes', []):
+                by_file.setdefault(entry['file'], {'hunks': [], 'changes': []})['changes'].append(entry)
+    return by_file
+
+
+def _strip_prefix(name):
+    name = name.split('\t', 1)[0].strip()
+    return name[2:] if name[:2] in ('a/', 'b/') else name
+
+
+def split_lines(text):
+    """Lines with their `\n` kept. Unlike str.splitlines(), only `\n` ends a line,
+    as in diff and in file line numbers: U+2028, `\x0c`, `\x85`... stay inside."""
+    lines = [line + '\n' for line in text.split('\n')]
+    last = lines.pop()[:-1]
+    if last:
+        lines.append(last)
+    return lines
+
+
+def line_body(line):
+    """A line without its `\n` or `\r\n` ending."""
+    if line.endswith('\n'):
+        line = line[:-1]
+    return line[:-1] if line.endswith('\r') else line
+
+
+def parse_patch(text, default_file=None):
+    """Split a unified diff into [(file, [hunk, ...])]; a hunk is {old_start, old, new}."""
+    files = []
+    current = None
+    hunk = None
+    pending_old = None
+    for line in map(line_body, split_lines(text)):
+        if line.startswith('--- ') and (hunk is None or hunk['left'] <= 0):
+            pending_old = _strip_prefix(line[4:])
+            hunk = None
+            continue
+        if line.startswith('+++ ') and pending_old is not None:
+            new = _strip_prefix(line[4:])
+            name = new if new != '/dev/null' else pending_old
+            current = (name, [])
+            files.append(current)
+            pending_old = None
+            continue
+        m = HUNK_RE.match(line)
+        if m:
+            if current is None:
+                if not default_file:
+                    raise PatchError('hunk before any file header and no "file" given')
+                current = (default_file, [])
+                files.append(current)
+            old_len = int(m.group(2)) if m.group(2) is not None else 1
+            hunk = {'old_start': int(m.group(1)), 'old': [], 'new': [], 'left': old_len}
+            current[1].append(hunk)
+            continue
+        if hunk is None or line.startswith('\\'):
+            continue
+        tag, body = line[:1], line[1:]
+        if tag == ' ' or line == '':
+            hunk['old'].append(body)
+            hunk['new'].append(body)
+            hunk['left'] -= 1
+        elif tag == '-':
+            hunk['old'].append(body)
+            hunk['left'] -= 1
+        elif tag == '+':
+            hunk['new'].append(body)
+    if default_file and len(files) == 1:
+        files = [(default_file, files[0][1])]
+    for _, hunks in files:
+        for h in hunks:
+            h.pop('left', None)
+    return files
+
+
+# -- applying --------------------------------------------------------------------
+class Lines:
+    """File lines without line endings, with a line -> positions index for fast lookups."""
+
+    def __init__(self, lines):
+        self.text = [line_body(line) for line in lines]
+        self.where = {}
+        for pos, line in enumerate(self.text):
+            self.where.setdefault(line, []).append(pos)
+
+    def matches(self, pos, block):
+        return pos >= 0 and self.text[pos:pos + len(block)] == block
+
+
+def _search(lines, block, expected, lo, max_offset):
+    """Nearest position >= lo within max_offset of `expected` where `block` matches."""
+    if not block:
+        return max(expected, lo)
+    candidates = [p for p in lines.where.get(block[0], ()) if p >= lo and abs(p - expected) <= max_offset]
+    # Same order as scanning expected, expected-1, expected+1, expected-2, ...
+    for pos in sorted(candidates, key=lambda p: (abs(p - expected), p > expected)):
+        if lines.matches(pos, block):
+            return pos
+    return None
+
+
+def _context_size(hunk, from_end=False):
+    old, new = hunk['old'], hunk['new']
+    n = 0
+    while n < min(len(old), len(new)):
+        i = -1 - n if from_end else n
+        if old[i] != new[i]:
+            break
+        n += 1
+    return n
+
+
+def locate(lines, hunk, expected, lo, max_offset=MAX_OFFSET, fuzz=FUZZ):
+    """Find where a hunk applies: (pos, old_block, new_block, leading lines cut, fuzz) or None.
+
+    Fuzz never drops every context line: a hunk that only matches without any
+    context (e.g. a pure addition) would otherwise be inserted blindly.
+    """
+    lead, trail = _context_size(hunk), _context_size(hunk, from_end=True)
+    for f in range(fuzz + 1):
+        cut_lead, cut_trail = min(f, lead), min(f, trail)
+        if f and (cut_lead == cut_trail == 0 or cut_lead + cut_trail == lead + trail):
+            break
+        old = hunk['old'][cut_lead:len(hunk['old']) - cut_trail]
+        new = hunk['new'][cut_lead:len(hunk['new']) - cut_trail]
+        pos = _search(lines, old, expected + cut_lead, lo, max_offset)
+        if pos is not None:
+            return pos, old, new, cut_lead, f
+    return None
+
+
+def apply_hunks(text, hunks, max_offset=MAX_OFFSET, fuzz=FUZZ):
+    """Apply hunks in offset order. Returns (text, applied, skipped, conflicts).
+
+    `applied` lists each applied hunk as {index, line, offset, fuzz}: `offset` is
+    how many lines from its diff position it landed, `fuzz` how many context
+    lines had to be ignored at each end (both 0 for a clean apply).
+    """
+    lines = split_lines(text)
+    file_lines = Lines(lines)
+    newline = '\r\n' if text.count('\r\n') * 2 > text.count('\n') else '\n'
+    out = []
+    cursor = drift = 0
+    applied = []
+    skipped = 0
+    conflicts = []
+    for index, hunk in sorted(enumerate(hunks), key=lambda ih: ih[1]['old_start']):
+        expected = max(hunk['old_start'] - 1, 0) + drift
+        found = locate(file_lines, hunk, expected, cursor, max_offset, fuzz)
+        if found is None:
+            if hunk['new'] != hunk['old'] and _search(file_lines, hunk['new'], expected, 0, max_offset) is not None:
+                skipped += 1  # the result is already there
+                continue
+            overlap = _search(file_lines, hunk['old'], expected, 0, max_offset) is not None
+            conflicts.append({
+                'kind': 'hunk', 'index': index, 'line': hunk['old_start'],
+                'reason': 'overlaps an earlier hunk' if overlap else 'context does not match',
+                'expected': '\n'.join(hunk['old'][:3]),
+            })
+            continue
+        pos, old, new, cut_lead, fuzzed = found
+        # Positions are in original-file coordinates, so later hunks only shift by
+        # how far this one was found from where the diff said it would be.
+        drift = pos - cut_lead - (hunk['old_start'] - 1)
+        if new != old and file_lines.matches(pos, new):
+            skipped += 1  # e.g. a pure addition after its context, applied before
+            continue
+        out.extend(lines[cursor:pos])
+        last_had_newline = pos + len(old) < len(lines) or (old and lines[pos + len(old) - 1].endswith('\n'))
+        for k, body in enumerate(new):
+            end = newline if k < len(new) - 1 or last_had_newline or not old else ''
+            out.append(body + end)
+        cursor = pos + len(old)
+        applied.append({'index': index, 'line': hunk['old_start'], 'offset': drift, 'fuzz': fuzzed})
+    out.extend(lines[cursor:])
+    return ''.join(out), applied, skipped, conflicts
+
+
+def apply_changes(text, changes):
+    """Replace each `before` fragment (exactly one occurrence, no overlaps) with `after`."""
+    spans = []
+    conflicts = []
+    skipped = 0
+    for index, change in enumerate(changes):
+        before, after = change.get('before', ''), change.get('after', '')
+        start = text.find(before) if before else -1
+        if start == -1:
+            if after and after in text:
+                skipped += 1
+                continue
+            conflicts.append({'kind': 'change', 'index': index, 'reason': 'fragment not found',
+                              'expected': before[:200], 'note': change.get('note', '')})
+            continue
+        k = after.find(before)
+        if k != -1 and text.startswith(after, start - k if start >= k else len(text)):
+            skipped += 1  # `after` extends `before` and is already in place
+            continue
+        if text.find(before, start + 1) != -1:
+            conflicts.append({'kind': 'change', 'index': index, 'reason': 'fragment is ambiguous',
+                              'expected': before[:200], 'note': change.get('note', '')})
+            continue
+        spans.append((start, start + len(before), after, index))
+    spans.sort()
+    kept = []
+    for span in spans:
+        if kept and span[0] < kept[-1][1]:
+            conflicts.append({'kind': 'change', 'index': span[3], 'reason': f'overlaps change {kept[-1][3]}',
+                              'expected': text[span[0]:span[1]][:200]})
+            continue
+        kept.append(span)
+    parts, cursor = [], 0
+    for start, end, after, _ in kept:
+        parts.append(text[cursor:start])
+        parts.append(after)
+        cursor = end
+    parts.append(text[cursor:])
+    return ''.join(parts), len(kept), skipped, conflicts
+
+
+def atomic_write(path, text, fsync=True):
+    """Write `text` to a temp file in the same directory, optionally fsync, then rename over `path`."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp = tempfile.mkstemp(prefix='.tmp-', suffix=os.path.splitext(path)[1], dir=directory)
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(text)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        shutil.copymode(path, tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def apply_file(job):
+    """Apply every hunk and fragment for one file; returns its report entry."""
+    name, fixes, root, opts = job
+    result = {'file': name, 'status': 'unchanged', 'hunks_applied': 0, 'hunks_inexact': [], 'changes_applied': 0,
+              'already_applied': 0, 'conflicts': []}
+    path = os.path.normpath(os.path.join(root, name))
+    if os.path.commonpath([os.path.abspath(path), os.path.abspath(root)]) != os.path.abspath(root):
+        result.update(status='error', error='path escapes --root')
+        return result
+    try:
+        with open(path, encoding='utf-8', newline='') as f:
+            original = f.read()
+    except (OSError, UnicodeDecodeError) as e:
+        result.update(status='error', error=str(e))
+        return result
+
+    text, applied, skipped, conflicts = apply_hunks(original, fixes['hunks'], opts['max_offset'], opts['fuzz'])
+    result['hunks_applied'], result['already_applied'] = len(applied), skipped
+    # Like patch's "succeeded at 14 (offset 3 lines)" / "with fuzz 1": worth a look.
+    result['hunks_inexact'] = [h for h in applied if h['offset'] or h['fuzz']]
+    result['conflicts'].extend(conflicts)
+    text, applied, skipped, conflicts = apply_changes(text, fixes['changes'])
+    result['changes_applied'] = applied
+    result['already_applied'] += skipped
+    result['conflicts'].extend(conflicts)
+
+    if result['conflicts']:
+        result['status'] = 'conflict'
+        if not opts['partial']:
+            return result
+    if text != original:
+        if result['status'] != 'conflict':
+            result['status'] = 'applied'
+        if not opts['dry_run']:
+            try:
+                atomic_write(path, text, opts['fsync'])
+            except OSError as e:
+                result.update(status='error', error=str(e))
+    return result
+
+
+def apply_all(by_file, root, workers=None, dry_run=False, partial=False, fsync=True,
+              max_offset=MAX_OFFSET, fuzz=FUZZ):
+    """Apply fixes to every file in a process pool; yields per-file results in file order."""
+    opts = {'dry_run': dry_run, 'partial': partial, 'fsync': fsync, 'max_offset': max_offset, 'fuzz': fuzz}
+    jobs = [(name, fixes, root, opts) for name, fixes in sorted(by_file.items())]
+    if workers == 1 or len(jobs) < 64:
+        yield from map(apply_file, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(apply_file, jobs, chunksize=64)
+
+
+def main():
+    p = argparse.ArgumentParser(description='Apply html-fixes patches and file_changes in bulk')
+    p.add_argument('inputs', nargs='+', help='JSON/JSONL files with patches/file_changes')
+    p.add_argument('--root', default='.', help='Directory the "file" paths are relative to')
+    p.add_argument('--workers', type=int, help='Process pool size (default: CPU count)')
+    p.add_argument('--dry-run', action='store_true', help='Report only, write nothing')
+    p.add_argument('--partial', action='store_true', help='Write files even if some of their hunks conflict')
+    p.add_argument('--no-fsync', action='store_true', help='Skip fsync before rename (faster on large batches)')
+    p.add_argument('--max-offset', type=int, default=MAX_OFFSET, help='Lines a hunk may have moved')
+    p.add_argument('--fuzz', type=int, default=FUZZ, help='Context lines that may be ignored at each hunk end')
+    p.add_argument('--report', help='Write the full JSON report to this file')
+    args = p.parse_args()
+
+    started = time.perf_counter()
+    try:
+        by_file = load_fixes(args.inputs)
+    except (OSError, ValueError, KeyError) as e:
+        print(f'Cannot load fixes: {e}', file=sys.stderr)
+        sys.exit(2)
+    results = list(apply_all(by_file, args.root, args.workers, args.dry_run, args.partial,
+                             not args.no_fsync, args.max_offset, args.fuzz))
+    totals = {}
+    for r in results:
+        totals[r['status']] = totals.get(r['status'], 0) + 1
+    report = {
+        'files': len(results),
+        'status': totals,
+        'hunks_applied': sum(r['hunks_applied'] for r in results),
+        'hunks_offset': sum(1 for r in results for h in r['hunks_inexact'] if h['offset']),
+        'hunks_fuzzed': sum(1 for r in results for h in r['hunks_inexact'] if h['fuzz']),
+        'changes_applied': sum(r['changes_applied'] for r in results),
+        'already_applied': sum(r['already_applied'] for r in results),
+        'dry_run': args.dry_run,
+        'seconds': round(time.perf_counter() - started, 3),
+        'problems': [r for r in results if r['status'] in ('conflict', 'error')],
+        'inexact': [{'file': r['file'], 'hunks': r['hunks_inexact']} for r in results
+                    if r['hunks_inexact'] and r['status'] not in ('conflict', 'error')],
+    }
+    if args.report:
+        with open(args.report, 'w', encoding='utf-8') as f:
+            json.dump({**report, 'results': results}, f, ensure_ascii=False, indent=2)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+    sys.exit(1 if report['problems'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""Build responsive image derivatives (AVIF / WebP / JPEG) for product photos.
+
+Each source image is decoded once (JPEGs at a reduced scale via `draft` when
+the largest target is much smaller), EXIF-rotated, and resized to every
+configured width no larger than the original; each size is encoded in every
+configured format. Images are processed in a process pool.
+
+A manifest (`<out>/images.json`) records the sha256 of each source together
+with the config fingerprint, so unchanged photos are never reprocessed; its
+entries carry the derivative list, a `srcset` per format and a ready
+`<picture>` snippet for the landing generator.
+
+Requires Pillow (`pip install Pillow`); AVIF needs a Pillow build with AVIF
+support (Pillow >= 11.2 with libavif, or `pillow-avif-plugin`) and is skipped
+with a warning otherwise.
+
+Usage:
+  python build_derivatives.py "Футболки/Язык и рогатка" --out build/images
+  python build_derivatives.py SRC --out OUT --widths 480 960 1440 --formats webp jpeg --config pipeline.json
+"""
+import argparse
+import hashlib
+import html
+import json
+import os
+import re
+import sys
+import tempfile
+from urllib.parse import quote
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional dependency, checked in main()
+    Image = ImageOps = None
+
+MANIFEST_NAME = 'images.json'
+MANIFEST_FORMAT = 1
+PIPELINE_VERSION = 1
+SOURCE_EXTS = {'.jpg', '.jpeg', '.png', '.webp', '.tif', '.tiff'}
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+BLOCK_SIZE = 1 << 20
+EXIF_ORIENTATION = 0x0112
+
+DEFAULT_CONFIG = {
+    'widths': [480, 768, 1080, 1440],
+    'formats': ['avif', 'webp', 'jpeg'],
+    'quality': {'avif': 50, 'webp': 78, 'jpeg': 82},
+    'avif_speed': 8,  # libavif encoder speed 0-10: 8 is ~3x faster than the default at the same size
+    'sizes': '(max-width: 768px) 100vw, 768px',
+}
+EXTENSIONS = {'avif': '.avif', 'webp': '.webp', 'jpeg': '.jpg'}
+MIME = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg'}
+
+
+def load_config(path=None, widths=None, formats=None):
+    config = json.loads(json.dumps(DEFAULT_CONFIG))
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            user = json.load(f)
+        quality = dict(config['quality'], **user.pop('quality', {}))
+        config.update(user, quality=quality)
+    if widths:
+        config['widths'] = widths
+    if formats:
+        config['formats'] = formats
+    unknown = [f for f in config['formats'] if f not in EXTENSIONS]
+    if unknown:
+        raise ValueError(f"Unsupported format(s): {', '.join(unknown)} (use avif, webp, jpeg)")
+    config['widths'] = sorted({int(w) for w in config['widths']}, reverse=True)
+    return config
+
+
+def config_fingerprint(config):
+    data = {k: config[k] for k in ('widths', 'formats', 'quality', 'avif_speed')}
+    data['version'] = PIPELINE_VERSION
+    return hashlib.sha256(json.dumps(data, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def avif_supported():
+    if Image is None:
+        return False
+    try:
+        import pillow_avif  # noqa: F401  (registers the plugin)
+    except ImportError:
+        pass
+    Image.init()
+    return 'AVIF' in Image.SAVE
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+
+def iter_sources(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1].lower() in SOURCE_EXTS:
+                yield Path(dirpath) / name
+
+
+def slug(stem):
+    return re.sub(r'[^\w.-]+', '-', stem, flags=re.UNICODE).strip('-.').lower() or 'image'
+
+
+def _save(img, path, fmt, quality, avif_speed=None):
+    """Encode to a temp file next to `path`, then rename into place."""
+    fd, tmp = tempfile.mkstemp(prefix='.tmp-', suffix=path.suffix, dir=path.parent)
+    os.close(fd)
+    try:
+        if fmt == 'jpeg':
+            if img.mode not in ('RGB', 'L'):
+                background = Image.new('RGB', img.size, (255, 255, 255))
+                background.paste(img, mask=img.getchannel('A') if 'A' in img.getbands() else None)
+                img = background
+            img.save(tmp, 'JPEG', quality=quality, optimize=True, progressive=True)
+        elif fmt == 'webp':
+            img.save(tmp, 'WEBP', quality=quality, method=4)
+        else:
+            img.save(tmp, 'AVIF', quality=quality, speed=avif_speed)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+
+
+def process_image(src, rel, digest, out_dir, config, formats):
+    """Decode `src` once and write every (width, format) derivative. Runs in a worker process."""
+    src = Path(src)
+    out_dir = Path(out_dir)
+    target_dir = out_dir / Path(rel).parent
+    target_dir.mkdir(parents=True, exist_ok=True)
+    base = f'{slug(Path(rel).stem)}.{digest[:8]}'
+
+    with Image.open(src) as im:
+        stored_w, stored_h = im.size
+        rotated = im.getexif().get(EXIF_ORIENTATION, 1) in (5, 6, 7, 8)
+        src_w, src_h = (stored_h, stored_w) if rotated else (stored_w, stored_h)
+        if im.format == 'JPEG':
+            # Let libjpeg decode at 1/2, 1/4 or 1/8 scale if that still covers the largest width.
+            largest = min(config['widths'][0], src_w)
+            target = (largest, max(1, round(src_h * largest / src_w)))
+            im.draft('RGB', target[::-1] if rotated else target)
+        img = ImageOps.exif_transpose(im)
+        img.load()
+    if img.mode not in ('RGB', 'RGBA', 'L'):
+        img = img.convert('RGBA' if 'A' in img.getbands() or 'transparency' in img.info else 'RGB')
+
+    widths = [w for w in config['widths'] if w <= src_w] or [src_w]
+    variants = []
+    for w in widths:  # every size is resized from the single decoded image
+        h = max(1, round(src_h * w / src_w))
+        resized = img if img.size == (w, h) else img.resize((w, h), Image.LANCZOS, reducing_gap=3.0)
+        for fmt in formats:
+            path = target_dir / f'{base}.{w}w{EXTENSIONS[fmt]}'
+            _save(resized, path, fmt, config['quality'][fmt], config['avif_speed'])
+            variants.append({
+                'format': fmt,
+                'width': w,
+                'height': h,
+                'path': path.relative_to(out_dir).as_posix(),
+                'bytes': path.stat().st_size,
+            })
+    return {
+        'source': rel,
+        'sha256': digest,
+        'width': src_w,
+        'height': src_h,
+        'source_bytes': src.stat().st_size,
+        'variants': variants,
+    }
+
+
+def picture_html(entry, formats, sizes, alt='', base_url=''):
+    """A <picture> element: one <source> per modern format, JPEG (or last format) as <img>."""
+    by_format = {}
+    for v in entry['variants']:
+        by_format.setdefault(v['format'], []).append(v)
+    srcsets = {fmt: ', '.join(f"{base_url}{quote(v['path'])} {v['width']}w" for v in sorted(vs, key=lambda v: v['width']))
+               for fmt, vs in by_format.items()}
+    fallback_fmt = 'jpeg' if 'jpeg' in by_format else formats[-1]
+    fallback = max(by_format[fallback_fmt], key=lambda v: v['width'])
+    parts = ['<picture>']
+    for fmt in formats:
+        if fmt != fallback_fmt and fmt in srcsets:
+            parts.append(f'<source type="{MIME[fmt]}" srcset="{html.escape(srcsets[fmt])}" sizes="{sizes}">')
+    parts.append(
+        f'<img src="{html.escape(base_url + quote(fallback["path"]))}" srcset="{html.escape(srcsets[fallback_fmt])}" '
+        f'sizes="{sizes}" width="{entry["width"]}" height="{entry["height"]}" alt="{html.escape(alt)}" '
+        f'loading="lazy" decoding="async">')
+    parts.append('</picture>')
+    return srcsets, ''.join(parts)
+
+
+def load_manifest(out_dir):
+    try:
+        with open(Path(out_dir) / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') == MANIFEST_FORMAT:
+            return data
+    except (OSError, ValueError):
+        pass
+    return {'format': MANIFEST_FORMAT, 'config': None, 'images': {}}
+
+
+def save_manifest(out_dir, manifest):
+    fd, tmp = tempfile.mkstemp(prefix='.images-', suffix='.json', dir=out_dir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False, sort_keys=True)
+        f.write('\n')
+    os.replace(tmp, Path(out_dir) / MANIFEST_NAME)
+
+
+def _remove_outputs(out_dir, entry, keep=()):
+    for v in entry.get('variants', []):
+        if v['path'] not in keep:
+            try:
+                os.remove(Path(out_dir) / v['path'])
+            except OSError:
+                pass
+
+
+def build(src_root, out_dir, config, workers=None, base_url='', log=print):
+    """Build derivatives for every image under `src_root`; returns (built, cached, failed, removed).
+
+    A photo that fails to decode keeps its previous derivatives and manifest
+    entry, so a corrupt replacement never wipes out working outputs.
+    """
+    src_root = Path(src_root).resolve()
+    out_dir = Path(out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    formats = [f for f in config['formats'] if f != 'avif' or avif_supported()]
+    if len(formats) < len(config['formats']):
+        log('warning: this Pillow build cannot write AVIF; skipping avif derivatives', file=sys.stderr)
+    fingerprint = config_fingerprint(dict(config, formats=formats))
+
+    manifest = load_manifest(out_dir)
+    old_images = manifest['images'] if manifest.get('config') == fingerprint else {}
+    if manifest.get('config') not in (None, fingerprint):
+        for entry in manifest['images'].values():
+            _remove_outputs(out_dir, entry)
+
+    sources = [(p, p.relative_to(src_root).as_posix()) for p in iter_sources(src_root)]
+    with ThreadPoolExecutor() as pool:
+        digests = list(pool.map(lambda s: file_sha256(s[0]), sources))
+
+    images = {}
+    todo = []
+    built = failed = 0
+    for (path, rel), digest in zip(sources, digests):
+        old = old_images.get(rel)
+        if old and old['sha256'] == digest and all((out_dir / v['path']).exists() for v in old['variants']):
+            images[rel] = old
+        else:
+            todo.append((path, rel, digest))
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(process_image, str(p), rel, d, str(out_dir), config, formats) for p, rel, d in todo]
+            for (path, rel, _), fut in zip(todo, futures):
+                try:
+                    entry = fut.result()
+                except Exception as e:  # keep going; a broken photo must not stop the batch
+                    log(f'error: {rel}: {e}', file=sys.stderr)
+                    failed += 1
+                    if rel in old_images:
+                        images[rel] = old_images[rel]
+                    continue
+                if rel in old_images:
+                    _remove_outputs(out_dir, old_images[rel], keep={v['path'] for v in entry['variants']})
+                images[rel] = entry
+                built += 1
+                log(f'built {rel}: {len(entry["variants"])} derivatives')
+
+    removed = [rel for rel in old_images if rel not in images]
+    for rel in removed:
+        _remove_outputs(out_dir, old_images[rel])
+
+    for rel, entry in images.items():
+        entry['srcset'], entry['picture'] = picture_html(entry, formats, config['sizes'],
+                                                         alt=Path(rel).stem, base_url=base_url)
+    manifest = {'format': MANIFEST_FORMAT, 'config': fingerprint, 'settings': config,
+                'formats': formats, 'images': images}
+    save_manifest(out_dir, manifest)
+    return built, len(sources) - len(todo), failed, len(removed)
+
+
+def main():
+    p = argparse.ArgumentParser(description='Build responsive image derivatives with a content-hash cache')
+    p.add_argument('src', help='Directory with source photos')
+    p.add_argument('--out', required=True, help='Output directory (derivatives + images.json)')
+    p.add_argument('--config', help='JSON with widths / formats / quality / avif_speed / sizes')
+    p.add_argument('--widths', type=int, nargs='+', help='Target widths in px')
+    p.add_argument('--formats', nargs='+', help='Output formats: avif webp jpeg')
+    p.add_argument('--workers', type=int, help='Process pool size')
+    p.add_argument('--base-url', default='', help='Prefix for derivative URLs in srcset/picture')
+    args = p.parse_args()
+
+    if Image is None:
+        print('Pillow is required: pip install Pillow', file=sys.stderr)
+        sys.exit(1)
+    config = load_config(args.config, args.widths, args.formats)
+    built, cached, failed, removed = build(args.src, args.out, config, workers=args.workers, base_url=args.base_url)
+    print(f'{built} built, {cached} unchanged, {failed} failed, {removed} removed -> {Path(args.out) / MANIFEST_NAME}')
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+"""Read JPEG/PNG metadata from headers only.
+
+Dimensions, orientation, capture date and color space are all stored before
+the compressed pixel data, so a 3 MB photo needs a few kilobytes of reads:
+
+- JPEG: walk the marker segments, seeking over everything except APP1 (EXIF),
+  APP2 (ICC), APP14 (Adobe) and SOFn, and stop at the first SOS.
+- PNG: read IHDR, then chunk headers only until IDAT, loading the small
+  sRGB/iCCP/gAMA/eXIf/tIME chunks.
+
+Folders are scanned in a thread pool (the work is I/O-bound). `summarize()`
+turns the results into the "oversized image" signal that repo-agent-suggester
+adds to its scan summary.
+
+Stdlib only.
+
+Usage:
+  python image_meta.py "Футболки/Язык и рогатка" [--jsonl] [--workers 16]
+  python image_meta.py "Футболки" --summary [--max-side 2560] [--max-bytes 1048576]
+"""
+import argparse
+import json
+import os
+import struct
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+META_EXTS = {'.jpg', '.jpeg', '.png'}
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+
+# Oversized: the long side exceeds what any layout shows (2x retina of 1280),
+# or the file weighs more than a hero image should.
+MAX_SIDE = 2560
+MAX_BYTES = 1 << 20
+TOP_OVERSIZED = 20
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+PNG_COLOR_TYPES = {0: 'gray', 2: 'rgb', 3: 'palette', 4: 'gray+alpha', 6: 'rgba'}
+PNG_META_CHUNKS = {b'sRGB', b'iCCP', b'gAMA', b'eXIf', b'tIME'}
+
+# SOF0..SOF15 except DHT (C4), JPG (C8) and DAC (CC).
+SOF_MARKERS = {m for m in range(0xC0, 0xD0) if m not in (0xC4, 0xC8, 0xCC)}
+STANDALONE_MARKERS = {0x01, *range(0xD0, 0xD8)}
+JPEG_COMPONENTS = {1: 'gray', 3: 'ycbcr', 4: 'cmyk'}
+
+TAG_ORIENTATION = 0x0112
+TAG_DATETIME = 0x0132
+TAG_EXIF_IFD = 0x8769
+TAG_DATETIME_ORIGINAL = 0x9003
+TAG_COLOR_SPACE = 0xA001
+EXIF_COLOR_SPACES = {1: 'srgb', 2: 'adobe-rgb', 0xFFFF: 'uncalibrated'}
+TIFF_TYPE_SIZES = {1: 1, 2: 1, 3: 2, 4: 4, 5: 8, 7: 1, 9: 4, 10: 8}
+
+
+def _read_ifd(data, offset, endian):
+    """Entries of one TIFF IFD as {tag: value} (ints, or strings for ASCII)."""
+    entries = {}
+    if offset + 2 > len(data):
+        return entries
+    (count,) = struct.unpack_from(endian + 'H', data, offset)
+    for i in range(count):
+        pos = offset + 2 + i * 12
+        if pos + 12 > len(data):
+            break
+        tag, typ, n = struct.unpack_from(endian + 'HHI', data, pos)
+        size = TIFF_TYPE_SIZES.get(typ, 1) * n
+        value_pos = pos + 8 if size <= 4 else struct.unpack_from(endian + 'I', data, pos + 8)[0]
+        if value_pos + size > len(data):
+            continue
+        if typ == 2:
+            entries[tag] = data[value_pos:value_pos + size].split(b'\0', 1)[0].decode('ascii', 'replace')
+        elif typ == 3:
+            entries[tag] = struct.unpack_from(endian + 'H', data, value_pos)[0]
+        elif typ == 4:
+            entries[tag] = struct.unpack_from(endian + 'I', data, value_pos)[0]
+    return entries
+
+
+def parse_exif(data):
+    """Orientation, capture date and EXIF color space from a TIFF-structured EXIF blob."""
+    if data[:2] == b'II':
+        endian = '<'
+    elif data[:2] == b'MM':
+        endian = '>'
+    else:
+        return {}
+    (ifd0,) = struct.unpack_from(endian + 'I', data, 4)
+    tags = _read_ifd(data, ifd0, endian)
+    exif = _read_ifd(data, tags[TAG_EXIF_IFD], endian) if TAG_EXIF_IFD in tags else {}
+    out = {}
+    if tags.get(TAG_ORIENTATION) in range(1, 9):
+        out['orientation'] = tags[TAG_ORIENTATION]
+    date = exif.get(TAG_DATETIME_ORIGINAL) or tags.get(TAG_DATETIME)
+    if isinstance(date, str) and date.strip():
+        out['datetime'] = date.strip()
+    if TAG_COLOR_SPACE in exif:
+        out['color_space'] = EXIF_COLOR_SPACES.get(exif[TAG_COLOR_SPACE], str(exif[TAG_COLOR_SPACE]))
+    return out
+
+
+def _jpeg_meta(f):
+    meta = {'format': 'jpeg'}
+    exif = {}
+    icc = adobe = False
+    while True:
+        head = f.read(2)
+        if len(head) < 2 or head[0] != 0xFF:
+            break
+        marker = head[1]
+        if marker == 0xFF:  # fill byte
+            f.seek(-1, os.SEEK_CUR)
+            continue
+        if marker in STANDALONE_MARKERS:
+            continue
+        if marker in (0xD9, 0xDA):  # EOI / SOS: pixel data starts here
+            break
+        (length,) = struct.unpack('>H', f.read(2))
+        body_len = length - 2
+        if marker in SOF_MARKERS:
+            body = f.read(body_len)
+            precision, height, width, components = struct.unpack_from('>BHHB', body)
+            meta.update(width=width, height=height, bit_depth=precision,
+                        channels=components, progressive=marker in (0xC2, 0xC6, 0xCA, 0xCE),
+                        components=JPEG_COMPONENTS.get(components, str(components)))
+        elif marker == 0xE1:
+            if f.read(6) == b'Exif\0\0':  # APP1 is also used for XMP; skip that
+                exif = parse_exif(f.read(body_len - 6))
+            else:
+                f.seek(body_len - 6, os.SEEK_CUR)
+        elif marker == 0xE2:
+            icc = icc or f.read(12) == b'ICC_PROFILE\0'
+            f.seek(body_len - 12, os.SEEK_CUR)
+        elif marker == 0xEE:
+            adobe = f.read(5) == b'Adobe'
+            f.seek(body_len - 5, os.SEEK_CUR)
+        else:
+            f.seek(body_len, os.SEEK_CUR)
+    meta.update(exif)
+    if 'color_space' not in meta or meta['color_space'] == 'uncalibrated':
+        if icc:
+            meta['color_space'] = 'icc'
+        elif meta.get('components') == 'cmyk' or adobe and meta.get('channels') == 4:
+            meta['color_space'] = 'cmyk'
+        elif meta.get('components') == 'gray':
+            meta['color_space'] = 'gray'
+    return meta
+
+
+def _png_meta(f):
+    meta = {'format': 'png'}
+    while True:
+        head = f.read(8)
+        if len(head) < 8:
+            break
+        length, kind = struct.unpack('>I4s', head)
+        if kind in (b'IDAT', b'IEND'):
+            break
+        if kind == b'IHDR':
+            width, height, depth, color, _, _, interlace = struct.unpack('>IIBBBBB', f.read(13))
+            meta.update(width=width, height=height, bit_depth=depth,
+                        components=PNG_COLOR_TYPES.get(color, str(color)), progressive=bool(interlace))
+            f.seek(4, os.SEEK_CUR)
+            continue
+        if kind in PNG_META_CHUNKS:
+            body = f.read(length)
+            if kind == b'sRGB':
+                meta['color_space'] = 'srgb'
+            elif kind == b'iCCP':
+                meta['color_space'] = 'icc'
+            elif kind == b'gAMA':
+                meta.setdefault('color_space', 'gamma')
+            elif kind == b'eXIf':
+                exif = parse_exif(body)
+                meta.update({k: v for k, v in exif.items() if k != 'color_space'})
+            elif kind == b'tIME' and len(body) == 7:
+                y, mo, d, h, mi, s = struct.unpack('>HBBBBB', body)
+                meta.setdefault('datetime', f'{y:04d}:{mo:02d}:{d:02d} {h:02d}:{mi:02d}:{s:02d}')
+            f.seek(4, os.SEEK_CUR)
+        else:
+            f.seek(length + 4, os.SEEK_CUR)
+    return meta
+
+
+def read_meta(path):
+    """Header metadata of one JPEG/PNG file; `error` is set instead when unreadable."""
+    path = Path(path)
+    out = {'path': str(path)}
+    try:
+        size = path.stat().st_size
+        with open(path, 'rb') as f:
+            sig = f.read(8)
+            if sig[:3] == b'\xff\xd8\xff':
+                f.seek(2)
+                out.update(_jpeg_meta(f))
+            elif sig == PNG_SIGNATURE:
+                out.update(_png_meta(f))
+            else:
+                out['error'] = 'not a JPEG or PNG file'
+                return out
+            out['header_bytes'] = f.tell()  # offset of the pixel data; skipped segments are not read
+    except (OSError, struct.error) as e:
+        out['error'] = str(e) or type(e).__name__
+        return out
+    out['size'] = size
+    if 'width' in out:
+        out.setdefault('orientation', 1)
+        w, h = out['width'], out['height']
+        out['display_width'], out['display_height'] = (h, w) if out['orientation'] >= 5 else (w, h)
+        pixels = w * h
+        if pixels:
+            out['bits_per_pixel'] = round(size * 8 / pixels, 3)
+    return out
+
+
+def oversized_reasons(meta, max_side=MAX_SIDE, max_bytes=MAX_BYTES):
+    reasons = []
+    if max(meta.get('width', 0), meta.get('height', 0)) > max_side:
+        reasons.append(f"{meta['width']}x{meta['height']} > {max_side}px")
+    if meta.get('size', 0) > max_bytes:
+        reasons.append(f"{meta['size'] / (1 << 20):.1f} MB > {max_bytes / (1 << 20):.1f} MB")
+    return reasons
+
+
+def iter_images(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for name in sorted(filenames):
+            if os.path.splitext(name)[1].lower() in META_EXTS:
+                yield os.path.join(dirpath, name)
+
+
+def scan(paths, workers=16):
+    """Read header metadata for many files in a thread pool, preserving order."""
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(read_meta, paths)
+
+
+def _relative(path, root):
+    """`path` relative to `root` in posix form, or as given when it lies outside."""
+    try:
+        return Path(path).relative_to(root).as_posix()
+    except ValueError:
+        return Path(path).as_posix()
+
+
+def summarize(root, metas, max_side=MAX_SIDE, max_bytes=MAX_BYTES, top=TOP_OVERSIZED):
+    """Scan-summary fields: image count/bytes and the heaviest oversized images."""
+    root = Path(root)
+    images, total, oversized = 0, 0, []
+    for meta in metas:
+        if 'error' in meta:
+            continue
+        images += 1
+        total += meta['size']
+        reasons = oversized_reasons(meta, max_side, max_bytes)
+        if reasons:
+            oversized.append({
+                'path': _relative(meta['path'], root),
+                'width': meta.get('display_width'),
+                'height': meta.get('display_height'),
+                'size': meta['size'],
+                'reasons': reasons,
+            })
+    oversized.sort(key=lambda m: m['size'], reverse=True)
+    return {
+        'images': images,
+        'image_bytes': total,
+        'oversized_count': len(oversized),
+        'oversized_bytes': sum(m['size'] for m in oversized),
+        'oversized_images': oversized[:top],
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description='Header-only JPEG/PNG metadata scanner')
+    p.add_argument('paths', nargs='+', help='Image files or folders')
+    p.add_argument('--workers', type=int, default=16)
+    p.add_argument('--jsonl', action='store_true', help='One JSON object per line')
+    p.add_argument('--summary', action='store_true', help='Print only the oversized-image summary')
+    p.add_argument('--max-side', type=int, default=MAX_SIDE)
+    p.add_argument('--max-bytes', type=int, default=MAX_BYTES)
+    args = p.parse_args()
+
+    files = []
+    for raw in args.paths:
+        files.extend(iter_images(raw) if os.path.isdir(raw) else [raw])
+    metas = scan(files, args.workers)
+
+    if args.summary:
+        # Paths are reported relative to the deepest folder holding every input.
+        dirs = [os.path.abspath(raw if os.path.isdir(raw) else os.path.dirname(raw) or '.') for raw in args.paths]
+        out = summarize(os.path.commonpath(dirs), ({**m, 'path': os.path.abspath(m['path'])} for m in metas),
+                        args.max_side, args.max_bytes)
+        print(json.dumps(out, ensure_ascii=False, indent=2))
+    elif args.jsonl:
+        for meta in metas:
+            print(json.dumps(meta, ensure_ascii=False), flush=True)
+    else:
+        print(json.dumps(list(metas), ensure_ascii=False, indent=2))
+    if not files:
+        print('No JPEG/PNG files found', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,340 @@
+#!/usr/bin/env python3
+"""Find near-identical product shots with perceptual hashes.
+
+Every photo is decoded at a tiny size (JPEG `draft` decoding, EXIF-rotated)
+and reduced to a 64-bit dHash or pHash. Hashes live in a compact array
+(`array('Q')`) saved with the file list in `<root>/.photo_index.bin`; the
+index is updated incrementally: only new or changed files (mtime/size) are
+rehashed, in a process pool, and deleted ones are dropped.
+
+Search uses multi-index hashing: the 64 bits are split into four 16-bit
+chunks, each with its own table. Two hashes within Hamming distance r share at
+least one chunk within distance r // 4, so a query probes a few hundred table
+keys and verifies only those candidates — milliseconds even for 100k photos.
+
+Requires Pillow (`pip install Pillow`).
+
+Usage:
+  python photo_similarity.py update "Футболки/Язык и рогатка"
+  python photo_similarity.py similar "Футболки/Язык и рогатка" "9 16/оверсайз 916.jpeg" [-r 10] [-k 20]
+  python photo_similarity.py groups "Футболки/Язык и рогатка" [-r 6] [--json]
+"""
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from pathlib import Path
+
+from build_derivatives import iter_sources
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:  # optional dependency, checked in main()
+    Image = ImageOps = None
+
+INDEX_NAME = '.photo_index.bin'
+MAGIC = b'PHIX1\n'
+HEADER = struct.Struct('<6sI')  # magic, length of the JSON header
+ALGOS = ('dhash', 'phash')
+CHUNKS = 4
+CHUNK_BITS = 64 // CHUNKS
+CHUNK_MASK = (1 << CHUNK_BITS) - 1
+
+if hasattr(int, 'bit_count'):
+    def popcount(x):
+        return x.bit_count()
+else:  # Python < 3.10
+    def popcount(x):
+        return bin(x).count('1')
+
+
+def _small_gray(path, size):
+    """Decode `path` as a small grayscale image of `size`, reading as little as possible."""
+    with Image.open(path) as im:
+        im.draft('L', (size[0] * 4, size[1] * 4))
+        im = ImageOps.exif_transpose(im)
+        return im.convert('L').resize(size, Image.LANCZOS)
+
+
+def dhash(path):
+    """Difference hash: 9x8 grayscale, one bit per horizontal gradient sign."""
+    px = _small_gray(path, (9, 8)).tobytes()
+    value = 0
+    for row in range(8):
+        base = row * 9
+        for col in range(8):
+            value = (value << 1) | (px[base + col] > px[base + col + 1])
+    return value
+
+
+_DCT = [[math.cos(math.pi * (2 * x + 1) * u / 64) for x in range(32)] for u in range(8)]
+
+
+def phash(path):
+    """DCT hash: 32x32 grayscale, sign of the 8x8 low-frequency DCT block against its median."""
+    px = _small_gray(path, (32, 32)).tobytes()
+    rows = [px[i * 32:(i + 1) * 32] for i in range(32)]
+    # Only the top-left 8x8 block of C * X * C^T is needed.
+    tmp = [[sum(c[x] * rows[x][y] for x in range(32)) for y in range(32)] for c in _DCT]
+    block = [sum(tmp[u][y] * _DCT[v][y] for y in range(32)) for u in range(8) for v in range(8)]
+    median = sorted(block[1:])[31]  # the DC term would dominate the median
+    value = 0
+    for coeff in block:
+        value = (value << 1) | (coeff > median)
+    return value
+
+
+HASHERS = {'dhash': dhash, 'phash': phash}
+
+
+def _hash_file(args):
+    path, algo = args
+    try:
+        return HASHERS[algo](path), None
+    except Exception as e:  # unreadable or truncated image
+        return None, str(e)
+
+
+class PhotoIndex:
+    """Array-backed perceptual hash index with multi-index Hamming search."""
+
+    def __init__(self, root, algo='dhash', path=None):
+        self.root = Path(root).resolve()
+        self.path = Path(path) if path else self.root / INDEX_NAME
+        self.algo = algo
+        self.files = []     # relative paths
+        self.stats = []     # [mtime_ns, size]
+        self.hashes = array('Q')
+        self.tables = None
+
+    # -- persistence -------------------------------------------------------
+    def load(self):
+        try:
+            with open(self.path, 'rb') as f:
+                magic, size = HEADER.unpack(f.read(HEADER.size))
+                if magic != MAGIC:
+                    return False
+                header = json.loads(f.read(size))
+                if header['algo'] != self.algo:
+                    return False
+                hashes = array('Q')
+                hashes.frombytes(f.read())
+        except (OSError, ValueError, KeyError, struct.error):
+            return False
+        if sys.byteorder != header.get('byteorder', sys.byteorder):
+            hashes.byteswap()
+        self.files, self.stats, self.hashes = header['files'], header['stats'], hashes
+        self.tables = None
+        return len(self.files) == len(self.hashes)
+
+    def save(self):
+        header = json.dumps({'algo': self.algo, 'byteorder': sys.byteorder,
+                             'files': self.files, 'stats': self.stats}, ensure_ascii=False).encode('utf-8')
+        tmp = self.path.with_name(self.path.name + '.tmp')
+        with open(tmp, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, len(header)))
+            f.write(header)
+            self.hashes.tofile(f)
+        os.replace(tmp, self.path)
+
+    # -- incremental update --------------------------------------------------
+    def update(self, workers=None, log=None):
+        """Rehash new/changed photos, drop deleted ones. Returns (hashed, removed)."""
+        known = {rel: (self.stats[i], self.hashes[i]) for i, rel in enumerate(self.files)}
+        files, stats, hashes, todo = [], [], [], []
+        for p in iter_sources(self.root):
+            rel = p.relative_to(self.root).as_posix()
+            st = p.stat()
+            stat = [st.st_mtime_ns, st.st_size]
+            prev = known.get(rel)
+            if prev and prev[0] == stat:
+                files.append(rel)
+                stats.append(stat)
+                hashes.append(prev[1])
+            else:
+                todo.append((rel, stat))
+        seen = set(files) | {rel for rel, _ in todo}
+        removed = sum(1 for rel in known if rel not in seen)
+
+        if todo:
+            args = [(str(self.root / rel), self.algo) for rel, _ in todo]
+            if len(todo) == 1:
+                results = [_hash_file(args[0])]
+            else:
+                with ProcessPoolExecutor(max_workers=workers) as pool:
+                    results = list(pool.map(_hash_file, args, chunksize=32))
+            for (rel, stat), (value, error) in zip(todo, results):
+                if value is None:
+                    if log:
+                        log(f'skip {rel}: {error}')
+                    continue
+                files.append(rel)
+                stats.append(stat)
+                hashes.append(value)
+
+        self.files, self.stats, self.hashes = files, stats, array('Q', hashes)
+        self.tables = None
+        return len(todo), removed
+
+    # -- search ----------------------------------------------------------------
+    def _build_tables(self):
+        tables = [{} for _ in range(CHUNKS)]
+        for i, h in enumerate(self.hashes):
+            for c in range(CHUNKS):
+                tables[c].setdefault((h >> (c * CHUNK_BITS)) & CHUNK_MASK, []).append(i)
+        self.tables = tables
+
+    def search(self, value, radius=10, k=None, exclude=None):
+        """Indices and distances of hashes within `radius` bits of `value`, nearest first."""
+        if self.tables is None:
+            self._build_tables()
+        sub_radius = radius // CHUNKS
+        flips = [0]
+        for bits in range(1, sub_radius + 1):
+            for combo in combinations(range(CHUNK_BITS), bits):
+                mask = 0
+                for b in combo:
+                    mask |= 1 << b
+                flips.append(mask)
+        seen = set()
+        found = []
+        hashes = self.hashes
+        for c in range(CHUNKS):
+            key = (value >> (c * CHUNK_BITS)) & CHUNK_MASK
+            table = self.tables[c]
+            for mask in flips:
+                for i in table.get(key ^ mask, ()):
+                    if i in seen:
+                        continue
+                    seen.add(i)
+                    d = popcount(hashes[i] ^ value)
+                    if d <= radius and i != exclude:
+                        found.append((d, i))
+        found.sort()
+        return found[:k] if k else found
+
+    def hash_of(self, query):
+        """Hash of an indexed photo or of any image file, plus its index (or None).
+
+        A relative query is tried against `root` first, then the current
+        directory; any path inside `root` that is indexed reuses the stored
+        hash so the photo is not reported as its own match.
+        """
+        query = Path(query)
+        candidates = [query] if query.is_absolute() else [self.root / query, query]
+        for path in candidates:
+            try:
+                rel = path.resolve().relative_to(self.root).as_posix()
+            except ValueError:
+                continue
+            if rel in self.files:
+                i = self.files.index(rel)
+                return self.hashes[i], i
+        path = next((c for c in candidates if c.is_file()), None)
+        if path is None:
+            raise FileNotFoundError(f'query not found: {query}')
+        value, err = _hash_file((path, self.algo))
+        if err:
+            raise ValueError(f'cannot hash {path}: {err}')
+        return value, None
+
+    def groups(self, radius=6):
+        """Clusters of near-duplicates (union-find over pairs within `radius`)."""
+        parent = list(range(len(self.hashes)))
+
+        def find(i):
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        for i, h in enumerate(self.hashes):
+            for _, j in self.search(h, radius, exclude=i):
+                a, b = find(i), find(j)
+                if a != b:
+                    parent[max(a, b)] = min(a, b)
+        clusters = {}
+        for i in range(len(self.hashes)):
+            clusters.setdefault(find(i), []).append(self.files[i])
+        return sorted((sorted(c) for c in clusters.values() if len(c) > 1), key=len, reverse=True)
+
+
+def open_index(root, algo='dhash', update=True, workers=None):
+    index = PhotoIndex(root, algo)
+    index.load()
+    if update:
+        hashed, removed = index.update(workers, log=lambda m: print(m, file=sys.stderr))
+        if hashed or removed:
+            index.save()
+    return index
+
+
+def main():
+    p = argparse.ArgumentParser(description='Perceptual-hash similarity search over a photo folder')
+    p.add_argument('--algo', choices=ALGOS, default='dhash')
+    p.add_argument('--workers', type=int, help='Process pool size for hashing')
+    sub = p.add_subparsers(dest='cmd', required=True)
+    u = sub.add_parser('update', help='Hash new/changed photos and save the index')
+    u.add_argument('root')
+    s = sub.add_parser('similar', help='Find shots similar to a photo')
+    s.add_argument('root')
+    s.add_argument('query', help='Photo path (relative to root or the current directory) or any image file')
+    s.add_argument('-r', '--radius', type=int, default=10, help='Max Hamming distance (of 64 bits)')
+    s.add_argument('-k', type=int, default=20)
+    s.add_argument('--no-update', action='store_true', help='Use the saved index as is')
+    s.add_argument('--json', action='store_true')
+    g = sub.add_parser('groups', help='List clusters of near-identical shots')
+    g.add_argument('root')
+    g.add_argument('-r', '--radius', type=int, default=6)
+    g.add_argument('--no-update', action='store_true')
+    g.add_argument('--json', action='store_true')
+    args = p.parse_args()
+
+    if Image is None:
+        print('Pillow is required: pip install Pillow', file=sys.stderr)
+        sys.exit(1)
+
+    if args.cmd == 'update':
+        index = PhotoIndex(args.root, args.algo)
+        index.load()
+        hashed, removed = index.update(args.workers, log=lambda m: print(m, file=sys.stderr))
+        index.save()
+        print(f'{len(index.files)} photos indexed ({hashed} hashed, {removed} removed) -> {index.path}')
+        return
+
+    index = open_index(args.root, args.algo, update=not args.no_update, workers=args.workers)
+    if args.cmd == 'similar':
+        try:
+            value, self_i = index.hash_of(args.query)
+        except (FileNotFoundError, ValueError) as e:
+            print(e, file=sys.stderr)
+            sys.exit(1)
+        started = time.perf_counter()
+        hits = index.search(value, args.radius, args.k, exclude=self_i)
+        elapsed = (time.perf_counter() - started) * 1000
+        results = [{'path': index.files[i], 'distance': d} for d, i in hits]
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+        else:
+            for r in results:
+                print(f"{r['distance']:3d}  {r['path']}")
+            print(f'{len(results)} match(es) in {elapsed:.1f} ms', file=sys.stderr)
+    else:
+        clusters = index.groups(args.radius)
+        if args.json:
+            print(json.dumps(clusters, ensure_ascii=False, indent=2))
+        else:
+            for n, cluster in enumerate(clusters, 1):
+                print(f'# group {n}')
+                for path in cluster:
+                    print(f'  {path}')
+
+
+if __name__ == '__main__':
+    main()
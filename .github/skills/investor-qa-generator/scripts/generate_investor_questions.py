@@ -1,12 +1,249 @@
 #!/usr/bin/env python3
-"""Stub: generate investor-style questions from a presentation structure."""
+"""Generate investor-style questions for a presentation structure from a question bank.
+
+The bank (`references/question_bank.jsonl`, one question per line with `theme`,
+`lang`, `question`, `motive`, `triggers`, `metrics`, `prepare`, `weight`,
+optional `killer`) is compiled into a SQLite inverted index
+(`references/.question_index.sqlite`) mapping stemmed trigger keywords and
+metric names to questions. The index is rebuilt only when the bank changes.
+
+For a deck, every distinct term of its slides is looked up once and at most
+`POSTINGS_PER_TERM` best postings are read per term, so the work depends on the
+deck size, not on the bank size. Questions are ranked by matched triggers
+(title hits and metric names count more) times their weight, then picked
+round-robin across themes.
+
+Usage:
+  python generate_investor_questions.py deck.json [-n 12] [--lang ru|en] [--bank bank.jsonl]
+"""
+import argparse
+import importlib.util
 import json
+import os
+import re
+import sqlite3
+from pathlib import Path
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+DEFAULT_BANK = SKILL_DIR / 'references' / 'question_bank.jsonl'
+INDEX_NAME = '.question_index.sqlite'
+SLIDE_FIELDS = ('title', 'key_message', 'message', 'visual_guidance', 'data_needed', 'speaker_notes')
+POSTINGS_PER_TERM = 200
+TITLE_BOOST = 2.0
+METRIC_BOOST = 1.5
+CYRILLIC_RE = re.compile(r'[а-яё]', re.IGNORECASE)
+
+# RU/EN tokenizer and light stemmers shared with the knowledge-search skill. Optional:
+# without it (skill packaged on its own) terms are matched unstemmed. The tokenizer
+# name is part of the index signature, so switching one rebuilds the index.
+KB_SEARCH_PATH = SKILL_DIR.parent / 'knowledge-search' / 'scripts' / 'kb_search.py'
+TOKEN_RE = re.compile(r'[0-9a-zа-яё]+', re.IGNORECASE)
+
+
+def _load_kb_search():
+    try:
+        spec = importlib.util.spec_from_file_location('kb_search', KB_SEARCH_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except (OSError, ImportError):
+        return None
+    return module
+
+
+def _plain_tokenize(text):
+    return TOKEN_RE.findall(text.lower().replace('ё', 'е'))
+
+
+_kb_search = _load_kb_search()
+tokenize = _kb_search.tokenize if _kb_search else _plain_tokenize
+TOKENIZER = 'kb_search' if _kb_search else 'plain'
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS questions (
+    qid INTEGER PRIMARY KEY, ext_id TEXT, theme TEXT, lang TEXT, question TEXT,
+    motive TEXT, prepare TEXT, weight REAL, killer INTEGER);
+CREATE TABLE IF NOT EXISTS postings (
+    term TEXT, qid INTEGER, trig INTEGER, need INTEGER, kind TEXT, weight REAL);
+CREATE INDEX IF NOT EXISTS postings_term ON postings(term, weight DESC);
+CREATE INDEX IF NOT EXISTS questions_lang ON questions(lang, weight DESC);
+"""
+
+
+def bank_signature(bank):
+    st = os.stat(bank)
+    return f'{os.path.abspath(bank)}:{st.st_mtime_ns}:{st.st_size}:{TOKENIZER}'
+
+
+def open_index(bank=DEFAULT_BANK, db_path=None):
+    """Open (and rebuild if the bank changed) the inverted index for `bank`."""
+    bank = Path(bank)
+    db_path = db_path or bank.with_name(INDEX_NAME)
+    conn = sqlite3.connect(str(db_path))
+    conn.executescript(SCHEMA)
+    row = conn.execute("SELECT value FROM meta WHERE key = 'bank'").fetchone()
+    if not row or row[0] != bank_signature(bank):
+        build_index(conn, bank)
+    return conn
+
+
+def build_index(conn, bank):
+    with conn:
+        conn.execute('DELETE FROM questions')
+        conn.execute('DELETE FROM postings')
+        trig = 0
+        with open(bank, 'r', encoding='utf-8') as f:
+            for qid, line in enumerate(filter(str.strip, f), 1):
+                q = json.loads(line)
+                weight = float(q.get('weight', 1.0))
+                conn.execute(
+                    'INSERT INTO questions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                    (qid, q.get('id'), q['theme'], q.get('lang', 'ru'), q['question'], q.get('motive', ''),
+                     q.get('prepare', ''), weight, int(bool(q.get('killer')))))
+                rows = []
+                for kind in ('triggers', 'metrics'):
+                    for phrase in q.get(kind, []):
+                        terms = set(tokenize(phrase))
+                        if not terms:
+                            continue
+                        trig += 1
+                        rows.extend((t, qid, trig, len(terms), kind, weight) for t in terms)
+                conn.executemany('INSERT INTO postings VALUES (?, ?, ?, ?, ?, ?)', rows)
+        conn.execute("INSERT OR REPLACE INTO meta VALUES ('bank', ?)", (bank_signature(bank),))
+
+
+def deck_terms(structure):
+    """Distinct terms of the deck: term -> True if it appears in a slide title."""
+    terms = {}
+    for slide in structure:
+        for t in tokenize(str(slide.get('title') or '')):
+            terms[t] = True
+        body = ' '.join(str(slide[k]) for k in SLIDE_FIELDS[1:] if slide.get(k))
+        for t in tokenize(body):
+            terms.setdefault(t, False)
+    return terms
+
+
+def detect_lang(structure):
+    text = ' '.join(str(v) for slide in structure for v in slide.values())
+    cyr = len(CYRILLIC_RE.findall(text))
+    latin = len(re.findall(r'[a-z]', text, re.IGNORECASE))
+    return 'ru' if cyr >= latin else 'en'
+
+
+def rank_questions(conn, structure, lang=None):
+    """Return (score, qid, matched phrases' terms) for candidate questions, best first.
+
+    With `lang`, postings are filtered by question language before the per-term
+    limit, so other-language questions cannot crowd out same-language matches.
+    """
+    terms = deck_terms(structure)
+    hits = {}  # (qid, trig) -> [need, kind, weight, matched terms]
+    if lang:
+        sql = ('SELECT p.qid, p.trig, p.need, p.kind, p.weight FROM postings p JOIN questions q ON q.qid = p.qid '
+               'WHERE p.term = ? AND q.lang = ? ORDER BY p.weight DESC LIMIT ?')
+    else:
+        sql = 'SELECT qid, trig, need, kind, weight FROM postings WHERE term = ? ORDER BY weight DESC LIMIT ?'
+    for term in terms:
+        rows = conn.execute(sql, (term, lang, POSTINGS_PER_TERM) if lang else (term, POSTINGS_PER_TERM))
+        for qid, trig, need, kind, weight in rows:
+            hit = hits.setdefault((qid, trig), [need, kind, weight, []])
+            hit[3].append(term)
+    scores = {}
+    matched = {}
+    for (qid, _), (need, kind, weight, found) in hits.items():
+        if len(found) < need:
+            continue  # multi-word trigger only partly present
+        score = sum(TITLE_BOOST if terms[t] else 1.0 for t in found) / need
+        if kind == 'metrics':
+            score *= METRIC_BOOST
+        scores[qid] = scores.get(qid, 0.0) + score * weight
+        matched.setdefault(qid, []).extend(found)
+    ranked = sorted(scores.items(), key=lambda kv: -kv[1])
+    return [(score, qid, sorted(set(matched[qid]))) for qid, score in ranked]
+
+
+def _fetch(conn, qids):
+    if not qids:
+        return {}
+    marks = ','.join('?' * len(qids))
+    cols = 'qid, ext_id, theme, lang, question, motive, prepare, weight, killer'
+    rows = conn.execute(f'SELECT {cols} FROM questions WHERE qid IN ({marks})', list(qids))
+    return {r[0]: dict(zip(cols.split(', '), r)) for r in rows}
+
+
+def generate_questions(structure, count=12, lang=None, bank=DEFAULT_BANK, db_path=None):
+    """Select and rank `count` questions for a deck, grouped by theme, plus a killer question."""
+    lang = lang or detect_lang(structure)
+    conn = open_index(bank, db_path)
+    try:
+        ranked = rank_questions(conn, structure, lang)
+        info = _fetch(conn, [qid for _, qid, _ in ranked])
+        candidates = [(s, info[q], m) for s, q, m in ranked]
+        if len(candidates) < count:
+            # Too few keyword hits: top up with the strongest general questions.
+            seen = {q['qid'] for _, q, _ in candidates}
+            rows = conn.execute('SELECT qid FROM questions WHERE lang = ? ORDER BY weight DESC LIMIT ?',
+                                (lang, count + len(seen)))
+            extra = [r[0] for r in rows if r[0] not in seen]
+            extra_info = _fetch(conn, extra)
+            candidates += [(0.0, extra_info[q], []) for q in extra][:count - len(candidates)]
+    finally:
+        conn.close()
+
+    # Round-robin across themes so one theme cannot take every slot.
+    by_theme = {}
+    for item in candidates:
+        by_theme.setdefault(item[1]['theme'], []).append(item)
+    picked = []
+    while len(picked) < count and any(by_theme.values()):
+        for theme in list(by_theme):
+            if by_theme[theme] and len(picked) < count:
+                picked.append(by_theme[theme].pop(0))
+
+    themes = {}
+    for score, q, terms in picked:
+        themes.setdefault(q['theme'], []).append({
+            'id': q['ext_id'],
+            'question': q['question'],
+            'motive': q['motive'],
+            'prepare': q['prepare'],
+            'matched': terms,
+            'score': round(score, 3),
+        })
+    killer = max(picked, key=lambda item: (item[1]['killer'], item[0]), default=None)
+    return {
+        'lang': lang,
+        'themes': themes,
+        'killer_question': None if killer is None else {
+            'question': killer[1]['question'],
+            'motive': killer[1]['motive'],
+            'prepare': killer[1]['prepare'],
+        },
+    }
+
+
+def load_structure(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    return data.get('slides', []) if isinstance(data, dict) else data
+
+
+def main():
+    p = argparse.ArgumentParser(description='Generate investor questions for a deck structure')
+    p.add_argument('deck', nargs='?', help='JSON with a list of slides or {"slides": [...]}')
+    p.add_argument('-n', '--count', type=int, default=12, help='How many questions to select (10-15 recommended)')
+    p.add_argument('--lang', choices=('ru', 'en'), help='Question language (detected from the deck by default)')
+    p.add_argument('--bank', default=str(DEFAULT_BANK), help='Question bank JSONL')
+    args = p.parse_args()
+
+    if args.deck:
+        structure = load_structure(args.deck)
+    else:
+        structure = [{"title": "Cover", "message": "..."}, {"title": "Market", "message": "..."}]
+    result = generate_questions(structure, count=args.count, lang=args.lang, bank=args.bank)
+    print(json.dumps(result, ensure_ascii=False, indent=2))
 
-def questions_stub(structure):
-    qs = []
-    qs.append({"theme":"Finance","question":"Какова ваша LTV/CAC?","motive":"Проверка unit-economics"})
-    return qs
 
 if __name__ == '__main__':
-    sample = [{"title":"Cover","message":"..."},{"title":"Market","message":"..."}]
-    print(json.dumps(questions_stub(sample), ensure_ascii=False, indent=2))
+    main()
@@ -0,0 +1,292 @@
+#!/usr/bin/env python3
+"""Поиск по базе знаний: BM25-индекс по markdown-файлам в `.github`.
+
+Индекс хранится на диске (SQLite, инвертированный индекс term -> passage) и
+обновляется инкрементально: переиндексируются только файлы с изменившимися
+mtime/size, удалённые файлы вычищаются. Токены нормализуются лёгкими
+стеммерами для русского и английского.
+
+Usage:
+  python kb_search.py index [--root .github] [--db path]
+  python kb_search.py query "юнит-экономика CAC" [-k 5] [--no-update] [--json]
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+from pathlib import Path
+
+
+DEFAULT_ROOT = Path(__file__).resolve().parents[3]  # .github
+DB_NAME = '.kb_index.sqlite'
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+PASSAGE_WORDS = 120
+K1 = 1.2
+B = 0.75
+
+TOKEN_RE = re.compile(r'[0-9a-zа-яё]+', re.IGNORECASE)
+HEADING_RE = re.compile(r'^#{1,6}\s+(.*)$')
+CYRILLIC_RE = re.compile(r'[а-яё]')
+
+STOPWORDS = {
+    # ru
+    'и', 'в', 'во', 'не', 'что', 'он', 'на', 'я', 'с', 'со', 'как', 'а', 'то', 'все', 'она', 'так',
+    'его', 'но', 'да', 'ты', 'к', 'у', 'же', 'вы', 'за', 'бы', 'по', 'только', 'ее', 'мне', 'было',
+    'вот', 'от', 'меня', 'еще', 'нет', 'о', 'из', 'ему', 'ли', 'если', 'или', 'для', 'это', 'при',
+    'мы', 'их', 'чем', 'без', 'до', 'под', 'над', 'же', 'этот', 'эти', 'также',
+    # en
+    'a', 'an', 'the', 'and', 'or', 'of', 'to', 'in', 'on', 'for', 'is', 'are', 'be', 'by', 'with',
+    'as', 'at', 'it', 'this', 'that', 'from', 'was', 'were', 'not', 'if', 'we', 'you', 'our',
+}
+
+# Окончания для лёгкого русского стеммера (упрощённый Snowball): сначала
+# возвратные частицы, затем самое длинное окончание прилагательных, причастий,
+# глаголов и существительных в области RV (после первой гласной).
+RU_VOWELS = set('аеиоуыэюя')
+RU_REFLEXIVE = ('ся', 'сь')
+RU_ENDINGS = sorted({
+    # adjectives / participles
+    'ее', 'ие', 'ые', 'ое', 'ими', 'ыми', 'ей', 'ий', 'ый', 'ой', 'ем', 'им', 'ым', 'ом', 'его', 'ого',
+    'ему', 'ому', 'их', 'ых', 'ую', 'юю', 'ая', 'яя', 'ою', 'ею',
+    # verbs
+    'ла', 'на', 'ете', 'йте', 'ли', 'й', 'л', 'ем', 'н', 'ло', 'но', 'ет', 'ют', 'ны', 'ть', 'ешь', 'нно',
+    'ила', 'ыла', 'ена', 'ейте', 'уйте', 'ите', 'или', 'ыли', 'ей', 'уй', 'ил', 'ыл', 'им', 'ым', 'ен',
+    'ило', 'ыло', 'ено', 'ят', 'ует', 'уют', 'ит', 'ыт', 'ены', 'ить', 'ыть', 'ишь', 'ую', 'ю',
+    # nouns
+    'а', 'ев', 'ов', 'ие', 'ье', 'е', 'иями', 'ями', 'ами', 'еи', 'ии', 'и', 'ией', 'ей', 'ой', 'ий',
+    'иям', 'ям', 'ием', 'ам', 'ом', 'о', 'у', 'ах', 'иях', 'ях', 'ы', 'ь', 'ию', 'ью', 'ия', 'ья', 'я',
+}, key=len, reverse=True)
+
+EN_SUFFIXES = (
+    ('ational', 'ate'), ('ization', 'ize'), ('fulness', 'ful'), ('iveness', 'ive'), ('ousness', 'ous'),
+    ('ations', 'ate'), ('ation', 'ate'), ('ments', ''), ('ment', ''), ('ness', ''), ('ings', ''),
+    ('ing', ''), ('ies', 'y'), ('ied', 'y'), ('sses', 'ss'), ('edly', ''), ('ed', ''), ('ly', ''),
+    ('ers', ''), ('er', ''), ('es', ''), ('s', ''),
+)
+
+
+def stem_ru(word):
+    rv = next((i + 1 for i, ch in enumerate(word) if ch in RU_VOWELS), len(word))
+    stem, tail = word[:rv], word[rv:]
+    for suffix in RU_REFLEXIVE:
+        if tail.endswith(suffix):
+            tail = tail[:-len(suffix)]
+            break
+    for ending in RU_ENDINGS:
+        if tail.endswith(ending):
+            tail = tail[:-len(ending)]
+            break
+    if tail.endswith('и') or tail.endswith('ь'):
+        tail = tail[:-1]
+    return (stem + tail) or word
+
+
+def stem_en(word):
+    if len(word) <= 3:
+        return word
+    for suffix, replacement in EN_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= 3:
+            if suffix == 's' and word.endswith('ss'):
+                return word
+            return word[:-len(suffix)] + replacement
+    return word
+
+
+def tokenize(text):
+    """Lowercase, split on letters/digits, drop stopwords and stem (RU or EN per token)."""
+    tokens = []
+    for raw in TOKEN_RE.findall(text.lower().replace('ё', 'е')):
+        if raw in STOPWORDS:
+            continue
+        tokens.append(stem_ru(raw) if CYRILLIC_RE.search(raw) else stem_en(raw))
+    return tokens
+
+
+def split_passages(text):
+    """Split markdown into (heading, passage) chunks, breaking at headings and at
+    paragraph boundaries once a chunk reaches PASSAGE_WORDS words."""
+    heading = ''
+    buf = []
+    words = 0
+    passages = []
+
+    def flush():
+        nonlocal buf, words
+        body = '\n'.join(buf).strip()
+        if body:
+            passages.append((heading, body))
+        buf, words = [], 0
+
+    for line in text.splitlines():
+        m = HEADING_RE.match(line)
+        if m:
+            flush()
+            heading = m.group(1).strip()
+            continue
+        if not line.strip() and words >= PASSAGE_WORDS:
+            flush()
+            continue
+        buf.append(line)
+        words += len(line.split())
+        if words >= PASSAGE_WORDS * 2:
+            flush()
+    flush()
+    return passages
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (id INTEGER PRIMARY KEY, path TEXT UNIQUE, mtime_ns INTEGER, size INTEGER);
+CREATE TABLE IF NOT EXISTS passages (id INTEGER PRIMARY KEY, doc_id INTEGER, heading TEXT, body TEXT, length INTEGER);
+CREATE TABLE IF NOT EXISTS postings (term TEXT, passage_id INTEGER, tf INTEGER);
+CREATE INDEX IF NOT EXISTS postings_term ON postings(term);
+CREATE INDEX IF NOT EXISTS passages_doc ON passages(doc_id);
+"""
+
+
+class KnowledgeIndex:
+    """On-disk BM25 index over markdown files under `root`."""
+
+    def __init__(self, root=DEFAULT_ROOT, db_path=None):
+        self.root = Path(root).resolve()
+        self.db_path = Path(db_path) if db_path else self.root / DB_NAME
+        self.conn = sqlite3.connect(str(self.db_path))
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def _iter_markdown(self):
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in SKIP_DIRS]
+            for name in filenames:
+                if name.lower().endswith('.md'):
+                    yield Path(dirpath) / name
+
+    def _remove_doc(self, doc_id):
+        c = self.conn
+        c.execute('DELETE FROM postings WHERE passage_id IN (SELECT id FROM passages WHERE doc_id = ?)', (doc_id,))
+        c.execute('DELETE FROM passages WHERE doc_id = ?', (doc_id,))
+        c.execute('DELETE FROM docs WHERE id = ?', (doc_id,))
+
+    def _add_doc(self, rel, path, st):
+        c = self.conn
+        text = path.read_text(encoding='utf-8', errors='replace')
+        cur = c.execute('INSERT INTO docs(path, mtime_ns, size) VALUES (?, ?, ?)', (rel, st.st_mtime_ns, st.st_size))
+        doc_id = cur.lastrowid
+        for heading, body in split_passages(text):
+            tokens = tokenize(heading + '\n' + body)
+            if not tokens:
+                continue
+            pid = c.execute(
+                'INSERT INTO passages(doc_id, heading, body, length) VALUES (?, ?, ?, ?)',
+                (doc_id, heading, body, len(tokens)),
+            ).lastrowid
+            counts = {}
+            for t in tokens:
+                counts[t] = counts.get(t, 0) + 1
+            c.executemany('INSERT INTO postings(term, passage_id, tf) VALUES (?, ?, ?)',
+                          [(t, pid, n) for t, n in counts.items()])
+
+    def update(self):
+        """Re-index changed/new files and drop deleted ones. Returns (added_or_changed, removed)."""
+        known = {row[1]: (row[0], row[2], row[3]) for row in self.conn.execute('SELECT id, path, mtime_ns, size FROM docs')}
+        seen = set()
+        changed = 0
+        with self.conn:
+            for path in self._iter_markdown():
+                rel = path.relative_to(self.root).as_posix()
+                seen.add(rel)
+                st = path.stat()
+                prev = known.get(rel)
+                if prev and prev[1] == st.st_mtime_ns and prev[2] == st.st_size:
+                    continue
+                if prev:
+                    self._remove_doc(prev[0])
+                self._add_doc(rel, path, st)
+                changed += 1
+            removed = [v[0] for k, v in known.items() if k not in seen]
+            for doc_id in removed:
+                self._remove_doc(doc_id)
+        return changed, len(removed)
+
+    def search(self, query, k=5):
+        """Return the top-k passages for `query` ranked by BM25."""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        c = self.conn
+        n, total = c.execute('SELECT COUNT(*), COALESCE(SUM(length), 0) FROM passages').fetchone()
+        if not n:
+            return []
+        avgdl = total / n
+        scores = {}
+        for term in terms:
+            rows = c.execute(
+                'SELECT p.passage_id, p.tf, s.length FROM postings p JOIN passages s ON s.id = p.passage_id '
+                'WHERE p.term = ?', (term,)).fetchall()
+            if not rows:
+                continue
+            df = len(rows)
+            idf = math.log(1 + (n - df + 0.5) / (df + 0.5))
+            for pid, tf, length in rows:
+                norm = tf * (K1 + 1) / (tf + K1 * (1 - B + B * length / avgdl))
+                scores[pid] = scores.get(pid, 0.0) + idf * norm
+        top = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:k]
+        results = []
+        for pid, score in top:
+            path, heading, body = c.execute(
+                'SELECT d.path, s.heading, s.body FROM passages s JOIN docs d ON d.id = s.doc_id WHERE s.id = ?',
+                (pid,)).fetchone()
+            results.append({'path': path, 'heading': heading, 'score': round(score, 4), 'text': body})
+        return results
+
+
+def search(query, k=5, root=DEFAULT_ROOT, db_path=None, update=True):
+    """Convenience API: (optionally) refresh the index and run one query."""
+    index = KnowledgeIndex(root, db_path)
+    try:
+        if update:
+            index.update()
+        return index.search(query, k)
+    finally:
+        index.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='BM25 search over .github markdown')
+    parser.add_argument('--root', default=str(DEFAULT_ROOT), help='Корень для индексации (по умолчанию .github)')
+    parser.add_argument('--db', help=f'Путь к файлу индекса (по умолчанию <root>/{DB_NAME})')
+    sub = parser.add_subparsers(dest='cmd')
+    sub.add_parser('index')
+    q = sub.add_parser('query')
+    q.add_argument('text')
+    q.add_argument('-k', type=int, default=5, help='Сколько фрагментов вернуть')
+    q.add_argument('--no-update', action='store_true', help='Не обновлять индекс перед поиском')
+    q.add_argument('--json', action='store_true', help='Вывести JSON')
+    args = parser.parse_args()
+
+    if args.cmd == 'index':
+        index = KnowledgeIndex(args.root, args.db)
+        changed, removed = index.update()
+        index.close()
+        print(f'Проиндексировано файлов: {changed}, удалено: {removed}')
+    elif args.cmd == 'query':
+        results = search(args.text, args.k, args.root, args.db, update=not args.no_update)
+        if args.json:
+            print(json.dumps(results, ensure_ascii=False, indent=2))
+            return
+        for r in results:
+            title = f" — {r['heading']}" if r['heading'] else ''
+            print(f"[{r['score']}] {r['path']}{title}")
+            snippet = ' '.join(r['text'].split())
+            print(f"    {snippet[:300]}\n")
+    else:
+        parser.print_help()
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
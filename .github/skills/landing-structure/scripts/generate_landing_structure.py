@@ -3,11 +3,46 @@
 
 Выводит markdown со стандартными секциями лендинга. Этот скрипт — пример, который можно
 подключить в CI или запустить локально, чтобы быстро получить каркас для копирайтера.
+
+Пакетный режим (`--batch catalog.jsonl|catalog.csv`) потоково читает каталог товаров
+и рендерит по странице на запись через шаблон, скомпилированный один раз
+(общий движок `skill-creator/scripts/templating.py`, если скилл лежит рядом с
+skill-creator, иначе обычный `str.format`). Страницы
+пишутся в каталог (`--out-dir`, пул потоков с ограниченным окном) или в один архив
+(`--archive pages.zip|pages.tar|pages.tar.gz`); память не растёт с размером каталога.
 """
 import argparse
+import csv
+import importlib.util
+import io
 import json
+import os
+import re
+import tarfile
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from textwrap import dedent
 
+# Shared compiled template engine (skill-creator/scripts/templating.py); optional,
+# so the skill still works when packaged on its own.
+TEMPLATING_PATH = Path(__file__).resolve().parents[2] / 'skill-creator' / 'scripts' / 'templating.py'
+
+
+def _load_templating():
+    try:
+        spec = importlib.util.spec_from_file_location('templating', TEMPLATING_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except (OSError, ImportError):
+        return None
+    return module
+
+
+templating = _load_templating()
+
 
 TEMPLATE = """
 # {product}
@@ -16,7 +51,7 @@ TEMPLATE = """
 - Заголовок: {hero_title}
 - Подзаголовок: {hero_sub}
 - Ключевое преимущество: {value_prop}
-- CTA: {primary_cta}
+- CTA: {primary_cta}{hero_visual}
 
 ## Problem / Pain
 - Кого это касается: {audience}
@@ -51,12 +86,20 @@ TEMPLATE = """
 """
 
 
-def generate(data: dict) -> str:
+def load_image_manifest(path):
+    """`images` из манифеста image-assets/scripts/build_derivatives.py (ключ — путь исходного фото)."""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f).get('images', {})
+
+
+def template_values(data: dict, images=None) -> dict:
     hero_title = data.get('hero_title') or f"{data.get('product')} — коротко о пользе"
     hero_sub = data.get('hero_sub') or data.get('product')
     value_prop = data.get('value_prop') or 'Экономия времени и увеличение лидов'
     solution_short = data.get('solution_short') or 'Автоматизация воронки через AI'
-    return TEMPLATE.format(
+    image = (images or {}).get(data.get('image'))
+    hero_visual = f"\n- Визуал: {image['picture']}" if image else ''
+    return dict(
         product=data.get('product', 'Продукт'),
         hero_title=hero_title,
         hero_sub=hero_sub,
@@ -68,9 +111,94 @@ def generate(data: dict) -> str:
         benefit_2=data.get('benefit_2', 'Снижение CPL'),
         benefit_3=data.get('benefit_3', 'Автоматизация рутины'),
         offer=data.get('offer', '14 дней бесплатно'),
+        hero_visual=hero_visual,
     )
 
 
+TEMPLATE_FIELDS = ('product', 'hero_title', 'hero_sub', 'value_prop', 'primary_cta', 'audience',
+                   'solution_short', 'benefit_1', 'benefit_2', 'benefit_3', 'offer', 'hero_visual')
+if templating:
+    render = templating.Template(TEMPLATE, names=TEMPLATE_FIELDS, name='landing').render
+else:
+    render = TEMPLATE.format_map
+
+
+def generate(data: dict, images=None) -> str:
+    return render(template_values(data, images))
+
+
+def read_catalog(path):
+    """Потоково отдаёт записи каталога: JSONL (по объекту на строку) или CSV с заголовком."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith('.csv'):
+            for row in csv.DictReader(f):
+                yield {k: v for k, v in row.items() if v not in (None, '')}
+        else:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def page_name(data: dict, index: int, used: set) -> str:
+    """Имя файла страницы: slug / sku / id / product, с защитой от коллизий."""
+    raw = str(data.get('slug') or data.get('sku') or data.get('id') or data.get('product') or index)
+    base = re.sub(r'[^\w.-]+', '-', raw, flags=re.UNICODE).strip('-.') or str(index)
+    name = base
+    n = 1
+    while name in used:
+        n += 1
+        name = f'{base}-{n}'
+    used.add(name)
+    return name + '.md'
+
+
+def _write_page(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(text)
+
+
+def generate_batch(records, out_dir=None, archive=None, workers=8, window=1024, images=None):
+    """Рендерит страницы для потока записей; возвращает число страниц.
+
+    В режиме `out_dir` запись файлов идёт в пуле потоков, в очереди не больше
+    `window` страниц. В режиме `archive` страницы пишутся по одной в zip/tar.
+    Имена страниц держатся в памяти только для разрешения коллизий.
+    """
+    used = set()
+    pages = ((page_name(d, i, used), generate(d, images)) for i, d in enumerate(records, 1))
+    count = 0
+    if archive:
+        if archive.endswith('.zip'):
+            with zipfile.ZipFile(archive, 'w', zipfile.ZIP_DEFLATED) as zf:
+                for name, text in pages:
+                    zf.writestr(name, text)
+                    count += 1
+        else:
+            mode = 'w:gz' if archive.endswith(('.tar.gz', '.tgz')) else 'w'
+            mtime = time.time()
+            with tarfile.open(archive, mode) as tf:
+                for name, text in pages:
+                    payload = text.encode('utf-8')
+                    info = tarfile.TarInfo(name)
+                    info.size = len(payload)
+                    info.mtime = mtime
+                    tf.addfile(info, io.BytesIO(payload))
+                    count += 1
+        return count
+
+    os.makedirs(out_dir, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        for name, text in pages:
+            if len(pending) >= window:
+                pending.popleft().result()
+            pending.append(pool.submit(_write_page, os.path.join(out_dir, name), text))
+            count += 1
+        for fut in pending:
+            fut.result()
+    return count
+
+
 def main():
     parser = argparse.ArgumentParser(description='Generate landing structure (sample)')
     parser.add_argument('--product', help='Краткое название/описание продукта')
@@ -81,7 +209,24 @@ def main():
     parser.add_argument('--tone', help='Тон коммуникации')
     parser.add_argument('--out', help='Файл для записи (если не задано — stdout)')
     parser.add_argument('--json', help='JSON-файл с полями для шаблона')
+    parser.add_argument('--image', help='Путь исходного фото из манифеста --images для блока Hero')
+    parser.add_argument('--batch', help='Каталог товаров (JSONL или CSV) — по странице на запись')
+    parser.add_argument('--out-dir', help='Папка для страниц в пакетном режиме')
+    parser.add_argument('--archive', help='Записать страницы в один архив (.zip, .tar, .tar.gz)')
+    parser.add_argument('--workers', type=int, default=8, help='Потоков записи для --out-dir')
+    parser.add_argument('--images', help='Манифест images.json из image-assets: поле `image` записи → <picture> в Hero')
     args = parser.parse_args()
+    images = load_image_manifest(args.images) if args.images else None
+
+    if args.batch:
+        if not (args.out_dir or args.archive):
+            parser.error('--batch requires --out-dir or --archive')
+        started = time.perf_counter()
+        count = generate_batch(read_catalog(args.batch), out_dir=args.out_dir,
+                               archive=args.archive, workers=args.workers, images=images)
+        target = args.archive or args.out_dir
+        print(f'Wrote {count} landing skeletons to {target} in {time.perf_counter() - started:.1f}s')
+        return
 
     data = {}
     if args.json:
@@ -89,12 +234,12 @@ def main():
             data = json.load(f)
 
     # CLI args override JSON
-    for k in ('product', 'audience', 'goal', 'primary_cta', 'offer', 'tone'):
+    for k in ('product', 'audience', 'goal', 'primary_cta', 'offer', 'tone', 'image'):
         v = getattr(args, k)
         if v:
             data[k] = v
 
-    md = generate(data)
+    md = generate(data, images)
     if args.out:
         with open(args.out, 'w', encoding='utf-8') as f:
             f.write(md)
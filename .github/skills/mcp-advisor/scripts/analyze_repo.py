@@ -2,13 +2,26 @@
 """Analyze a repository and recommend MCPs (Model Context Protocol connectors).
 
 Usage:
-    python analyze_repo.py --path /path/to/repo [--output out.json]
+    python analyze_repo.py --path /path/to/repo [--output out.json] [--profile [--sample N]]
+    python analyze_repo.py --path /path/to/repo --watch [--poll]
+    python analyze_repo.py --path /path/to/repo --stream [--min-confidence 0.8] [--first N]
+
+Recommendations come from declarative rules (`references/recommended_mcps.md`
+or `--rules rules.json|.yaml`, see mcp_rules.py). `--stream` evaluates them
+while the tree is walked and prints each one as a JSON line as soon as it
+fires, stopping once every rule has fired (or after `--first N`).
 """
 import argparse
 import json
 import os
+import sys
+import time
 from pathlib import Path
 
+from fs_watch import iter_changes, walk_files
+from language_profile import positive_int, profile_languages
+from mcp_rules import DEFAULT_RULES_PATH, RuleEngine, file_evidence, load_rules, summary_evidence
+
 
 EXT_LANG_MAP = {
     '.py': 'python',
@@ -22,157 +35,217 @@ EXT_LANG_MAP = {
 }
 
 
-def find_files(root: Path):
-    for p in root.rglob('*'):
-        if p.is_file():
-            yield p
-
-
-def detect_languages(root: Path):
-    counts = {}
-    for f in find_files(root):
-        ext = f.suffix.lower()
-        lang = EXT_LANG_MAP.get(ext)
-        if lang:
-            counts[lang] = counts.get(lang, 0) + 1
-    return counts
-
-
-def detect_package_files(root: Path):
-    files = []
-    candidates = ['package.json', 'pyproject.toml', 'requirements.txt', 'Pipfile', 'go.mod', 'Cargo.toml', 'pom.xml']
-    for name in candidates:
-        for p in root.rglob(name):
-            files.append(str(p.relative_to(root)))
-    return files
-
-
-def detect_infra(root: Path):
-    infra = []
-    for p in root.rglob('*'):
-        if p.is_file():
-            name = p.name.lower()
-            if name == 'dockerfile' or name.endswith('dockerfile'):
-                infra.append(str(p.relative_to(root)))
-            if name in ('docker-compose.yml', 'docker-compose.yaml'):
-                infra.append(str(p.relative_to(root)))
-            if p.suffix in ('.yml', '.yaml'):
-                try:
-                    text = p.read_text(encoding='utf-8')
-                except Exception:
-                    text = ''
-                if 'kind: deployment' in text.lower() or 'apiVersion:' in text:
-                    infra.append(str(p.relative_to(root)))
-    return list(set(infra))
-
-
-def detect_ci(root: Path):
-    ci = []
-    for p in root.rglob('.github/workflows/*.yml'):
-        ci.append(str(p.relative_to(root)))
-    for name in ('Jenkinsfile', '.gitlab-ci.yml', '.circleci/config.yml'):
-        for p in root.rglob(name):
-            ci.append(str(p.relative_to(root)))
-    return ci
-
-
-def recommend_mcps(summary):
-    recs = []
-    languages = summary.get('languages', {})
-    package_files = summary.get('package_files', [])
-    infra = summary.get('infra', [])
-    ci = summary.get('ci', [])
-
-    # Always useful
-    recs.append({
-        'id': 'mcp-repo-history',
-        'name': 'Repository history / blame MCP',
-        'reason': 'Always useful to attach commit/author context to model queries',
-        'confidence': 0.6,
-    })
-
-    # Code search
-    if sum(languages.values()) > 0:
-        recs.append({
-            'id': 'mcp-code-search',
-            'name': 'Code Search / Indexer MCP',
-            'reason': f"Repository contains languages: {', '.join(languages.keys())}",
-            'confidence': 0.9,
-        })
-
-    # Dependency scanning
-    if package_files:
-        recs.append({
-            'id': 'mcp-dep-scanner',
-            'name': 'Dependency Scanner MCP',
-            'reason': f"Found package files: {', '.join(package_files)}",
-            'confidence': 0.9,
-        })
-
-    # Container / infra
-    if any('docker' in p.lower() or 'dockerfile' in p.lower() for p in infra):
-        recs.append({
-            'id': 'mcp-docker-inspector',
-            'name': 'Docker/Container Inspector MCP',
-            'reason': 'Repository contains Dockerfile/docker-compose',
-            'confidence': 0.85,
-        })
-
-    if any('k8s' in p.lower() or 'kind: deployment' in ' '.join(infra).lower() for p in infra):
-        recs.append({
-            'id': 'mcp-k8s-inspector',
-            'name': 'Kubernetes Inspector MCP',
-            'reason': 'Repository contains Kubernetes manifests',
-            'confidence': 0.8,
-        })
-
-    # CI / pipeline events
-    if ci:
-        recs.append({
-            'id': 'mcp-ci-listener',
-            'name': 'CI/CD Events MCP',
-            'reason': 'Repository defines CI pipelines; CI events help attach runtime context',
-            'confidence': 0.8,
-        })
-
-    # Security / secrets scanner
-    if 'python' in languages or 'javascript' in languages:
-        recs.append({
-            'id': 'mcp-secrets-scanner',
-            'name': 'Secrets & SCA MCP',
-            'reason': 'Useful to scan for leaked secrets and SCA alerts in common languages',
-            'confidence': 0.6,
-        })
-
-    return recs
-
-
-def analyze(path: str):
-    root = Path(path).resolve()
-    languages = detect_languages(root)
-    package_files = detect_package_files(root)
-    infra = detect_infra(root)
-    ci = detect_ci(root)
-
-    summary = {
-        'path': str(root),
-        'languages': languages,
-        'package_files': package_files,
-        'infra': infra,
-        'ci': ci,
-    }
+def recommend_mcps(summary, rules=None, min_confidence=0.0):
+    """Evaluate the rules over a materialized summary; recommendations in rule order."""
+    engine = RuleEngine(rules if rules is not None else load_rules(DEFAULT_RULES_PATH), min_confidence)
+    engine.start()
+    for key, value in summary_evidence(summary):
+        engine.feed(key, value)
+    return engine.recommendations()
+
+
+def analyze(path: str, profile=False, sample=None, rules=None, min_confidence=0.0):
+    """One-shot summary and recommendations.
+
+    Built from the same RepoIndex walk (fs_watch.SKIP_DIRS, classify_file) that
+    `--watch` and `--stream` use, so all three modes see the same files.
+    """
+    index = RepoIndex(path)
+    summary = index.summary()
+
+    if profile:
+        summary['language_profile'] = profile_languages(index.root, sample=sample)
 
-    summary['recommendations'] = recommend_mcps(summary)
+    summary['recommendations'] = recommend_mcps(summary, rules, min_confidence)
     return summary
 
 
+PACKAGE_FILES = {'package.json', 'pyproject.toml', 'requirements.txt', 'Pipfile', 'go.mod', 'Cargo.toml', 'pom.xml'}
+CI_FILES = {'Jenkinsfile', '.gitlab-ci.yml'}
+
+
+def classify_file(root: Path, path: Path):
+    """Return the summary classes (language, package, infra, ci) one file contributes."""
+    rel = path.relative_to(root)
+    name = path.name
+    lower = name.lower()
+    parents = rel.parent.parts
+    is_infra = lower.endswith('dockerfile') or lower in ('docker-compose.yml', 'docker-compose.yaml')
+    if not is_infra and path.suffix in ('.yml', '.yaml'):
+        try:
+            text = path.read_text(encoding='utf-8')
+        except Exception:
+            text = ''
+        is_infra = 'kind: deployment' in text.lower() or 'apiVersion:' in text
+    is_ci = (
+        name in CI_FILES
+        or (path.suffix == '.yml' and parents[-2:] == ('.github', 'workflows'))
+        or (name == 'config.yml' and parents[-1:] == ('.circleci',))
+    )
+    return {
+        'language': EXT_LANG_MAP.get(path.suffix.lower()),
+        'package': name in PACKAGE_FILES,
+        'infra': is_infra,
+        'ci': is_ci,
+    }
+
+
+class RepoIndex:
+    """In-memory scan summary kept up to date from file change events."""
+
+    def __init__(self, path: str):
+        self.root = Path(path).resolve()
+        self.files = {}
+        self.rescan()
+
+    def rescan(self):
+        self.files = {}
+        for f in walk_files(self.root):
+            self._update(Path(f))
+
+    def _update(self, path: Path):
+        rel = str(path.relative_to(self.root))
+        if not path.is_file():
+            self.files.pop(rel, None)
+            return
+        cls = classify_file(self.root, path)
+        if any(cls.values()):
+            self.files[rel] = cls
+        else:
+            self.files.pop(rel, None)
+
+    def apply(self, changed):
+        """Apply a batch of changed paths; `None` forces a full rescan."""
+        if changed is None:
+            self.rescan()
+            return
+        for p in changed:
+            path = Path(p)
+            if path.is_dir():
+                continue
+            if not path.exists():
+                # A removed directory takes every indexed file below it along.
+                prefix = str(path.relative_to(self.root)) + os.sep
+                for rel in [r for r in self.files if r.startswith(prefix)]:
+                    del self.files[rel]
+            self._update(path)
+
+    def summary(self):
+        languages = {}
+        package_files, infra, ci = [], [], []
+        for rel, cls in sorted(self.files.items()):
+            if cls['language']:
+                languages[cls['language']] = languages.get(cls['language'], 0) + 1
+            if cls['package']:
+                package_files.append(rel)
+            if cls['infra']:
+                infra.append(rel)
+            if cls['ci']:
+                ci.append(rel)
+        return {
+            'path': str(self.root),
+            'languages': languages,
+            'package_files': package_files,
+            'infra': infra,
+            'ci': ci,
+        }
+
+
+def stream_recommendations(path: str, rules=None, min_confidence=0.0, limit=None):
+    """Walk the tree once, yielding recommendations as soon as their rules fire.
+
+    Each item carries `elapsed_ms` since the start of the scan. The walk stops
+    early when every rule has fired or `limit` recommendations were emitted.
+    """
+    root = Path(path).resolve()
+    started = time.perf_counter()
+    engine = RuleEngine(rules if rules is not None else load_rules(DEFAULT_RULES_PATH), min_confidence)
+    emitted = 0
+
+    def stamp(recs):
+        for rec in recs:
+            rec['elapsed_ms'] = round((time.perf_counter() - started) * 1000, 2)
+        return recs
+
+    for rec in stamp(engine.start()):
+        yield rec
+        emitted += 1
+        if limit and emitted >= limit:
+            return
+    for f in walk_files(root):
+        if engine.done:
+            return
+        path = Path(f)
+        rel = str(path.relative_to(root))
+        for key, value in file_evidence(classify_file(root, path), rel):
+            for rec in stamp(engine.feed(key, value)):
+                yield rec
+                emitted += 1
+                if limit and emitted >= limit:
+                    return
+
+
+def recommendation_inputs(summary):
+    """The parts of a summary that recommend_mcps actually depends on."""
+    return (
+        tuple(sorted(summary['languages'])),
+        tuple(summary['package_files']),
+        tuple(summary['infra']),
+        tuple(summary['ci']),
+    )
+
+
+def watch(path: str, interval=1.0, polling=False, out=sys.stdout, rules=None, min_confidence=0.0):
+    """Print the summary, then a JSON line whenever the recommendations' inputs change."""
+    index = RepoIndex(path)
+    summary = index.summary()
+    summary['recommendations'] = recommend_mcps(summary, rules, min_confidence)
+    out.write(json.dumps(summary, ensure_ascii=False) + '\n')
+    out.flush()
+    last = recommendation_inputs(summary)
+    for changed in iter_changes(index.root, interval=interval, polling=polling):
+        index.apply(changed)
+        summary = index.summary()
+        key = recommendation_inputs(summary)
+        if key == last:
+            continue
+        last = key
+        summary['recommendations'] = recommend_mcps(summary, rules, min_confidence)
+        out.write(json.dumps(summary, ensure_ascii=False) + '\n')
+        out.flush()
+
+
 def main():
     p = argparse.ArgumentParser()
     p.add_argument('--path', default='.', help='Path to repository root')
     p.add_argument('--output', help='Write JSON output to file')
+    p.add_argument('--profile', action='store_true', help='Add files/bytes/lines per language')
+    p.add_argument('--sample', type=positive_int, help='With --profile: estimate lines from N sampled files per language')
+    p.add_argument('--watch', action='store_true', help='Keep running and print updated JSON lines on relevant changes')
+    p.add_argument('--poll', action='store_true', help='With --watch: use stat polling instead of inotify')
+    p.add_argument('--interval', type=float, default=1.0, help='With --watch --poll: seconds between polls')
+    p.add_argument('--rules', help='Rules file (.md with a ```json block, .json or .yaml); default references/recommended_mcps.md')
+    p.add_argument('--min-confidence', type=float, default=0.0, help='Ignore rules below this confidence')
+    p.add_argument('--stream', action='store_true', help='Print recommendations as JSON lines as soon as they fire')
+    p.add_argument('--first', type=int, help='With --stream: stop after N recommendations')
     args = p.parse_args()
-
-    summary = analyze(args.path)
+    rules = load_rules(args.rules) if args.rules else None
+
+    if args.stream:
+        for rec in stream_recommendations(args.path, rules, args.min_confidence, args.first):
+            print(json.dumps(rec, ensure_ascii=False), flush=True)
+        return
+
+    if args.watch:
+        try:
+            watch(args.path, interval=args.interval, polling=args.poll,
+                  rules=rules, min_confidence=args.min_confidence)
+        except KeyboardInterrupt:
+            pass
+        return
+
+    summary = analyze(args.path, profile=args.profile, sample=args.sample,
+                      rules=rules, min_confidence=args.min_confidence)
     text = json.dumps(summary, indent=2, ensure_ascii=False)
     print(text)
     if args.output:
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""Analyze many repositories concurrently and stream results as JSONL.
+
+Runs `analyze_repo.analyze` (MCP recommendations) and/or the
+repo-agent-suggester scan (`scan_repo` + `propose_agents`) over a list of repo
+roots in a process pool. One JSON line is written per repo as soon as it
+completes; a summary with the slowest repos is printed to stderr at the end.
+
+Usage:
+    python batch_analyze.py REPO [REPO ...] [--tool mcp|agents|both]
+    python batch_analyze.py --manifest repos.txt --workers 8 --timeout 120 --output results.jsonl
+
+A manifest is either plain text (one path per line, `#` comments allowed) or
+JSONL with a `path` field per line.
+"""
+import argparse
+import heapq
+import importlib.util
+import json
+import os
+import signal
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from analyze_repo import analyze
+
+
+SUGGESTER_PATH = Path(__file__).resolve().parents[2] / 'repo-agent-suggester' / 'skill.py'
+TOOLS = ('mcp', 'agents', 'both')
+
+_suggester = None
+
+
+class RepoTimeout(Exception):
+    pass
+
+
+def _load_suggester():
+    global _suggester
+    if _suggester is None:
+        spec = importlib.util.spec_from_file_location('repo_agent_suggester', SUGGESTER_PATH)
+        _suggester = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_suggester)
+    return _suggester
+
+
+def _on_alarm(signum, frame):
+    raise RepoTimeout()
+
+
+def analyze_one(path, tool='mcp', timeout=None):
+    """Analyze a single repo; never raises, returns a result record.
+
+    On POSIX the timeout is enforced inside the worker with SIGALRM; elsewhere
+    the repo runs to completion and is marked as timed out afterwards.
+    """
+    start = time.perf_counter()
+    record = {'repo': str(path), 'tool': tool}
+    use_alarm = bool(timeout) and hasattr(signal, 'setitimer')
+    if use_alarm:
+        signal.signal(signal.SIGALRM, _on_alarm)
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+    try:
+        if not Path(path).is_dir():
+            raise NotADirectoryError(path)
+        result = {}
+        if tool in ('mcp', 'both'):
+            result['mcp'] = analyze(path)
+        if tool in ('agents', 'both'):
+            suggester = _load_suggester()
+            info = suggester.scan_repo(Path(path))
+            result['agents'] = {'info': info, 'proposals': suggester.propose_agents(info)}
+        record['ok'] = True
+        record['result'] = result
+    except RepoTimeout:
+        record['ok'] = False
+        record['error'] = 'timeout'
+    except Exception as e:
+        record['ok'] = False
+        record['error'] = f'{type(e).__name__}: {e}'
+    finally:
+        if use_alarm:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+    record['elapsed'] = round(time.perf_counter() - start, 4)
+    if record['ok'] and timeout and record['elapsed'] > timeout:
+        record['ok'] = False
+        record['error'] = 'timeout'
+        record.pop('result', None)
+    return record
+
+
+def read_manifest(path):
+    repos = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith('#'):
+                continue
+            if line.startswith('{'):
+                repos.append(json.loads(line)['path'])
+            else:
+                repos.append(line)
+    return repos
+
+
+def run_batch(repos, tool='mcp', workers=None, timeout=None, out=sys.stdout, slowest=10):
+    """Analyze repos in a process pool, writing one JSON line per finished repo.
+
+    Returns a summary dict with counts and the `slowest` repos by elapsed time.
+    """
+    start = time.perf_counter()
+    ok = failed = 0
+    top = []  # min-heap of (elapsed, repo) holding the slowest repos
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(analyze_one, repo, tool, timeout) for repo in repos]
+        for fut in as_completed(futures):
+            record = fut.result()
+            out.write(json.dumps(record, ensure_ascii=False) + '\n')
+            out.flush()
+            if record['ok']:
+                ok += 1
+            else:
+                failed += 1
+            item = (record['elapsed'], record['repo'])
+            if len(top) < slowest:
+                heapq.heappush(top, item)
+            else:
+                heapq.heappushpop(top, item)
+    return {
+        'repos': len(repos),
+        'ok': ok,
+        'failed': failed,
+        'wall_seconds': round(time.perf_counter() - start, 3),
+        'slowest': [{'repo': r, 'elapsed': e} for e, r in sorted(top, reverse=True)],
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description='Batch repository analysis (JSONL output)')
+    p.add_argument('repos', nargs='*', help='Repository roots')
+    p.add_argument('--manifest', help='File with repo paths (text lines or JSONL with "path")')
+    p.add_argument('--tool', choices=TOOLS, default='mcp', help='Which analyzer(s) to run')
+    p.add_argument('--workers', type=int, default=os.cpu_count(), help='Process pool size')
+    p.add_argument('--timeout', type=float, help='Per-repo timeout in seconds')
+    p.add_argument('--slowest', type=int, default=10, help='How many slowest repos to report')
+    p.add_argument('--output', help='Write JSONL to file instead of stdout')
+    args = p.parse_args()
+
+    repos = list(args.repos)
+    if args.manifest:
+        repos.extend(read_manifest(args.manifest))
+    if not repos:
+        p.error('no repositories given (use positional paths or --manifest)')
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as out:
+            summary = run_batch(repos, args.tool, args.workers, args.timeout, out, args.slowest)
+    else:
+        summary = run_batch(repos, args.tool, args.workers, args.timeout, sys.stdout, args.slowest)
+    print(json.dumps(summary, indent=2, ensure_ascii=False), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
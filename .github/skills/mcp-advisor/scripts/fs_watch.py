@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""Minimal stdlib file watcher: inotify via ctypes on Linux, polling elsewhere.
+
+`iter_changes(root)` yields batches (sets) of absolute paths that were created,
+modified or deleted. Consumers re-check each path: if it no longer exists it
+was removed. A batch of `None` means events were lost (queue overflow) and the
+consumer should rescan from scratch.
+"""
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import time
+
+
+# Directories never walked or watched; shared by analyze_repo and language_profile.
+SKIP_DIRS = {'.git', '.hg', '.svn', 'node_modules', '__pycache__', '.venv', 'venv', '.tox', '.mypy_cache'}
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+EVENT_HEADER = struct.Struct('iIII')
+
+
+def walk_dirs(root, skip_dirs=SKIP_DIRS):
+    for dirpath, dirnames, _ in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in skip_dirs]
+        yield dirpath
+
+
+def walk_files(root, skip_dirs=SKIP_DIRS):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in skip_dirs]
+        for name in filenames:
+            yield os.path.join(dirpath, name)
+
+
+class PollingWatcher:
+    """Detect changes by comparing (mtime_ns, size) snapshots of the tree."""
+
+    def __init__(self, root, interval=1.0, skip_dirs=SKIP_DIRS):
+        self.root = str(root)
+        self.interval = interval
+        self.skip_dirs = skip_dirs
+        self.snapshot = self._take()
+
+    def _take(self):
+        snap = {}
+        for path in walk_files(self.root, self.skip_dirs):
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            snap[path] = (st.st_mtime_ns, st.st_size)
+        return snap
+
+    def __iter__(self):
+        while True:
+            time.sleep(self.interval)
+            new = self._take()
+            old = self.snapshot
+            changed = {p for p in new.keys() | old.keys() if new.get(p) != old.get(p)}
+            self.snapshot = new
+            if changed:
+                yield changed
+
+
+class InotifyWatcher:
+    """Recursive inotify watcher built on libc through ctypes (Linux only)."""
+
+    def __init__(self, root, debounce=0.1, skip_dirs=SKIP_DIRS):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.libc = libc
+        self.root = str(root)
+        self.debounce = debounce
+        self.skip_dirs = skip_dirs
+        self.fd = libc.inotify_init()
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init failed')
+        self.watches = {}
+        for d in walk_dirs(self.root, skip_dirs):
+            self._add(d)
+
+    def _add(self, path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), WATCH_MASK)
+        if wd >= 0:
+            self.watches[wd] = path
+
+    def _read(self):
+        changed = set()
+        data = os.read(self.fd, 1 << 16)
+        offset = 0
+        while offset < len(data):
+            wd, mask, _cookie, length = EVENT_HEADER.unpack_from(data, offset)
+            offset += EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            if mask & IN_Q_OVERFLOW:
+                return None
+            if mask & IN_IGNORED:
+                self.watches.pop(wd, None)
+                continue
+            base = self.watches.get(wd)
+            if base is None:
+                continue
+            path = os.path.join(base, os.fsdecode(name)) if name else base
+            if mask & IN_ISDIR:
+                if os.path.basename(path) in self.skip_dirs:
+                    continue
+                if mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files may land in the new directory before its watch exists.
+                    for d in walk_dirs(path, self.skip_dirs):
+                        self._add(d)
+                    changed.update(walk_files(path, self.skip_dirs))
+            changed.add(path)
+        return changed
+
+    def __iter__(self):
+        while True:
+            select.select([self.fd], [], [])
+            batch = set()
+            while True:
+                changed = self._read()
+                if changed is None:
+                    batch = None
+                    break
+                batch |= changed
+                ready, _, _ = select.select([self.fd], [], [], self.debounce)
+                if not ready:
+                    break
+            if batch is None or batch:
+                yield batch
+
+    def close(self):
+        os.close(self.fd)
+
+
+def iter_changes(root, interval=1.0, polling=False):
+    """Yield batches of changed paths under root, preferring inotify."""
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            return iter(InotifyWatcher(root))
+        except (OSError, AttributeError):
+            pass
+    return iter(PollingWatcher(root, interval=interval))
@@ -0,0 +1,240 @@
+#!/usr/bin/env python3
+"""Profile repository languages by file count, bytes and lines.
+
+Line counts come from counting newlines over raw byte blocks (no decoding).
+For very large trees an optional sampling mode reads only a random subset of
+files per language and extrapolates lines from the lines-per-byte ratio,
+reporting a confidence interval.
+
+Usage:
+    python language_profile.py --path /path/to/repo [--sample 200] [--output out.json]
+"""
+import argparse
+import json
+import math
+import os
+import random
+from pathlib import Path
+
+from fs_watch import SKIP_DIRS
+
+
+EXT_LANG_MAP = {
+    # Python
+    '.py': 'python', '.pyi': 'python', '.pyx': 'python', '.ipynb': 'jupyter',
+    # JavaScript / TypeScript
+    '.js': 'javascript', '.mjs': 'javascript', '.cjs': 'javascript', '.jsx': 'javascript',
+    '.ts': 'typescript', '.tsx': 'typescript', '.mts': 'typescript', '.cts': 'typescript',
+    '.vue': 'vue', '.svelte': 'svelte',
+    # JVM
+    '.java': 'java', '.kt': 'kotlin', '.kts': 'kotlin', '.scala': 'scala', '.groovy': 'groovy',
+    '.gradle': 'groovy', '.clj': 'clojure',
+    # Systems
+    '.c': 'c', '.h': 'c', '.cpp': 'cpp', '.cc': 'cpp', '.cxx': 'cpp', '.hpp': 'cpp', '.hh': 'cpp',
+    '.rs': 'rust', '.go': 'go', '.zig': 'zig', '.swift': 'swift', '.m': 'objective-c', '.mm': 'objective-c',
+    # .NET
+    '.cs': 'csharp', '.fs': 'fsharp', '.vb': 'vbnet',
+    # Scripting
+    '.rb': 'ruby', '.php': 'php', '.pl': 'perl', '.pm': 'perl', '.lua': 'lua', '.r': 'r',
+    '.jl': 'julia', '.dart': 'dart', '.ex': 'elixir', '.exs': 'elixir', '.erl': 'erlang',
+    '.hs': 'haskell', '.ml': 'ocaml', '.elm': 'elm',
+    # Shell
+    '.sh': 'shell', '.bash': 'shell', '.zsh': 'shell', '.fish': 'shell',
+    '.ps1': 'powershell', '.psm1': 'powershell', '.bat': 'batch', '.cmd': 'batch',
+    # Web / markup / styles
+    '.html': 'html', '.htm': 'html', '.css': 'css', '.scss': 'scss', '.sass': 'scss', '.less': 'less',
+    '.md': 'markdown', '.mdx': 'markdown', '.rst': 'restructuredtext', '.tex': 'tex',
+    # Data / config
+    '.json': 'json', '.yml': 'yaml', '.yaml': 'yaml', '.toml': 'toml', '.xml': 'xml',
+    '.ini': 'ini', '.cfg': 'ini', '.csv': 'csv', '.sql': 'sql', '.graphql': 'graphql', '.proto': 'protobuf',
+    # Infra
+    '.tf': 'terraform', '.hcl': 'hcl', '.nix': 'nix',
+}
+
+FILENAME_LANG_MAP = {
+    'dockerfile': 'dockerfile',
+    'makefile': 'makefile',
+    'gnumakefile': 'makefile',
+    'cmakelists.txt': 'cmake',
+    'jenkinsfile': 'groovy',
+    'rakefile': 'ruby',
+    'gemfile': 'ruby',
+    'vagrantfile': 'ruby',
+}
+
+SHEBANG_LANG_MAP = {
+    'python': 'python', 'python2': 'python', 'python3': 'python',
+    'sh': 'shell', 'bash': 'shell', 'zsh': 'shell', 'dash': 'shell', 'ksh': 'shell', 'fish': 'shell',
+    'node': 'javascript', 'nodejs': 'javascript', 'deno': 'typescript', 'ts-node': 'typescript',
+    'ruby': 'ruby', 'perl': 'perl', 'php': 'php', 'lua': 'lua', 'Rscript': 'r', 'pwsh': 'powershell',
+}
+
+BLOCK_SIZE = 1 << 20
+
+
+def count_lines(path) -> int:
+    """Count lines by counting b'\\n' in raw blocks; a trailing partial line counts too."""
+    lines = 0
+    last = b'\n'
+    with open(path, 'rb', buffering=0) as f:
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            lines += block.count(b'\n')
+            last = block[-1:]
+    if last != b'\n':
+        lines += 1
+    return lines
+
+
+def shebang_language(path):
+    """Return the language named by a `#!` line, or None."""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(128)
+    except OSError:
+        return None
+    if not head.startswith(b'#!'):
+        return None
+    words = head[2:].split(b'\n', 1)[0].decode('utf-8', 'ignore').split()
+    if not words:
+        return None
+    interpreter = os.path.basename(words[0])
+    if interpreter == 'env':
+        args = [w for w in words[1:] if not w.startswith('-')]
+        interpreter = args[0] if args else ''
+    return SHEBANG_LANG_MAP.get(interpreter)
+
+
+def detect_language(path, name):
+    lower = name.lower()
+    lang = FILENAME_LANG_MAP.get(lower)
+    if lang:
+        return lang
+    ext = os.path.splitext(lower)[1]
+    if ext:
+        return EXT_LANG_MAP.get(ext)
+    return shebang_language(path)
+
+
+def iter_source_files(root):
+    """Yield (path, language, size) for every recognised file under root."""
+    stack = [str(root)]
+    while stack:
+        current = stack.pop()
+        try:
+            entries = list(os.scandir(current))
+        except OSError:
+            continue
+        for entry in entries:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in SKIP_DIRS:
+                    stack.append(entry.path)
+            elif entry.is_file(follow_symlinks=False):
+                lang = detect_language(entry.path, entry.name)
+                if lang:
+                    try:
+                        size = entry.stat(follow_symlinks=False).st_size
+                    except OSError:
+                        continue  # vanished between scandir and stat
+                    yield entry.path, lang, size
+
+
+def try_count_lines(path):
+    """count_lines(), or None if the file cannot be read (permissions, races)."""
+    try:
+        return count_lines(path)
+    except OSError:
+        return None
+
+
+def estimate_lines(files, sample, rng, z=1.96):
+    """Estimate total lines from a random sample using a ratio (lines/bytes) estimator.
+
+    Returns (estimate, (low, high), sampled_count); unreadable sampled files are
+    left out of the ratio and of `sampled_count`.
+    """
+    n_total = len(files)
+    counted = [(try_count_lines(p), s) for p, s in rng.sample(files, sample)]
+    counted = [(l, s) for l, s in counted if l is not None]
+    sample = len(counted)
+    if not sample:
+        return 0, (0, 0), 0
+    lines = [l for l, _ in counted]
+    sizes = [s for _, s in counted]
+    total_bytes = sum(s for _, s in files)
+    sample_bytes = sum(sizes)
+    if sample_bytes == 0:
+        return 0, (0, 0), sample
+    ratio = sum(lines) / sample_bytes
+    estimate = ratio * total_bytes
+    if sample < 2:
+        return round(estimate), (round(estimate), round(estimate)), sample
+    residual = sum((l - ratio * s) ** 2 for l, s in zip(lines, sizes)) / (sample - 1)
+    mean_bytes = sample_bytes / sample
+    fpc = 1 - sample / n_total
+    se_ratio = math.sqrt(fpc * residual / sample) / mean_bytes
+    half = z * se_ratio * total_bytes
+    low = max(sum(lines), round(estimate - half))
+    return round(estimate), (low, round(estimate + half)), sample
+
+
+def profile_languages(root, sample=None, seed=0, z=1.96):
+    """Return {language: {files, bytes, lines[, lines_ci, sampled]}}.
+
+    File and byte totals are always exact. With `sample` set, at most that many
+    files per language are read and line totals are estimated with a
+    confidence interval (`z` = 1.96 for 95%). Files that cannot be read still
+    count in `files`/`bytes`; exact mode reports them as `unreadable`.
+    """
+    by_lang = {}
+    for path, lang, size in iter_source_files(Path(root)):
+        by_lang.setdefault(lang, []).append((path, size))
+
+    rng = random.Random(seed)
+    profile = {}
+    for lang in sorted(by_lang):
+        files = by_lang[lang]
+        entry = {'files': len(files), 'bytes': sum(s for _, s in files)}
+        if sample and len(files) > sample:
+            lines, ci, sampled = estimate_lines(files, sample, rng, z=z)
+            entry.update({'lines': lines, 'lines_ci': list(ci), 'sampled': sampled})
+        else:
+            counts = [try_count_lines(p) for p, _ in files]
+            entry['lines'] = sum(c for c in counts if c is not None)
+            unreadable = counts.count(None)
+            if unreadable:
+                entry['unreadable'] = unreadable
+        profile[lang] = entry
+    return profile
+
+
+def positive_int(text):
+    """argparse type for counts such as --sample: an integer >= 1."""
+    try:
+        value = int(text)
+    except ValueError:
+        value = 0
+    if value < 1:
+        raise argparse.ArgumentTypeError(f'expected an integer >= 1, got {text!r}')
+    return value
+
+
+def main():
+    p = argparse.ArgumentParser(description='Language profile: files, bytes and lines per language')
+    p.add_argument('--path', default='.', help='Path to repository root')
+    p.add_argument('--sample', type=positive_int, help='Read at most N files per language and estimate lines')
+    p.add_argument('--seed', type=int, default=0, help='Random seed for sampling')
+    p.add_argument('--output', help='Write JSON output to file')
+    args = p.parse_args()
+
+    profile = profile_languages(args.path, sample=args.sample, seed=args.seed)
+    text = json.dumps(profile, indent=2, ensure_ascii=False)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text, encoding='utf-8')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""Declarative, incremental MCP recommendation rules.
+
+Rules are data: each has an `id`, `name`, `reason` (may use `{evidence}`),
+`confidence`, `when` (evidence keys, any of which counts; empty = always) and
+optional `min` (distinct evidence values needed, default 1). They are loaded from the
+```json block in `references/recommended_mcps.md`, or from a JSON/YAML file.
+
+Evidence keys are `language`, `language:<name>`, `package`, `docker`, `k8s`
+and `ci`. `RuleEngine.feed()` takes evidence one item at a time and returns the
+recommendations whose threshold was just reached, so a scan can print results
+as soon as they are known and stop once every rule has fired.
+"""
+import json
+import os
+import re
+from functools import lru_cache
+from pathlib import Path
+
+DEFAULT_RULES_PATH = Path(__file__).resolve().parents[1] / 'references' / 'recommended_mcps.md'
+JSON_BLOCK_RE = re.compile(r'```json\s*\n(.*?)\n```', re.DOTALL)
+
+
+def parse_rules(data):
+    """Validate a list of rule dicts (or {"rules": [...]})."""
+    rules = data.get('rules', []) if isinstance(data, dict) else data
+    for r in rules:
+        missing = [k for k in ('id', 'name', 'reason', 'confidence') if k not in r]
+        if missing:
+            raise ValueError(f"MCP rule {r.get('id', '?')}: missing {', '.join(missing)}")
+        r.setdefault('when', [])
+        r.setdefault('min', 1)
+    return rules
+
+
+@lru_cache(maxsize=8)
+def load_rules(path=DEFAULT_RULES_PATH):
+    """Load rules from a markdown file (first ```json block), JSON or YAML."""
+    path = Path(path)
+    text = path.read_text(encoding='utf-8')
+    suffix = path.suffix.lower()
+    if suffix == '.md':
+        m = JSON_BLOCK_RE.search(text)
+        if not m:
+            raise ValueError(f'{path}: no ```json rules block found')
+        return parse_rules(json.loads(m.group(1)))
+    if suffix in ('.yml', '.yaml'):
+        import yaml
+        return parse_rules(yaml.safe_load(text))
+    return parse_rules(json.loads(text))
+
+
+class RuleEngine:
+    """Evaluate rules incrementally as evidence arrives."""
+
+    def __init__(self, rules, min_confidence=0.0):
+        self.rules = [r for r in rules if r['confidence'] >= min_confidence]
+        self.by_key = {}
+        for r in self.rules:
+            for key in r['when']:
+                self.by_key.setdefault(key, []).append(r)
+        # rule id -> distinct evidence values (dict as an ordered set)
+        self.evidence = {r['id']: {} for r in self.rules}
+        self.fired = set()
+
+    @property
+    def done(self):
+        return len(self.fired) == len(self.rules)
+
+    def recommendation(self, rule):
+        return {
+            'id': rule['id'],
+            'name': rule['name'],
+            'reason': rule['reason'].replace('{evidence}', ', '.join(self.evidence[rule['id']])),
+            'confidence': rule['confidence'],
+        }
+
+    def start(self):
+        """Fire the rules that need no evidence."""
+        return self._check([r for r in self.rules if not r['when']])
+
+    def feed(self, key, value):
+        """Record one evidence item (e.g. ('language:python', 'python')); return newly fired recs.
+
+        `key` may be `kind:detail`; it also counts as plain `kind` evidence.
+        """
+        keys = (key, key.split(':', 1)[0]) if ':' in key else (key,)
+        touched = []
+        for k in keys:
+            for rule in self.by_key.get(k, ()):
+                self.evidence[rule['id']][value] = None
+                touched.append(rule)
+        return self._check(touched)
+
+    def _check(self, rules):
+        new = []
+        for rule in rules:
+            if rule['id'] in self.fired:
+                continue
+            if not rule['when'] or len(self.evidence[rule['id']]) >= rule['min']:
+                self.fired.add(rule['id'])
+                new.append(self.recommendation(rule))
+        return new
+
+    def recommendations(self):
+        """All fired recommendations in rule order, with the evidence collected so far."""
+        return [self.recommendation(r) for r in self.rules if r['id'] in self.fired]
+
+
+def file_evidence(cls, rel):
+    """Evidence items contributed by one classified file (see analyze_repo.classify_file)."""
+    items = []
+    if cls['language']:
+        items.append((f"language:{cls['language']}", cls['language']))
+    if cls['package']:
+        items.append(('package', rel))
+    if cls['infra']:
+        lower = os.path.basename(rel).lower()
+        items.append(('docker' if 'docker' in lower else 'k8s', rel))
+    if cls['ci']:
+        items.append(('ci', rel))
+    return items
+
+
+def summary_evidence(summary):
+    """Evidence items from an already materialized analyze_repo summary."""
+    for lang in summary.get('languages', {}):
+        yield f'language:{lang}', lang
+    for rel in summary.get('package_files', []):
+        yield 'package', rel
+    for rel in summary.get('infra', []):
+        yield ('docker' if 'docker' in os.path.basename(rel).lower() else 'k8s'), rel
+    for rel in summary.get('ci', []):
+        yield 'ci', rel
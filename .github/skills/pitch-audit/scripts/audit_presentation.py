@@ -1,22 +1,417 @@
 #!/usr/bin/env python3
-"""Stub: convert a slide-structure text into an audit report skeleton."""
+"""Rule-driven audit of a pitch deck slide structure.
+
+A deck is a list of slides (`title`, `key_message` or `message`, `visual_guidance`,
+`data_needed`, `speaker_notes`), as JSON (a list or `{"slides": [...]}`) or
+markdown where every `#`/`##` heading starts a slide.
+
+All keyword features (metrics, claims, TAM/SAM/SOM, ask...) are compiled into
+one alternation regex, so each slide's text is scanned once; slide roles such as
+Market or Team come from a second small automaton over the title. The slide and
+deck rules from SKILL.md then run over the extracted feature sets. Many decks are
+audited in a process pool, with optional per-rule timing.
+
+Usage:
+  python audit_presentation.py deck.json
+  python audit_presentation.py decks/ --workers 8 --jsonl report.jsonl --stats
+  python audit_presentation.py regression/ --check --jsonl /dev/null
+"""
+import argparse
 import json
+import os
+import re
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+SLIDE_FIELDS = ('title', 'key_message', 'message', 'visual_guidance', 'data_needed', 'speaker_notes')
+DECK_EXTS = ('.json', '.md', '.txt')
+
+
+def words(*alternatives):
+    r"""Alternation anchored on word boundaries on both sides.
+
+    `(?<!\w)`/`(?!\w)` rather than `\b` so alternatives that start or end with
+    punctuation behave the same; `\w` is Unicode-aware, so Cyrillic stems such as
+    `рост` do not match inside `простой`. Stems spell out their endings (`\w*`).
+    """
+    return r'(?<!\w)(?:' + '|'.join(alternatives) + r')(?!\w)'
+
+
+# Keyword features found in one pass over the slide text (title included).
+# `number` is the only unanchored feature: "Q3", "x10" or "1,2M" still count.
+FEATURES = {
+    'number': r'\d',
+    'source': words(r'источник\w*', r'по данным', r'согласно', r'sources?', r'according to')
+              + r'|\[\d+\]|https?://',
+    'superlative': words(r'лучш\w*', r'единственн\w*', r'уникальн\w*', r'революц\w*', r'лидер\w*',
+                         r'best', r'unique', r'huge', r'massive', r'revolutionary', r'leading',
+                         r'market leader', r'first-ever', r'world-class', r'disruptive', r'огромн\w*',
+                         r'no\.?\s?1') + r'|(?:№|#)\s?1(?!\d)',
+    'tam': words(r'tam', r'total addressable', r'объ[её]м\w* рынка', r'[её]мкост\w* рынка', r'market size'),
+    # A bare "Sam" is usually a person (team slide), so the acronym only counts next
+    # to a figure or a market term ("SAM $1.4B", "TAM/SAM", "SAM market"); "SAM:"
+    # must be upper case, since "Sam: ex-CTO" is a name too.
+    'sam': words(r'sam(?=\s*(?:[/$€₽£]|\d|markets?\b|рын\w*|сегмент\w*))', r'(?-i:SAM)(?=\s*[:=])',
+                 r'(?<=/)sam', r'(?<=/ )sam',
+                 r'serviceable (?:available|addressable)', r'доступн\w* (?:сегмент\w*|рын\w*)'),
+    'som': words(r'som', r'serviceable obtainable', r'достижим\w* (?:дол\w*|рын\w*)'),
+    # "round" alone also reads as "year-round"/"round table", so it needs a funding word.
+    'ask': words(r'ask', r'raising', r'we raise', r'use of funds', r'investments?',
+                 r'(?:pre-?seed|seed|funding|bridge|series [a-d])[\s-]round', r'round of (?:funding|investment)',
+                 r'инвестиц\w*', r'привлека\w*', r'раунд\w*', r'использование средств', r'запрашиваем'),
+}
+
+# Slide roles, detected in one pass over the title only; kept in a separate
+# automaton so that e.g. "Market size" yields both `market_title` and `tam`.
+TITLE_FEATURES = {
+    'problem_title': words(r'problems?', r'pains?', r'проблем\w*', r'бол(?:ь|и|ей|ью|ями?)'),
+    'solution_title': words(r'solutions?', r'products?', r'решени\w*', r'продукт\w*'),
+    'traction_title': words(r'traction', r'metrics', r'growth', r'results?', r'трекшн\w*', r'метрик\w*',
+                            r'рост(?:а|ом|у)?', r'результат\w*'),
+    'market_title': words(r'markets?', r'рын\w*'),
+    'financial_title': words(r'financ\w*', r'revenue', r'unit economics', r'business model', r'финанс\w*',
+                             r'выручк\w*', r'юнит\w*', r'бизнес.модел\w*'),
+    'team_title': words(r'teams?', r'founders?', r'команд\w*', r'основател\w*'),
+    'competition_title': words(r'competit\w*', r'alternatives?', r'конкурент\w*', r'альтернатив\w*'),
+}
+
+METRIC_ROLES = ('traction_title', 'market_title', 'financial_title')
+
+# id, scope, category, criticality, title, explanation, fixes, example, field to strengthen
+RULES = [
+    {
+        'id': 'missing-metric', 'scope': 'slide', 'category': 'METRICS', 'criticality': 'High',
+        'title': 'Слайд без конкретных цифр',
+        'explanation': 'Слайд про рынок, трекшн или финансы не содержит ни одной цифры — инвестор не может оценить масштаб.',
+        'fixes': ['Добавить 1–2 ключевые метрики с периодом', 'Показать динамику (MoM/YoY)', 'Указать источник данных'],
+        'example': 'MRR 1,2 млн ₽, +18% MoM за последние 6 месяцев',
+        'field': 'data_needed',
+    },
+    {
+        'id': 'unsupported-claim', 'scope': 'slide', 'category': 'ARGUMENT', 'criticality': 'Medium',
+        'title': 'Утверждение без подтверждения',
+        'explanation': 'Превосходная степень («лучший», «единственный», «leading») без цифр или источника воспринимается как маркетинг.',
+        'fixes': ['Заменить оценку на измеримый факт', 'Добавить источник или кейс', 'Сравнить с альтернативой в цифрах'],
+        'example': '«Лучшее решение» → «в 3 раза быстрее Excel по данным пилота с 12 клиентами»',
+        'field': 'key_message',
+    },
+    {
+        'id': 'empty-slide', 'scope': 'slide', 'category': 'LOGIC', 'criticality': 'Low',
+        'title': 'Нет ключевого сообщения',
+        'explanation': 'У слайда нет key_message — непонятно, какой вывод должен сделать инвестор.',
+        'fixes': ['Сформулировать один вывод слайда', 'Вынести вывод в заголовок', 'Удалить слайд, если он не нужен'],
+        'example': 'Заголовок-вывод: «Рынок растёт на 25% в год»',
+        'field': 'key_message',
+    },
+    {
+        'id': 'no-tam-sam', 'scope': 'deck', 'category': 'INVESTMENT', 'criticality': 'High',
+        'title': 'Нет оценки рынка TAM/SAM/SOM',
+        'explanation': 'В презентации не найден размер рынка — инвестор не видит потенциала масштабирования.',
+        'fixes': ['Добавить слайд Market с TAM/SAM/SOM', 'Посчитать рынок bottom-up', 'Указать источники и год оценки'],
+        'example': 'TAM $12B → SAM $1,4B (РФ, B2B SaaS) → SOM $40M за 5 лет',
+        'field': 'data_needed',
+    },
+    {
+        'id': 'tam-without-sam', 'scope': 'deck', 'category': 'INVESTMENT', 'criticality': 'Medium',
+        'title': 'TAM без SAM/SOM',
+        'explanation': 'Указан только общий рынок; без SAM/SOM оценка выглядит как «1% от огромного рынка».',
+        'fixes': ['Сузить до доступного сегмента (SAM)', 'Оценить достижимую долю (SOM)', 'Связать SOM с планом продаж'],
+        'example': 'SAM: 40 тыс. компаний 50–500 сотрудников; SOM: 2% за 3 года',
+        'field': 'data_needed',
+    },
+    {
+        'id': 'no-ask', 'scope': 'deck', 'category': 'INVESTMENT', 'criticality': 'Critical',
+        'title': 'Нет слайда с запросом (Ask)',
+        'explanation': 'Не указано, сколько денег привлекается и на что — питч не заканчивается действием.',
+        'fixes': ['Добавить слайд Ask: сумма и инструмент', 'Показать use of funds в %', 'Привязать к вехам на 12–18 месяцев'],
+        'example': 'Привлекаем $1,5M seed: 50% продукт, 35% продажи, 15% операционные расходы',
+        'field': 'key_message',
+    },
+    {
+        'id': 'no-team', 'scope': 'deck', 'category': 'INVESTMENT', 'criticality': 'High',
+        'title': 'Нет слайда о команде',
+        'explanation': 'Инвесторы на ранних стадиях оценивают прежде всего команду.',
+        'fixes': ['Добавить слайд Team', 'Указать релевантный опыт основателей', 'Показать ключевых наймов'],
+        'example': 'CEO — 8 лет в B2B-продажах, ex-Yandex; CTO — 2 exit',
+        'field': 'key_message',
+    },
+    {
+        'id': 'no-competition', 'scope': 'deck', 'category': 'BEST_PRACTICE', 'criticality': 'Medium',
+        'title': 'Нет анализа конкурентов',
+        'explanation': 'Отсутствие конкурентов в презентации читается как незнание рынка.',
+        'fixes': ['Добавить слайд Competition', 'Сравнить по 3–4 ключевым критериям', 'Показать устойчивое преимущество'],
+        'example': 'Матрица 2×2: цена × скорость внедрения',
+        'field': 'visual_guidance',
+    },
+    {
+        'id': 'solution-before-problem', 'scope': 'deck', 'category': 'LOGIC', 'criticality': 'Medium',
+        'title': 'Решение показано раньше проблемы',
+        'explanation': 'Без сформулированной боли решение не воспринимается как ценное.',
+        'fixes': ['Переставить Problem перед Solution', 'Связать решение с конкретной болью', 'Добавить пример клиента'],
+        'example': 'Problem → Solution → Product → Traction',
+        'field': None,
+    },
+]
+
+CRITICALITY_WEIGHT = {'Critical': 25, 'High': 10, 'Medium': 5, 'Low': 2}
+
+
+
+def compile_scanner(features):
+    """Combine named patterns into one regex; returns (regex, group -> feature)."""
+    groups = [(f'f{i}', name) for i, name in enumerate(features)]
+    regex = re.compile('|'.join(f'(?P<{g}>{features[name]})' for g, name in groups), re.IGNORECASE)
+    return regex, dict(groups)
+
+
+SCANNER, GROUP_FEATURE = compile_scanner(FEATURES)
+TITLE_SCANNER, TITLE_GROUP_FEATURE = compile_scanner(TITLE_FEATURES)
+
+
+def slide_text(slide):
+    body = '\n'.join(str(slide[k]) for k in SLIDE_FIELDS[1:] if slide.get(k))
+    return str(slide.get('title') or ''), body
+
+
+def scan_slide(slide):
+    """Return the set of features present in a slide: one pass over the text, one over the title."""
+    title, body = slide_text(slide)
+    found = {GROUP_FEATURE[m.lastgroup] for m in SCANNER.finditer(f'{title}\n{body}')}
+    found.update(TITLE_GROUP_FEATURE[m.lastgroup] for m in TITLE_SCANNER.finditer(title))
+    if body.strip():
+        found.add('has_message')
+    return found
+
+
+# Slide rules get one slide's features; deck rules get the per-slide list.
+def _missing_metric(f):
+    return any(r in f for r in METRIC_ROLES) and 'number' not in f
+
+
+def _unsupported_claim(f):
+    return 'superlative' in f and 'number' not in f and 'source' not in f
+
+
+def _empty_slide(f):
+    return 'has_message' not in f
+
+
+def _first(slides, feature):
+    return next((i for i, f in enumerate(slides) if feature in f), None)
+
+
+def _no_tam_sam(slides):
+    return not any('tam' in f or 'sam' in f or 'som' in f for f in slides)
+
+
+def _tam_without_sam(slides):
+    return _first(slides, 'tam') is not None and not any('sam' in f or 'som' in f for f in slides)
+
 
-def audit_stub(structure):
-    # structure: list of {title, message}
+def _no_ask(slides):
+    return _first(slides, 'ask') is None
+
+
+def _no_team(slides):
+    return _first(slides, 'team_title') is None
+
+
+def _no_competition(slides):
+    return _first(slides, 'competition_title') is None
+
+
+def _solution_before_problem(slides):
+    problem, solution = _first(slides, 'problem_title'), _first(slides, 'solution_title')
+    return problem is not None and solution is not None and solution < problem
+
+
+CHECKS = {
+    'missing-metric': _missing_metric,
+    'unsupported-claim': _unsupported_claim,
+    'empty-slide': _empty_slide,
+    'no-tam-sam': _no_tam_sam,
+    'tam-without-sam': _tam_without_sam,
+    'no-ask': _no_ask,
+    'no-team': _no_team,
+    'no-competition': _no_competition,
+    'solution-before-problem': _solution_before_problem,
+}
+SLIDE_RULES = [r for r in RULES if r['scope'] == 'slide']
+DECK_RULES = [r for r in RULES if r['scope'] == 'deck']
+
+
+def _problem(rule, where):
+    problem = {
+        'category': rule['category'],
+        'rule': rule['id'],
+        'title': rule['title'],
+        'criticality': rule['criticality'],
+        'where': where,
+        'explanation': rule['explanation'],
+        'fixes': list(rule['fixes']),
+        'example_improvement': rule['example'],
+    }
+    if rule['field']:
+        problem['strengthen_field'] = rule['field']
+    return problem
+
+
+def audit(slides, timings=None):
+    """Audit one deck. Returns {"problems": [...], "readiness": 0-100}.
+
+    If `timings` is a dict, seconds spent per rule (and in the shared `scan`)
+    are added to it.
+    """
+    clock = time.perf_counter
     problems = []
-    for s in structure:
-        problems.append({
-            "category": "LOGIC",
-            "title": f"Check {s.get('title')}",
-            "criticality": "Medium",
-            "where": s.get('title'),
-            "why": "Placeholder reasoning",
-            "fix": ["Add concrete metric", "Tighten claim"],
-        })
-    return problems
+    features = []
+    for slide in slides:
+        started = clock()
+        f = scan_slide(slide)
+        if timings is not None:
+            timings['scan'] = timings.get('scan', 0.0) + clock() - started
+        features.append(f)
+        where = slide.get('title') or f'slide {len(features)}'
+        for rule in SLIDE_RULES:
+            started = clock()
+            hit = CHECKS[rule['id']](f)
+            if timings is not None:
+                timings[rule['id']] = timings.get(rule['id'], 0.0) + clock() - started
+            if hit:
+                problems.append(_problem(rule, where))
+    for rule in DECK_RULES:
+        started = clock()
+        hit = CHECKS[rule['id']](features)
+        if timings is not None:
+            timings[rule['id']] = timings.get(rule['id'], 0.0) + clock() - started
+        if hit:
+            problems.append(_problem(rule, 'deck'))
+    if any(p['rule'] == 'no-tam-sam' for p in problems):
+        problems = [p for p in problems if p['rule'] != 'tam-without-sam']
+    penalty = sum(CRITICALITY_WEIGHT[p['criticality']] for p in problems)
+    return {'problems': problems, 'readiness': max(0, 100 - penalty)}
+
+
+def parse_markdown(text):
+    slides = []
+    for line in text.splitlines():
+        m = re.match(r'^#{1,3}\s+(.*)', line)
+        if m:
+            slides.append({'title': m.group(1).strip(), 'key_message': ''})
+        elif slides and line.strip():
+            slides[-1]['key_message'] += line.strip() + '\n'
+    return slides
+
+
+def read_deck(path):
+    """Return (slides, expect); `expect` is the optional `{"rules": [...], "not_rules": [...]}`
+    block of a JSON deck, used by regression decks and `--check`."""
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+    if path.endswith('.json'):
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return data.get('slides', []), data.get('expect')
+        return data, None
+    return parse_markdown(text), None
+
+
+def load_deck(path):
+    return read_deck(path)[0]
+
+
+def check_expect(result, expect):
+    """Mismatches between the reported rules and a deck's `expect` block."""
+    reported = {p['rule'] for p in result['problems']}
+    failures = [f'expected {r}' for r in expect.get('rules', ()) if r not in reported]
+    failures += [f'unexpected {r}' for r in expect.get('not_rules', ()) if r in reported]
+    return failures
+
+
+def audit_file(path, timed=False):
+    timings = {} if timed else None
+    try:
+        slides, expect = read_deck(path)
+        result = audit(slides, timings)
+    except (OSError, ValueError) as e:
+        return {'path': path, 'error': str(e)}, timings
+    result['path'] = path
+    if expect:
+        result['expect_failures'] = check_expect(result, expect)
+    return result, timings
+
+
+def _audit_file_star(args):
+    return audit_file(*args)
+
+
+def iter_decks(paths):
+    for p in paths:
+        if os.path.isdir(p):
+            for dirpath, dirnames, filenames in os.walk(p):
+                dirnames[:] = sorted(d for d in dirnames if not d.startswith('.'))
+                for name in sorted(filenames):
+                    if name.endswith(DECK_EXTS):
+                        yield os.path.join(dirpath, name)
+        else:
+            yield p
+
+
+def audit_batch(paths, workers=None, timed=False):
+    """Audit many deck files in a process pool; yields (report, timings) in input order."""
+    decks = list(iter_decks(paths))
+    if len(decks) == 1:
+        yield audit_file(decks[0], timed)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(_audit_file_star, [(d, timed) for d in decks], chunksize=16)
+
+
+def main():
+    p = argparse.ArgumentParser(description='Audit pitch deck structures')
+    p.add_argument('paths', nargs='*', help='Deck files (.json/.md) or directories')
+    p.add_argument('--workers', type=int, help='Process pool size for batches')
+    p.add_argument('--jsonl', help='Write one report per line to this file instead of stdout')
+    p.add_argument('--stats', action='store_true', help='Print per-rule timing to stderr')
+    p.add_argument('--check', action='store_true',
+                   help='Exit 1 if a deck with an "expect" block reports different rules (regression decks)')
+    args = p.parse_args()
+
+    if not args.paths:
+        sample = [{'title': 'Cover', 'key_message': '...'}, {'title': 'Problem', 'key_message': '...'}]
+        print(json.dumps(audit(sample), ensure_ascii=False, indent=2))
+        return
+
+    totals = {}
+    decks = 0
+    failed = []
+    out = open(args.jsonl, 'w', encoding='utf-8') if args.jsonl else None
+    started = time.perf_counter()
+    try:
+        for report, timings in audit_batch(args.paths, args.workers, args.stats):
+            decks += 1
+            for rule, seconds in (timings or {}).items():
+                totals[rule] = totals.get(rule, 0.0) + seconds
+            if report.get('expect_failures'):
+                failed.append(report)
+            if out:
+                out.write(json.dumps(report, ensure_ascii=False) + '\n')
+            else:
+                print(json.dumps(report, ensure_ascii=False, indent=None if decks > 1 or args.stats else 2))
+    finally:
+        if out:
+            out.close()
+    if args.stats:
+        elapsed = time.perf_counter() - started
+        print(f'{decks} deck(s) in {elapsed:.2f}s', file=sys.stderr)
+        for rule, seconds in sorted(totals.items(), key=lambda kv: -kv[1]):
+            print(f'  {rule:<24} {seconds * 1000:10.1f} ms', file=sys.stderr)
+    if args.check and failed:
+        for report in failed:
+            print(f"{report['path']}: {', '.join(report['expect_failures'])}", file=sys.stderr)
+        sys.exit(1)
+
 
 if __name__ == '__main__':
-    # example run
-    sample = [{"title": "Cover", "message": "..."}, {"title": "Problem", "message": "..."}]
-    print(json.dumps(audit_stub(sample), ensure_ascii=False, indent=2))
+    main()
@@ -1,15 +1,61 @@
 #!/usr/bin/env python3
+"""Create Copilot-style prompt template JSON files.
+
+Single mode writes one `<name>.prompt.json` from CLI flags. Registry mode
+(`--registry templates.jsonl`) ingests many templates (one JSON object per
+line), checks that the `{placeholder}` tokens in each `prompt` match its
+declared `placeholders`, writes every template in one batch and maintains
+`templates/index.json` (name, file, scope, sha256 + a scope lookup), so tools
+can find templates by scope without opening each file.
+"""
 import argparse
+import hashlib
 import json
 import os
+import re
 import sys
+import tempfile
+
+INDEX_NAME = 'index.json'
+INDEX_FORMAT = 1
+# `{{`/`}}` are literal braces; `{name}` is a placeholder.
+PLACEHOLDER_RE = re.compile(r'\{\{|\}\}|\{([A-Za-z_][A-Za-z0-9_.-]*)\}')
+
+
+def prompt_placeholders(prompt):
+    """Placeholder names used in a prompt, in order of first use."""
+    return list(dict.fromkeys(m.group(1) for m in PLACEHOLDER_RE.finditer(prompt) if m.group(1)))
+
+
+def check_placeholders(obj):
+    """Return (errors, warnings) for placeholder consistency of one template."""
+    used = prompt_placeholders(obj.get('prompt', ''))
+    declared = obj.get('placeholders') or {}
+    errors = [f'placeholder {{{name}}} is used in prompt but not declared' for name in used if name not in declared]
+    warnings = [f'placeholder "{name}" is declared but not used in prompt' for name in declared if name not in used]
+    return errors, warnings
+
+
+def safe_filename(name):
+    safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in name).strip().replace(' ', '_')
+    return f"{safe_name}.prompt.json"
+
+
+def normalize_scope(scope):
+    if isinstance(scope, list):
+        return scope
+    return [s.strip() for s in (scope or '*').split(',') if s.strip()]
+
+
+def serialize(obj):
+    return json.dumps(obj, indent=2, ensure_ascii=False).encode('utf-8')
 
 
 def build_obj(args):
     out = {
         "displayName": args.name,
         "description": args.description or "",
-        "scope": args.scope if isinstance(args.scope, list) else [s.strip() for s in args.scope.split(',') if s.strip()],
+        "scope": normalize_scope(args.scope),
         "prompt": args.prompt,
     }
     if args.placeholders:
@@ -22,26 +68,184 @@ def build_obj(args):
     return out
 
 
+def template_from_record(rec):
+    """Normalize one registry record (accepts `name` as an alias of `displayName`)."""
+    obj = {
+        "displayName": rec.get("displayName") or rec.get("name") or "",
+        "description": rec.get("description", ""),
+        "scope": normalize_scope(rec.get("scope", "*")),
+        "prompt": rec.get("prompt", ""),
+    }
+    if rec.get("placeholders"):
+        obj["placeholders"] = rec["placeholders"]
+    return obj
+
+
+def load_index(outdir):
+    try:
+        with open(os.path.join(outdir, INDEX_NAME), 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') == INDEX_FORMAT:
+            return {e['file']: e for e in data.get('templates', [])}
+    except (OSError, ValueError):
+        pass
+    return {}
+
+
+def save_index(outdir, entries):
+    """Write index.json atomically; drops entries whose file is gone."""
+    templates = sorted((e for e in entries.values() if os.path.exists(os.path.join(outdir, e['file']))),
+                       key=lambda e: e['file'])
+    by_scope = {}
+    for e in templates:
+        for scope in e['scope']:
+            by_scope.setdefault(scope, []).append(e['file'])
+    data = {'format': INDEX_FORMAT, 'templates': templates, 'by_scope': dict(sorted(by_scope.items()))}
+    fd, tmp = tempfile.mkstemp(prefix='.index-', suffix='.json', dir=outdir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write('\n')
+    os.replace(tmp, os.path.join(outdir, INDEX_NAME))
+
+
+def index_entry(obj, filename, payload):
+    return {
+        'name': obj['displayName'],
+        'file': filename,
+        'scope': obj['scope'],
+        'sha256': hashlib.sha256(payload).hexdigest(),
+    }
+
+
+def write_templates(objs, outdir):
+    """Write templates and update the index once. Unchanged files are not rewritten.
+
+    Returns (written, unchanged) counts.
+    """
+    os.makedirs(outdir, exist_ok=True)
+    entries = load_index(outdir)
+    written = unchanged = 0
+    for obj in objs:
+        filename = safe_filename(obj['displayName'])
+        payload = serialize(obj)
+        entry = index_entry(obj, filename, payload)
+        path = os.path.join(outdir, filename)
+        old = entries.get(filename)
+        if old and old['sha256'] == entry['sha256'] and os.path.exists(path):
+            unchanged += 1
+        else:
+            with open(path, 'wb') as f:
+                f.write(payload)
+            written += 1
+        entries[filename] = entry
+    save_index(outdir, entries)
+    return written, unchanged
+
+
+def reindex(outdir):
+    """Rebuild index.json from the *.prompt.json files in outdir."""
+    entries = {}
+    for name in sorted(os.listdir(outdir)):
+        if name.endswith('.prompt.json'):
+            with open(os.path.join(outdir, name), 'rb') as f:
+                payload = f.read()
+            obj = json.loads(payload)
+            entries[name] = index_entry(
+                {'displayName': obj.get('displayName', ''), 'scope': normalize_scope(obj.get('scope', '*'))},
+                name, payload)
+    save_index(outdir, entries)
+    return len(entries)
+
+
+def find_by_scope(scope, outdir):
+    """Template files registered for `scope` (plus `*` templates), from the index only."""
+    entries = load_index(outdir)
+    return sorted(e['file'] for e in entries.values() if scope in e['scope'] or '*' in e['scope'])
+
+
+def ingest_registry(path, outdir, skip_invalid=False):
+    """Validate every template in a JSONL file, then write them in one batch.
+
+    Returns (written, unchanged, problems); nothing is written when any template
+    is invalid unless `skip_invalid` is set.
+    """
+    objs = []
+    problems = []
+    names = {}
+    with open(path, 'r', encoding='utf-8') as f:
+        for lineno, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                rec = json.loads(line)
+            except ValueError as e:
+                problems.append({'line': lineno, 'level': 'error', 'message': f'invalid JSON: {e}'})
+                continue
+            if not isinstance(rec, dict):
+                problems.append({'line': lineno, 'level': 'error',
+                                 'message': f'expected a JSON object, got {type(rec).__name__}'})
+                continue
+            obj = template_from_record(rec)
+            errors, warnings = check_placeholders(obj)
+            if not obj['displayName'] or not obj['prompt']:
+                errors.append('displayName and prompt are required')
+            filename = safe_filename(obj['displayName'])
+            if filename in names:
+                errors.append(f'{filename} already defined on line {names[filename]}')
+            names.setdefault(filename, lineno)
+            problems += [{'line': lineno, 'name': obj['displayName'], 'level': 'error', 'message': m} for m in errors]
+            problems += [{'line': lineno, 'name': obj['displayName'], 'level': 'warning', 'message': m} for m in warnings]
+            if not errors:
+                objs.append(obj)
+    if any(p['level'] == 'error' for p in problems) and not skip_invalid:
+        return 0, 0, problems
+    written, unchanged = write_templates(objs, outdir)
+    return written, unchanged, problems
+
+
 def main():
     p = argparse.ArgumentParser(description="Create a Copilot-style prompt template JSON file")
-    p.add_argument("--name", required=True, help="Display name for the prompt template")
+    p.add_argument("--name", help="Display name for the prompt template")
     p.add_argument("--description", default="", help="Short description")
-    p.add_argument("--prompt", required=True, help="The prompt text (can contain placeholders)")
+    p.add_argument("--prompt", help="The prompt text (can contain placeholders)")
     p.add_argument("--scope", default="*", help="Comma-separated list of scopes/languages (e.g. javascript,typescript)")
     p.add_argument("--placeholders", help='JSON string describing placeholders (e.g. "{\"goal\":{\"description\":\"...\"}}")')
     p.add_argument("--output-dir", default=os.path.join(os.path.dirname(__file__), '..', 'templates'), help="Output directory for templates")
+    p.add_argument("--registry", help="JSONL file with one template per line; validates and writes them all")
+    p.add_argument("--skip-invalid", action="store_true", help="With --registry: write valid templates even if some are invalid")
+    p.add_argument("--reindex", action="store_true", help="Rebuild index.json from the templates directory")
+    p.add_argument("--find-scope", help="List template files for a scope using index.json")
     args = p.parse_args()
 
     outdir = os.path.abspath(args.output_dir)
-    os.makedirs(outdir, exist_ok=True)
 
-    safe_name = "".join(c if c.isalnum() or c in (' ', '-', '_') else '_' for c in args.name).strip().replace(' ', '_')
-    filename = f"{safe_name}.prompt.json"
-    path = os.path.join(outdir, filename)
+    if args.find_scope:
+        for name in find_by_scope(args.find_scope, outdir):
+            print(os.path.join(outdir, name))
+        return
+    if args.reindex:
+        print(f"Indexed {reindex(outdir)} prompt templates in {os.path.join(outdir, INDEX_NAME)}")
+        return
+    if args.registry:
+        written, unchanged, problems = ingest_registry(args.registry, outdir, args.skip_invalid)
+        for prob in problems:
+            where = f"line {prob['line']}" + (f" ({prob['name']})" if prob.get('name') else '')
+            print(f"{prob['level']}: {where}: {prob['message']}", file=sys.stderr)
+        failed = any(prob['level'] == 'error' for prob in problems)
+        if failed and not args.skip_invalid:
+            print("Registry not written: fix the errors above or pass --skip-invalid", file=sys.stderr)
+            sys.exit(2)
+        print(f"Wrote {written} prompt templates ({unchanged} unchanged) to {outdir}")
+        return
 
+    if not args.name or not args.prompt:
+        p.error("--name and --prompt are required unless --registry, --reindex or --find-scope is used")
     obj = build_obj(args)
-    with open(path, 'w', encoding='utf-8') as f:
-        json.dump(obj, f, indent=2, ensure_ascii=False)
+    errors, warnings = check_placeholders(obj)
+    for msg in errors + warnings:
+        print(f"warning: {msg}", file=sys.stderr)
+    write_templates([obj], outdir)
+    path = os.path.join(outdir, safe_filename(args.name))
 
     print(f"Wrote prompt template: {path}")
 
@@ -9,49 +9,373 @@ This script is intentionally dependency-free (stdlib only).
 
 from pathlib import Path
 import argparse
+import functools
+import hashlib
+import heapq
+import importlib.util
 import json
+import os
 import textwrap
 import re
 
 
-def scan_repo(root: Path):
-    root = Path(root)
-    info = {
-        "has_package_json": False,
-        "has_pyproject": False,
-        "has_requirements": False,
-        "has_dockerfile": False,
-        "has_workflows": False,
-        "has_tests": False,
-        "has_readme": False,
-        "languages": set(),
+try:
+    import tomllib
+except ImportError:  # Python < 3.11
+    tomllib = None
+
+
+# Classification rules. Each rule sets a boolean flag in the scan summary
+# (and optionally a language) when a file matches. Match kinds:
+#   name   - exact lowercase file name
+#   prefix - lowercase file name starts with pattern
+#   suffix - lowercase file name ends with pattern
+#   dir    - file lives (at any depth) under a directory path like ".github/workflows"
+#   regex  - re.search over the lowercase file name
+DEFAULT_RULES = [
+    {"id": "package-json", "match": "name", "pattern": "package.json", "flag": "has_package_json", "language": "javascript"},
+    {"id": "pyproject", "match": "name", "pattern": "pyproject.toml", "flag": "has_pyproject", "language": "python"},
+    {"id": "requirements", "match": "name", "pattern": "requirements.txt", "flag": "has_requirements", "language": "python"},
+    {"id": "requirements-dev", "match": "name", "pattern": "requirements-dev.txt", "flag": "has_requirements", "language": "python"},
+    {"id": "dockerfile", "match": "name", "pattern": "dockerfile", "flag": "has_dockerfile"},
+    {"id": "workflows", "match": "dir", "pattern": ".github/workflows", "flag": "has_workflows"},
+    {"id": "tests", "match": "regex", "pattern": r"test", "flag": "has_tests"},
+    {"id": "readme", "match": "prefix", "pattern": "readme", "flag": "has_readme"},
+]
+
+MATCH_KINDS = ("name", "prefix", "suffix", "dir", "regex")
+
+# Shared stdlib watcher (inotify with polling fallback) used by `analyze --watch`.
+FS_WATCH_PATH = Path(__file__).resolve().parents[1] / "mcp-advisor" / "scripts" / "fs_watch.py"
+
+# Shared compiled template engine used for agent files (str.format when absent).
+TEMPLATING_PATH = Path(__file__).resolve().parents[1] / "skill-creator" / "scripts" / "templating.py"
+
+# Header-only JPEG/PNG metadata scanner behind the oversized-image signal.
+IMAGE_META_PATH = Path(__file__).resolve().parents[1] / "image-assets" / "scripts" / "image_meta.py"
+
+
+def _load_shared(name: str, path: Path):
+    """Load a helper module from a sibling skill by path.
+
+    Returns None when the file is missing (the skill was packaged on its own),
+    so callers can fall back or skip the feature it backs.
+    """
+    try:
+        spec = importlib.util.spec_from_file_location(name, path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except (OSError, ImportError):
+        return None
+    return module
+
+
+templating = _load_shared("templating", TEMPLATING_PATH)
+
+
+def load_rules(path: Path):
+    """Load extra rules from a TOML file with one or more [[rule]] tables."""
+    if tomllib is None:
+        raise RuntimeError("Loading rules from TOML requires Python 3.11+ (tomllib)")
+    with open(path, "rb") as f:
+        data = tomllib.load(f)
+    rules = data.get("rule", [])
+    for r in rules:
+        missing = [k for k in ("id", "match", "pattern", "flag") if k not in r]
+        if missing:
+            raise ValueError(f"Rule {r!r} is missing: {', '.join(missing)}")
+        if r["match"] not in MATCH_KINDS:
+            raise ValueError(f"Rule {r['id']}: unknown match kind {r['match']!r}")
+    return rules
+
+
+class RuleMatcher:
+    """Rule table compiled once into hash lookups plus a single combined regex.
+
+    Per-file cost depends on the number of distinct prefix/suffix lengths, not
+    on the number of rules: names are a dict lookup, prefixes and suffixes are
+    one dict lookup per distinct length, and all regex rules share one pattern
+    that screens out non-matching names before the per-rule patterns run.
+    Directory rules are resolved once per directory during the walk.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.by_name = {}
+        self.by_prefix = {}
+        self.by_suffix = {}
+        self.by_dir = {}
+        regex_parts = []
+        self.regex_rules = []
+        for i, r in enumerate(self.rules):
+            kind, pattern = r["match"], r["pattern"]
+            if kind == "name":
+                self.by_name.setdefault(pattern.lower(), []).append(i)
+            elif kind == "prefix":
+                self.by_prefix.setdefault(pattern.lower(), []).append(i)
+            elif kind == "suffix":
+                self.by_suffix.setdefault(pattern.lower(), []).append(i)
+            elif kind == "dir":
+                parts = tuple(x for x in pattern.replace("\\", "/").split("/") if x)
+                self.by_dir.setdefault(parts, []).append(i)
+            elif kind == "regex":
+                regex_parts.append(f"(?:{pattern})")
+                self.regex_rules.append((i, re.compile(pattern)))
+        self.prefix_lens = sorted({len(k) for k in self.by_prefix})
+        self.suffix_lens = sorted({len(k) for k in self.by_suffix})
+        self.dir_lens = sorted({len(k) for k in self.by_dir})
+        # One alternation over every regex rule as a prefilter: most names match
+        # none, and for those a single search is enough.
+        self.regex = re.compile("|".join(regex_parts)) if regex_parts else None
+
+    def match_dir(self, parts, inherited=()):
+        """Return dir-rule indices active for a directory given its path parts."""
+        hits = list(inherited)
+        for n in self.dir_lens:
+            if n <= len(parts):
+                hits.extend(self.by_dir.get(tuple(parts[-n:]), ()))
+        return tuple(hits)
+
+    def match_path(self, parts):
+        """Return all rule indices for a file given its path parts relative to the root."""
+        hits = []
+        for depth in range(len(parts)):
+            hits.extend(self.match_dir(parts[:depth]))
+        hits.extend(self.match_file(parts[-1].lower()))
+        return tuple(hits)
+
+    def match_file(self, name: str):
+        """Yield indices of the file-name rules matching a lowercase name."""
+        yield from self.by_name.get(name, ())
+        for n in self.prefix_lens:
+            yield from self.by_prefix.get(name[:n], ())
+        for n in self.suffix_lens:
+            yield from self.by_suffix.get(name[-n:], ())
+        if self.regex is not None and self.regex.search(name):
+            if len(self.regex_rules) == 1:
+                yield self.regex_rules[0][0]
+            else:
+                # Several regex rules can match one name; each counts, as before.
+                for i, rx in self.regex_rules:
+                    if rx.search(name):
+                        yield i
+
+
+def build_matcher(rules_path=None):
+    """Compile the default rules plus any user rules from a TOML file."""
+    rules = list(DEFAULT_RULES)
+    if rules_path:
+        rules.extend(load_rules(Path(rules_path)))
+    return RuleMatcher(rules)
+
+
+BINARY_EXTS = {
+    ".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif", ".heic", ".tif", ".tiff", ".bmp", ".psd", ".ai",
+    ".pdf", ".zip", ".gz", ".tgz", ".7z", ".rar", ".mp4", ".mov", ".avi", ".mkv", ".mp3", ".wav",
+    ".woff", ".woff2", ".ttf", ".otf", ".exe", ".dll", ".so", ".bin", ".skill",
+}
+ASSET_SKIP_DIRS = {".git", ".hg", ".svn", "node_modules"}
+LARGE_BINARY_BYTES = 1 << 20
+TOP_BINARIES = 10
+PARTIAL_HASH_BYTES = 64 * 1024
+HASH_BLOCK = 1 << 20
+
+
+def _file_digest(path, limit=None):
+    h = hashlib.blake2b(digest_size=16)
+    remaining = limit
+    with open(path, "rb") as f:
+        while remaining is None or remaining > 0:
+            block = f.read(HASH_BLOCK if remaining is None else min(HASH_BLOCK, remaining))
+            if not block:
+                break
+            h.update(block)
+            if remaining is not None:
+                remaining -= len(block)
+    return h.hexdigest()
+
+
+def find_duplicates(sizes):
+    """Group identical files. `sizes` maps path -> size.
+
+    Only files whose sizes collide are read: first the leading 64 KiB are
+    hashed, then files that still collide are hashed in full.
+    """
+    by_size = {}
+    for path, size in sizes.items():
+        if size:
+            by_size.setdefault(size, []).append(path)
+
+    groups = []
+    for size, paths in by_size.items():
+        if len(paths) < 2:
+            continue
+        by_partial = {}
+        for p in paths:
+            try:
+                by_partial.setdefault(_file_digest(p, PARTIAL_HASH_BYTES), []).append(p)
+            except OSError:
+                continue
+        for candidates in by_partial.values():
+            if len(candidates) < 2:
+                continue
+            if size <= PARTIAL_HASH_BYTES:
+                by_full = {"": candidates}
+            else:
+                by_full = {}
+                for p in candidates:
+                    try:
+                        by_full.setdefault(_file_digest(p), []).append(p)
+                    except OSError:
+                        continue
+            for same in by_full.values():
+                if len(same) > 1:
+                    groups.append({"size": size, "files": sorted(same)})
+    groups.sort(key=lambda g: g["size"] * (len(g["files"]) - 1), reverse=True)
+    return groups
+
+
+def summarize_assets(root: Path, sizes):
+    """Report duplicate groups and the largest binary files from a path -> size map."""
+    binaries = [(size, p) for p, size in sizes.items() if os.path.splitext(p)[1].lower() in BINARY_EXTS]
+    largest = heapq.nlargest(TOP_BINARIES, binaries)
+    groups = find_duplicates(sizes)
+    for g in groups:
+        g["files"] = [Path(p).relative_to(root).as_posix() for p in g["files"]]
+    return {
+        "binary_bytes": sum(size for size, _ in binaries),
+        "large_binaries": [
+            {"path": Path(p).relative_to(root).as_posix(), "size": size}
+            for size, p in largest if size >= LARGE_BINARY_BYTES
+        ],
+        "duplicate_groups": groups,
+        "duplicate_bytes": sum(g["size"] * (len(g["files"]) - 1) for g in groups),
     }
 
-    for p in root.rglob("*"):
-        if p.is_file():
-            name = p.name.lower()
-            if name == "package.json":
-                info["has_package_json"] = True
-                info["languages"].add("javascript")
-            if name in ("pyproject.toml",):
-                info["has_pyproject"] = True
-                info["languages"].add("python")
-            if name in ("requirements.txt", "requirements-dev.txt"):
-                info["has_requirements"] = True
-                info["languages"].add("python")
-            if name == "dockerfile":
-                info["has_dockerfile"] = True
-            if "/.github/workflows/" in str(p).replace("\\", "/"):
-                info["has_workflows"] = True
-            if re.search(r"test|pytest|_test\.(js|ts|py)$", name):
-                info["has_tests"] = True
-            if name.startswith("readme"):
-                info["has_readme"] = True
-
-    info["languages"] = sorted(info["languages"])
+
+@functools.lru_cache(maxsize=None)
+def _load_image_meta():
+    return _load_shared("image_meta", IMAGE_META_PATH)
+
+
+def summarize_images(root: Path, sizes):
+    """Dimensions/weight of every JPEG/PNG (headers only) and the oversized ones.
+
+    Empty when image-assets is not installed next to this skill.
+    """
+    image_meta = _load_image_meta()
+    if image_meta is None:
+        return {}
+    paths = [p for p in sizes if os.path.splitext(p)[1].lower() in image_meta.META_EXTS]
+    return image_meta.summarize(root, image_meta.scan(paths))
+
+
+def scan_repo(root: Path, rules=None, assets=True):
+    root = Path(root)
+    matcher = rules if isinstance(rules, RuleMatcher) else RuleMatcher(rules or DEFAULT_RULES)
+    hits = [0] * len(matcher.rules)
+    sizes = {}
+
+    dir_hits = {root: ()}
+    for dirpath, _dirnames, filenames in os.walk(root):
+        current = Path(dirpath)
+        parts = current.relative_to(root).parts
+        active = matcher.match_dir(parts, dir_hits.get(current.parent, ()))
+        dir_hits[current] = active
+        collect = assets and not ASSET_SKIP_DIRS.intersection(parts)
+        for filename in filenames:
+            for i in active:
+                hits[i] += 1
+            for i in matcher.match_file(filename.lower()):
+                hits[i] += 1
+            if collect:
+                path = os.path.join(dirpath, filename)
+                try:
+                    sizes[path] = os.stat(path).st_size
+                except OSError:
+                    pass
+
+    info = summarize_hits(matcher, hits)
+    if assets:
+        info.update(summarize_assets(root, sizes))
+        info.update(summarize_images(root, sizes))
+    return info
+
+
+def summarize_hits(matcher: RuleMatcher, hits):
+    """Build the scan summary (flags, languages, rule_hits) from per-rule hit counts."""
+    info = {r["flag"]: False for r in matcher.rules}
+    languages = set()
+    for i, count in enumerate(hits):
+        if count:
+            rule = matcher.rules[i]
+            info[rule["flag"]] = True
+            if rule.get("language"):
+                languages.add(rule["language"])
+
+    info["languages"] = sorted(languages)
+    info["rule_hits"] = {r["id"]: hits[i] for i, r in enumerate(matcher.rules)}
     return info
 
 
+def watch_repo(root: Path, matcher: RuleMatcher, interval=1.0, polling=False):
+    """Keep per-file rule hits in memory and print proposals when flags change.
+
+    Emits one JSON line at start and another each time the scan summary flags
+    or languages change; file churn that does not change a flag is ignored.
+    """
+    fs_watch = _load_shared("fs_watch", FS_WATCH_PATH)
+    if fs_watch is None:
+        raise RuntimeError(f"--watch needs the mcp-advisor skill next to this one ({FS_WATCH_PATH})")
+    root = Path(root).resolve()
+    per_file = {}
+    hits = [0] * len(matcher.rules)
+
+    def update(path: Path):
+        rel = path.relative_to(root)
+        for i in per_file.pop(rel, ()):
+            hits[i] -= 1
+        if path.is_file():
+            matched = matcher.match_path(rel.parts)
+            if matched:
+                per_file[rel] = matched
+                for i in matched:
+                    hits[i] += 1
+
+    def rescan():
+        per_file.clear()
+        hits[:] = [0] * len(matcher.rules)
+        for f in fs_watch.walk_files(root):
+            update(Path(f))
+
+    def emit(info):
+        out = {"repo": str(root), "info": info, "proposals": propose_agents(info)}
+        print(json.dumps(out, ensure_ascii=False), flush=True)
+
+    rescan()
+    info = summarize_hits(matcher, hits)
+    emit(info)
+    last = {k: v for k, v in info.items() if k != "rule_hits"}
+    for changed in fs_watch.iter_changes(root, interval=interval, polling=polling):
+        if changed is None:
+            rescan()
+        else:
+            for p in changed:
+                path = Path(p)
+                if path.is_dir():
+                    continue
+                if not path.exists():
+                    gone = path.relative_to(root)
+                    for rel in [r for r in per_file if gone in r.parents]:
+                        update(root / rel)
+                update(path)
+        info = summarize_hits(matcher, hits)
+        key = {k: v for k, v in info.items() if k != "rule_hits"}
+        if key != last:
+            last = key
+            emit(info)
+
+
 def propose_agents(info):
     proposals = []
 
@@ -109,6 +433,40 @@ def propose_agents(info):
         "tasks": ["Compile changelog", "Create semantic-release PRs/tags"],
     })
 
+    # Large / duplicated binary assets
+    if info.get("large_binaries") or info.get("duplicate_groups"):
+        dup_mb = info.get("duplicate_bytes", 0) / (1 << 20)
+        proposals.append({
+            "id": "asset-storage",
+            "title": "Asset storage keeper",
+            "description": (
+                f"Move large binaries to Git LFS or external storage and remove duplicates "
+                f"({len(info.get('duplicate_groups', []))} duplicate groups, {dup_mb:.1f} MB reclaimable)."
+            ),
+            "tasks": [
+                "Track large binary formats with Git LFS (.gitattributes)",
+                "Remove or consolidate duplicate files",
+                "Publish optimized derivatives instead of full-size originals",
+            ],
+        })
+
+    # Oversized photos (dimensions/weight from image headers)
+    if info.get("oversized_count"):
+        oversized_mb = info.get("oversized_bytes", 0) / (1 << 20)
+        proposals.append({
+            "id": "image-optimizer",
+            "title": "Image optimizer",
+            "description": (
+                f"Publish resized AVIF/WebP/JPEG derivatives for oversized photos "
+                f"({info['oversized_count']} of {info.get('images', 0)} images, {oversized_mb:.1f} MB)."
+            ),
+            "tasks": [
+                "Build responsive derivatives with image-assets/scripts/build_derivatives.py",
+                "Reference derivatives via srcset instead of full-size originals",
+                "Fail PRs that add images over the size/dimension budget",
+            ],
+        })
+
     # Docs keeper
     if info.get("has_readme"):
         proposals.append({
@@ -146,6 +504,12 @@ Improvements:
 - (none yet)
 """
 
+if templating:
+    render_agent = templating.Template(
+        AGENT_TEMPLATE, names={"id", "title", "description", "tasks_md"}, name="agent").render
+else:
+    render_agent = AGENT_TEMPLATE.format
+
 
 def create_agent_file(agent: dict, agents_dir: Path):
     agents_dir = Path(agents_dir)
@@ -153,7 +517,7 @@ def create_agent_file(agent: dict, agents_dir: Path):
     filename = f"{sanitize_filename(agent['id'])}.agent.md"
     path = agents_dir / filename
     tasks_md = "\n".join([f"- {t}" for t in agent.get("tasks", [])])
-    content = AGENT_TEMPLATE.format(
+    content = render_agent(
         id=agent.get("id", ""),
         title=agent.get("title", ""),
         description=agent.get("description", ""),
@@ -179,15 +543,22 @@ def main():
 
     a_scan = sub.add_parser("analyze")
     a_scan.add_argument("--repo", default='.')
+    a_scan.add_argument("--rules", help="TOML file with extra [[rule]] classification rules")
     a_scan.add_argument("--out", help="write proposals JSON to file")
+    a_scan.add_argument("--no-assets", action="store_true", help="skip the duplicate / large binary pass")
+    a_scan.add_argument("--watch", action="store_true", help="keep running and print updated proposals as JSON lines")
+    a_scan.add_argument("--poll", action="store_true", help="with --watch: use stat polling instead of inotify")
+    a_scan.add_argument("--interval", type=float, default=1.0, help="with --watch --poll: seconds between polls")
 
     a_create = sub.add_parser("create")
     a_create.add_argument("--repo", default='.')
+    a_create.add_argument("--rules", help="TOML file with extra [[rule]] classification rules")
     a_create.add_argument("--name", required=True, help="agent id or proposal id to create")
     a_create.add_argument("--agents-dir", default=".github/agents")
 
     a_createall = sub.add_parser("create-all")
     a_createall.add_argument("--repo", default='.')
+    a_createall.add_argument("--rules", help="TOML file with extra [[rule]] classification rules")
     a_createall.add_argument("--agents-dir", default=".github/agents")
 
     a_improve = sub.add_parser("improve")
@@ -197,7 +568,15 @@ def main():
     args = parser.parse_args()
 
     if args.cmd == "analyze":
-        info = scan_repo(Path(args.repo))
+        if args.watch:
+            try:
+                watch_repo(Path(args.repo), build_matcher(args.rules), interval=args.interval, polling=args.poll)
+            except KeyboardInterrupt:
+                pass
+            except RuntimeError as e:
+                parser.exit(2, f"{e}\n")
+            return
+        info = scan_repo(Path(args.repo), build_matcher(args.rules), assets=not args.no_assets)
         proposals = propose_agents(info)
         out = {"repo": str(Path(args.repo)), "info": info, "proposals": proposals}
         print(json.dumps(out, indent=2, ensure_ascii=False))
@@ -206,7 +585,7 @@ def main():
         return
 
     if args.cmd == "create":
-        proposals = propose_agents(scan_repo(Path(args.repo)))
+        proposals = propose_agents(scan_repo(Path(args.repo), build_matcher(args.rules)))
         found = None
         for p in proposals:
             if p["id"] == args.name or p["title"].lower() == args.name.lower():
@@ -220,7 +599,7 @@ def main():
         return
 
     if args.cmd == "create-all":
-        proposals = propose_agents(scan_repo(Path(args.repo)))
+        proposals = propose_agents(scan_repo(Path(args.repo), build_matcher(args.rules)))
         created = []
         for p in proposals:
             created.append(str(create_agent_file(p, Path(args.agents_dir))))
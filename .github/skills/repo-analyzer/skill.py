@@ -9,8 +9,26 @@
 """
 import os
 import argparse
+import importlib.util
 from pathlib import Path
 
+# Общий компилируемый шаблонизатор (skill-creator/scripts/templating.py). Необязателен:
+# если скилл упакован отдельно, шаблон рендерится обычным str.format.
+TEMPLATING_PATH = Path(__file__).resolve().parents[1] / "skill-creator" / "scripts" / "templating.py"
+
+
+def _load_templating():
+    try:
+        spec = importlib.util.spec_from_file_location("templating", TEMPLATING_PATH)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    except (OSError, ImportError):
+        return None
+    return module
+
+
+templating = _load_templating()
+
 SUGGESTIONS = [
     {
         "name": "ci.instructions.md",
@@ -63,31 +81,95 @@ SUGGESTIONS = [
 ]
 
 
-def find_existing_instructions(root: Path):
+# Where *.instructions.md are usually kept; checked with a direct stat before walking.
+INSTRUCTION_DIRS = ("", ".github", ".github/instructions")
+
+
+def compile_triggers(suggestions=SUGGESTIONS):
+    """Split triggers into single-name lookups and multi-part path lookups."""
+    by_name = {}
+    by_path = {}
+    for s in suggestions:
+        for trig in s["triggers"]:
+            parts = tuple(x for x in trig.split("/") if x)
+            if len(parts) == 1:
+                by_name.setdefault(parts[0], set()).add(s["name"])
+            else:
+                by_path.setdefault(parts, set()).add(s["name"])
+    return by_name, by_path
+
+
+def list_instructions(root: Path):
+    """*.instructions.md, лежащие прямо в INSTRUCTION_DIRS (без обхода дерева)."""
     existing = set()
-    for path in root.rglob("*.instructions.md"):
-        existing.add(path.name)
+    for d in INSTRUCTION_DIRS:
+        try:
+            with os.scandir(root / d) as entries:
+                existing.update(e.name for e in entries if e.name.endswith(".instructions.md") and e.is_file())
+        except OSError:
+            pass
     return existing
 
 
-def analyze(root: Path):
+def scan(root: Path, max_depth=None):
+    """Один обход дерева: возвращает (сработавшие рекомендации, существующие инструкции).
+
+    Рекомендация разрешена, только когда найден её файл инструкции (где угодно в
+    дереве): найденный триггер не отменяет поиск файла, иначе готовая инструкция в
+    `sub/deep/` была бы предложена повторно. Когда все триггеры уже известны,
+    обход проверяет только имена `*.instructions.md`. Обход прекращается, когда
+    у всех рекомендаций есть файл, либо когда дерево исчерпано. `max_depth`
+    ограничивает глубину обхода (0 — только корень). Инструкции в INSTRUCTION_DIRS
+    перечисляются напрямую, до обхода.
+    """
+    by_name, by_path = compile_triggers()
+    path_lens = sorted({len(k) for k in by_path})
     found = set()
+    existing = list_instructions(root)
+
+    # Cheap direct checks first: root-level triggers (instruction dirs are listed above).
     for s in SUGGESTIONS:
-        for trig in s["triggers"]:
-            # check as path or filename
-            if (root / trig).exists():
-                found.add(s["name"])
-                break
-            # search for pattern in tree
-            for p in root.rglob(trig):
-                if p.exists():
-                    found.add(s["name"])
-                    break
+        if any((root / trig).exists() for trig in s["triggers"]):
+            found.add(s["name"])
+    names = {s["name"] for s in SUGGESTIONS}
+    # A suggestion stays pending until its instruction file is found; triggers are
+    # only matched while some suggestion without a file still lacks one.
+    pending = names - existing
+    untriggered = pending - found
+
+    for dirpath, dirnames, filenames in os.walk(root):
+        if not pending:
+            break
+        rel = Path(dirpath).relative_to(root).parts
+        for entry in dirnames + filenames:
+            if entry.endswith(".instructions.md"):
+                existing.add(entry)
+                pending.discard(entry)
+                untriggered.discard(entry)
+            if not untriggered:
+                continue
+            hits = by_name.get(entry)
+            if hits:
+                found |= hits
+                untriggered -= hits
+            if path_lens:
+                parts = rel + (entry,)
+                for n in path_lens:
+                    hits = by_path.get(parts[-n:]) if n <= len(parts) else None
+                    if hits:
+                        found |= hits
+                        untriggered -= hits
+        if max_depth is not None and len(rel) >= max_depth:
+            dirnames[:] = []
+    return found, existing
+
+
+def analyze(root: Path, max_depth=None):
+    found, _ = scan(root, max_depth=max_depth)
     return found
 
 
-def create_template(path: Path, title: str, description: str):
-    content = f"""# {title}
+INSTRUCTION_TEMPLATE = """# {title}
 
 Описание: {description}
 
@@ -107,6 +189,16 @@ def create_template(path: Path, title: str, description: str):
 # команды сборки / проверки
 ```
 """
+
+if templating:
+    render_instructions = templating.Template(
+        INSTRUCTION_TEMPLATE, names={"title", "description"}, name="instructions").render
+else:
+    render_instructions = INSTRUCTION_TEMPLATE.format
+
+
+def create_template(path: Path, title: str, description: str):
+    content = render_instructions(title=title, description=description)
     path.write_text(content, encoding="utf-8")
 
 
@@ -117,11 +209,11 @@ def main():
     p.add_argument("--create", action='store_true', help="Создать выбранные шаблоны")
     p.add_argument("--files", nargs="*", help="Какие файлы создать (имена из рекомендаций)")
     p.add_argument("--copilot", action='store_true', help="Включить секции в стиле Copilot Custom Instructions")
+    p.add_argument("--max-depth", type=int, help="Максимальная глубина обхода (0 — только корень)")
     args = p.parse_args()
 
     root = Path(args.root).resolve()
-    existing = find_existing_instructions(root)
-    recommendations = analyze(root)
+    recommendations, existing = scan(root, max_depth=args.max_depth)
 
     # Filter out that already existing
     to_create = sorted(recommendations - existing)
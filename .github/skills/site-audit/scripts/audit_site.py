@@ -0,0 +1,664 @@
+#!/usr/bin/env python3
+"""Audit a static site against the site-audit checklist.
+
+Each page is streamed through `html.parser` in chunks; the event handlers keep
+only counters and small per-element flags (no DOM), and every checklist rule
+is evaluated from that state once the page ends, so one pass covers SEO,
+accessibility, privacy, analytics and performance. Pages come from a local
+static-site directory or a WARC file (`.warc` / `.warc.gz`) and are audited
+in a process pool.
+
+Local `<img>` files are measured with the header-only reader from
+image-assets (`image_meta.py`), so large photos are caught without decoding.
+
+Output per page: `{"page", "findings": [...], "checks_passed": [...]}`; the
+site report adds site-wide checks (robots.txt, sitemap) and per-rule counts.
+
+Usage:
+  python audit_site.py site/ [--workers 8] [--jsonl pages.jsonl]
+  python audit_site.py crawl.warc.gz --jsonl pages.jsonl --summary
+  python audit_site.py site/index.html
+"""
+import argparse
+import codecs
+import gzip
+import importlib.util
+import json
+import os
+import re
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from html.parser import HTMLParser
+from pathlib import Path
+from urllib.parse import unquote, urlsplit
+
+HTML_EXTS = ('.html', '.htm')
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+CHUNK = 64 * 1024
+WINDOW = 256  # pages in flight when streaming WARC records to the pool
+
+# Header-only JPEG/PNG reader shared with image-assets.
+IMAGE_META_PATH = Path(__file__).resolve().parents[2] / 'image-assets' / 'scripts' / 'image_meta.py'
+
+TITLE_MIN, TITLE_MAX = 10, 70
+LARGE_IMAGE_BYTES = 300 * 1024
+LARGE_IMAGE_SIDE = 2560
+INLINE_CSS_BYTES = 10 * 1024
+EXAMPLES = 3
+
+PRIVACY_RE = re.compile(r'privacy|конфиденциальн|персональн\w* данн|политик\w* обработк', re.I)
+CONSENT_RE = re.compile(r'соглас|consent|privacy|конфиденциальн|персональн', re.I)
+COOKIE_RE = re.compile(r'cookie|consent|gdpr', re.I)
+ANALYTICS_SRC_RE = re.compile(r'googletagmanager\.com|google-analytics\.com|gtag/js|mc\.yandex\.ru/metrika', re.I)
+ANALYTICS_INLINE_RE = re.compile(r'\bgtag\(|dataLayer|\bym\(\s*\d|GoogleAnalyticsObject', re.I)
+TRACKING_JS_RE = re.compile(r'gtag\(|dataLayer|\bym\(|reachGoal', re.I)
+# Whole class/id tokens only (`-` counts as part of a token, so "menu-button" is not
+# a CTA); BEM modifiers/elements such as "button--primary" or "cta__link" are.
+CTA_CLASS_RE = re.compile(r'(?<![\w-])(?:cta|btn|button)(?:(?:--|__)[\w-]*)?(?![\w-])', re.I)
+CTA_TEXT_RE = re.compile(r'(?<!\w)(?:купить|заказать|оформить|записаться|подписаться|оставить заявку|'
+                         r'buy|order|checkout|sign up|subscribe|get started)(?!\w)', re.I)
+PERSONAL_INPUTS = {'email', 'tel'}
+PERSONAL_NAMES_RE = re.compile(r'name|phone|email|тел|имя', re.I)
+UNLABELED_INPUT_TYPES = {'hidden', 'submit', 'button', 'image', 'reset'}
+CHARSET_RE = re.compile(rb'charset=["\']?([\w-]+)', re.I)
+
+# id, category, risk, title, example fix
+RULES = [
+    ('seo-title', 'SEO', 'High', 'Нет <title>', '<title>Футболка «Язык и рогатка» — оверсайз, хлопок</title>'),
+    ('seo-title-length', 'SEO', 'Low', f'Длина title вне {TITLE_MIN}–{TITLE_MAX} символов',
+     'Сократить до ~60 символов: товар, ключевое свойство, бренд'),
+    ('seo-description', 'SEO', 'Medium', 'Нет meta description',
+     '<meta name="description" content="Оверсайз-футболка из плотного хлопка с принтом. Доставка по РФ.">'),
+    ('seo-h1', 'SEO', 'Medium', 'На странице не ровно один <h1>', 'Оставить один <h1> с главным заголовком, остальные — <h2>'),
+    ('seo-heading-order', 'SEO', 'Low', 'Пропущены уровни заголовков', '<h1> → <h2> → <h3>, без перескока с h1 на h3'),
+    ('seo-canonical', 'SEO', 'Low', 'Нет canonical', '<link rel="canonical" href="https://example.ru/tshirts/yazyk/">'),
+    ('seo-noindex', 'SEO', 'High', 'Страница закрыта от индексации (noindex)', 'Убрать noindex из <meta name="robots"> на публичных страницах'),
+    ('a11y-img-alt', 'Accessibility', 'High', 'Изображения без alt',
+     '<img src="zad.jpg" alt="Футболка оверсайз, вид сзади"> (декоративные — alt="")'),
+    ('a11y-control-name', 'Accessibility', 'Medium', 'Кнопки/ссылки без доступного имени',
+     '<button aria-label="Открыть меню"><svg …></svg></button>'),
+    ('a11y-input-label', 'Accessibility', 'Medium', 'Поля формы без label',
+     '<label for="phone">Телефон</label><input id="phone" type="tel">'),
+    ('a11y-lang', 'Accessibility', 'Low', 'Нет атрибута lang у <html>', '<html lang="ru">'),
+    ('a11y-landmarks', 'Accessibility', 'Low', 'Нет семантических областей (<main>, <nav>, <header>, <footer>)',
+     'Обернуть основной контент в <main>, меню — в <nav>'),
+    ('privacy-policy-link', 'Privacy', 'Medium', 'Нет ссылки на политику конфиденциальности',
+     '<a href="/privacy/">Политика конфиденциальности</a> в подвале'),
+    ('privacy-form-consent', 'Privacy', 'High', 'Форма собирает персональные данные без согласия',
+     '<label><input type="checkbox" required> Согласен с <a href="/privacy/">обработкой персональных данных</a></label>'),
+    ('privacy-form-insecure', 'Privacy', 'High', 'Форма отправляется по HTTP', '<form action="https://…" method="post">'),
+    ('privacy-cookie-banner', 'Privacy', 'Medium', 'Есть аналитика, но нет cookie-баннера',
+     'Показывать баннер согласия до загрузки счётчиков'),
+    ('analytics-tag', 'Analytics', 'Medium', 'Нет GTM/GA/Метрики', 'Подключить GTM-контейнер или счётчик Метрики в <head>'),
+    ('analytics-cta-events', 'Analytics', 'Low', 'CTA без событий аналитики',
+     '<a class="cta" data-gtm-event="buy_click" href="/order">Купить</a>'),
+    ('perf-large-image', 'Performance', 'Medium', 'Крупные изображения',
+     'Отдавать производные через image-assets/build_derivatives.py и <picture>/srcset'),
+    ('perf-img-dimensions', 'Performance', 'Low', 'Изображения без width/height (сдвиги макета)', '<img src="…" width="768" height="1376">'),
+    ('perf-blocking-script', 'Performance', 'Low', 'Блокирующие скрипты в <head>', '<script src="app.js" defer></script>'),
+    ('perf-inline-css', 'Performance', 'Low', 'Крупный inline CSS в <head>', 'Вынести стили в файл, inline оставить только critical CSS'),
+]
+RULE_INFO = {r[0]: r for r in RULES}
+SITE_RULES = [
+    ('site-robots', 'SEO', 'Medium', 'Нет robots.txt', 'User-agent: *\nAllow: /\nSitemap: https://example.ru/sitemap.xml'),
+    ('site-sitemap', 'SEO', 'Medium', 'Нет sitemap.xml', 'Сгенерировать sitemap.xml со всеми публичными страницами'),
+]
+
+
+def _load_image_meta():
+    spec = importlib.util.spec_from_file_location('image_meta', IMAGE_META_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@lru_cache(maxsize=1)
+def image_meta():
+    try:
+        return _load_image_meta()
+    except (OSError, ImportError):
+        return None
+
+
+@lru_cache(maxsize=4096)
+def local_image(path):
+    """(size, long side) of a local image from its headers, or None."""
+    meta = image_meta()
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return None
+    side = 0
+    if meta and os.path.splitext(path)[1].lower() in meta.META_EXTS:
+        info = meta.read_meta(path)
+        side = max(info.get('width', 0), info.get('height', 0))
+    return size, side
+
+
+class PageAuditor(HTMLParser):
+    """Collects just enough state from parser events to evaluate every rule."""
+
+    def __init__(self, page_dir=None, site_root=None):
+        super().__init__(convert_charrefs=True)
+        self.page_dir = page_dir
+        self.site_root = site_root
+        self.lang = None
+        self.in_head = False
+        self.svg_depth = 0
+        self.title = None
+        self.in_title = False
+        self.description = False
+        self.robots = ''
+        self.canonical = False
+        self.h1 = 0
+        self.last_heading = 0
+        self.skipped_headings = []
+        self.landmarks = set()
+        self.img_no_alt = []
+        self.img_no_size = []
+        self.large_images = []
+        self.controls = []          # open <a>/<button>: [tag, text, named, cta, tracked, href]
+        self.unnamed_controls = []
+        self.ctas = self.untracked_ctas = 0
+        self.untracked_examples = []
+        self.label_for = set()
+        self.label_depth = 0
+        self.inputs = []            # (id, labelled, example)
+        self.forms = []             # open forms: [action, personal, consent]
+        self.personal_forms = []
+        self.insecure_forms = []
+        self.privacy_link = False
+        self.cookie_marker = False
+        self.analytics = False
+        self.blocking_scripts = []
+        self.in_script = self.in_style = False
+        self.inline_css = 0
+
+    # -- events --------------------------------------------------------------
+    def handle_starttag(self, tag, attrs):
+        a = dict(attrs)
+        if tag == 'svg':
+            self.svg_depth += 1
+        if self.svg_depth:
+            return
+        if tag == 'html':
+            self.lang = a.get('lang')
+        elif tag == 'head':
+            self.in_head = True
+        elif tag == 'body':
+            self.in_head = False
+        elif tag == 'title' and self.title is None:
+            self.in_title = True
+            self.title = ''
+        elif tag == 'meta':
+            name = (a.get('name') or '').lower()
+            if name == 'description' and (a.get('content') or '').strip():
+                self.description = True
+            elif name == 'robots':
+                self.robots = (a.get('content') or '').lower()
+        elif tag == 'link':
+            rel = (a.get('rel') or '').lower().split()
+            if 'canonical' in rel:
+                self.canonical = True
+        elif tag in ('h1', 'h2', 'h3', 'h4', 'h5', 'h6'):
+            level = int(tag[1])
+            if level == 1:
+                self.h1 += 1
+            if self.last_heading and level > self.last_heading + 1:
+                self.skipped_headings.append(f'h{self.last_heading} → {tag}')
+            self.last_heading = level
+        elif tag in ('main', 'nav', 'header', 'footer'):
+            self.landmarks.add(tag)
+        elif tag == 'img':
+            self._img(a)
+        elif tag in ('a', 'button'):
+            self._control(tag, a)
+        elif tag == 'label':
+            self.label_depth += 1
+            if a.get('for'):
+                self.label_for.add(a['for'])
+        elif tag in ('input', 'select', 'textarea'):
+            self._input(tag, a)
+        elif tag == 'form':
+            action = a.get('action') or ''
+            self.forms.append([action, False, False])
+            if action.lower().startswith('http://'):
+                self.insecure_forms.append(action)
+        elif tag == 'script':
+            self.in_script = True
+            src = a.get('src')
+            if src:
+                if ANALYTICS_SRC_RE.search(src):
+                    self.analytics = True
+                if COOKIE_RE.search(src):
+                    self.cookie_marker = True
+                if (self.in_head and 'async' not in a and 'defer' not in a
+                        and a.get('type') != 'module' and not ANALYTICS_SRC_RE.search(src)):
+                    self.blocking_scripts.append(src)
+        elif tag == 'style':
+            self.in_style = self.in_head
+        ident = f"{a.get('id') or ''} {a.get('class') or ''}"
+        if not self.cookie_marker and ident.strip() and COOKIE_RE.search(ident):
+            self.cookie_marker = True
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag == 'svg':
+            self.svg_depth -= 1
+
+    def handle_endtag(self, tag):
+        if tag == 'svg':
+            self.svg_depth = max(0, self.svg_depth - 1)
+            return
+        if self.svg_depth:
+            return
+        if tag == 'title':
+            self.in_title = False
+        elif tag == 'head':
+            self.in_head = False
+        elif tag in ('a', 'button'):
+            for k in range(len(self.controls) - 1, -1, -1):
+                if self.controls[k][0] == tag:
+                    for control in self.controls[k:]:
+                        self._close_control(control)
+                    del self.controls[k:]
+                    break
+        elif tag == 'label':
+            self.label_depth = max(0, self.label_depth - 1)
+        elif tag == 'form' and self.forms:
+            self._close_form(self.forms.pop())
+        elif tag == 'script':
+            self.in_script = False
+        elif tag == 'style':
+            self.in_style = False
+
+    def handle_data(self, data):
+        if self.in_script:
+            if not self.analytics and ANALYTICS_INLINE_RE.search(data):
+                self.analytics = True
+            if not self.cookie_marker and COOKIE_RE.search(data) and 'consent' in data.lower():
+                self.cookie_marker = True
+            return
+        if self.in_style:
+            self.inline_css += len(data)
+            return
+        if self.in_title:
+            self.title += data
+        if not data.strip():
+            return
+        for control in self.controls:
+            control[2] = True
+            control[1] += data
+        if self.forms and not self.forms[-1][2] and CONSENT_RE.search(data):
+            self.forms[-1][2] = True
+        if not self.cookie_marker and 'cookie' in data.lower():
+            self.cookie_marker = True
+
+    # -- element helpers -------------------------------------------------------
+    def _img(self, a):
+        src = a.get('src') or a.get('data-src') or ''
+        if 'alt' not in a:
+            self.img_no_alt.append(src)
+        elif a['alt'].strip():
+            for control in self.controls:
+                control[2] = True
+        if not (a.get('width') and a.get('height')):
+            self.img_no_size.append(src)
+        path = self._local(src)
+        if path:
+            found = local_image(path)
+            if found and (found[0] > LARGE_IMAGE_BYTES or found[1] > LARGE_IMAGE_SIDE):
+                self.large_images.append(f'{src} ({found[0] // 1024} KB, {found[1]}px)')
+
+    def _local(self, src):
+        if not src or self.page_dir is None:
+            return None
+        parts = urlsplit(src)
+        if parts.scheme or parts.netloc or not parts.path:
+            return None
+        rel = unquote(parts.path)
+        base = (self.site_root or self.page_dir) if rel.startswith('/') else self.page_dir
+        return os.path.normpath(os.path.join(base, rel.lstrip('/')))
+
+    def _control(self, tag, a):
+        named = any(a.get(k, '').strip() for k in ('aria-label', 'aria-labelledby', 'title'))
+        cta = bool(CTA_CLASS_RE.search(a.get('class') or '') or CTA_CLASS_RE.search(a.get('id') or ''))
+        tracked = (any(k.startswith(('data-gtm', 'data-event', 'data-analytics', 'data-track', 'data-ga', 'data-goal'))
+                       for k in a)
+                   or bool(TRACKING_JS_RE.search(a.get('onclick') or '')))
+        href = a.get('href') or ''
+        if tag == 'a' and PRIVACY_RE.search(href):
+            self.privacy_link = True
+        label = a.get('aria-label') or ''
+        self.controls.append([tag, label, named, cta, tracked, href])
+
+    def _close_control(self, control):
+        tag, label, named, cta, tracked, href = control
+        if not named:
+            self.unnamed_controls.append(f'<{tag} href="{href}">' if href else f'<{tag}>')
+        if tag == 'a' and PRIVACY_RE.search(label):
+            self.privacy_link = True
+        if cta or CTA_TEXT_RE.search(label):
+            self.ctas += 1
+            if not tracked:
+                self.untracked_ctas += 1
+                self.untracked_examples.append(label.strip()[:40] or f'<{tag}>')
+
+    def _input(self, tag, a):
+        kind = (a.get('type') or 'text').lower()
+        if tag == 'input' and kind in UNLABELED_INPUT_TYPES:
+            return
+        if kind == 'checkbox' and self.forms:
+            self.forms[-1][2] = True
+        labelled = bool(self.label_depth or any(a.get(k, '').strip() for k in ('aria-label', 'aria-labelledby', 'title')))
+        self.inputs.append((a.get('id'), labelled, a.get('name') or a.get('id') or tag))
+        if self.forms and (kind in PERSONAL_INPUTS or PERSONAL_NAMES_RE.search(a.get('name') or '')):
+            self.forms[-1][1] = True
+
+    def _close_form(self, form):
+        action, personal, consent = form
+        if personal and not consent:
+            self.personal_forms.append(action or '(current page)')
+
+    def finish(self):
+        self.close()
+        for control in reversed(self.controls):
+            self._close_control(control)
+        self.controls = []
+        while self.forms:
+            self._close_form(self.forms.pop())
+
+    # -- rules -----------------------------------------------------------------
+    def evaluate(self):
+        """{rule id: evidence} for every failed rule; absent ids passed."""
+        failed = {}
+        title = (self.title or '').strip()
+        if not title:
+            failed['seo-title'] = 'title is missing or empty'
+        elif not TITLE_MIN <= len(title) <= TITLE_MAX:
+            failed['seo-title-length'] = f'{len(title)} chars: {title[:80]}'
+        if not self.description:
+            failed['seo-description'] = 'no <meta name="description">'
+        if self.h1 != 1:
+            failed['seo-h1'] = f'{self.h1} <h1> elements'
+        if self.skipped_headings:
+            failed['seo-heading-order'] = ', '.join(self.skipped_headings[:EXAMPLES])
+        if not self.canonical:
+            failed['seo-canonical'] = 'no <link rel="canonical">'
+        if 'noindex' in self.robots:
+            failed['seo-noindex'] = f'robots: {self.robots}'
+        if self.img_no_alt:
+            failed['a11y-img-alt'] = _examples(self.img_no_alt)
+        if self.unnamed_controls:
+            failed['a11y-control-name'] = _examples(self.unnamed_controls)
+        unlabeled = [ex for id_, labelled, ex in self.inputs if not labelled and id_ not in self.label_for]
+        if unlabeled:
+            failed['a11y-input-label'] = _examples(unlabeled)
+        if not (self.lang or '').strip():
+            failed['a11y-lang'] = '<html> has no lang'
+        if not self.landmarks:
+            failed['a11y-landmarks'] = 'no <main>/<nav>/<header>/<footer>'
+        if not self.privacy_link:
+            failed['privacy-policy-link'] = 'no link to a privacy policy'
+        if self.personal_forms:
+            failed['privacy-form-consent'] = _examples(self.personal_forms)
+        if self.insecure_forms:
+            failed['privacy-form-insecure'] = _examples(self.insecure_forms)
+        if self.analytics and not self.cookie_marker:
+            failed['privacy-cookie-banner'] = 'analytics loads without a cookie/consent banner'
+        if not self.analytics:
+            failed['analytics-tag'] = 'no GTM, GA or Yandex Metrika'
+        elif self.untracked_ctas:
+            failed['analytics-cta-events'] = f'{self.untracked_ctas}/{self.ctas} CTA: ' + _examples(self.untracked_examples)
+        if self.large_images:
+            failed['perf-large-image'] = _examples(self.large_images)
+        if self.img_no_size:
+            failed['perf-img-dimensions'] = _examples(self.img_no_size)
+        if self.blocking_scripts:
+            failed['perf-blocking-script'] = _examples(self.blocking_scripts)
+        if self.inline_css > INLINE_CSS_BYTES:
+            failed['perf-inline-css'] = f'{self.inline_css // 1024} KB of <style> in <head>'
+        return failed
+
+
+def _examples(items):
+    more = f' (+{len(items) - EXAMPLES})' if len(items) > EXAMPLES else ''
+    return ', '.join(str(i) for i in items[:EXAMPLES]) + more
+
+
+def _finding(rule, page, evidence):
+    rule_id, category, risk, title, fix = rule
+    return {'rule': rule_id, 'category': category, 'risk': risk, 'title': title,
+            'page': page, 'evidence': evidence, 'example_fix': fix}
+
+
+def sniff_encoding(head, default='utf-8'):
+    m = CHARSET_RE.search(head[:2048])
+    if m:
+        name = m.group(1).decode('ascii', 'ignore')
+        try:
+            ''.encode(name)
+            return name
+        except LookupError:
+            pass
+    return default
+
+
+def audit_html(chunks, page, page_dir=None, site_root=None):
+    """Audit one page given an iterable of byte chunks."""
+    parser = PageAuditor(page_dir, site_root)
+    decoder = None
+    for chunk in chunks:
+        if decoder is None:
+            decoder = codecs.getincrementaldecoder(sniff_encoding(chunk))(errors='replace')
+        parser.feed(decoder.decode(chunk))
+    if decoder is not None:
+        parser.feed(decoder.decode(b'', final=True))
+    parser.finish()
+    failed = parser.evaluate()
+    return {
+        'page': page,
+        'findings': [_finding(RULE_INFO[rid], page, ev) for rid, ev in failed.items()],
+        'checks_passed': [r[0] for r in RULES if r[0] not in failed],
+    }
+
+
+def _read_chunks(path):
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(CHUNK)
+            if not chunk:
+                return
+            yield chunk
+
+
+def audit_file(args):
+    path, root = args
+    rel = os.path.relpath(path, root) if root else os.path.basename(path)
+    try:
+        return audit_html(_read_chunks(path), rel.replace(os.sep, '/'), os.path.dirname(path), root)
+    except OSError as e:
+        return {'page': rel, 'error': str(e), 'findings': [], 'checks_passed': []}
+
+
+def audit_body(args):
+    body, url = args
+    return audit_html([body], url)
+
+
+# -- sources -------------------------------------------------------------------
+def iter_site(root):
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS and not d.startswith('.'))
+        for name in sorted(filenames):
+            if name.lower().endswith(HTML_EXTS):
+                yield os.path.join(dirpath, name)
+
+
+def _dechunk(body):
+    out, pos = bytearray(), 0
+    while True:
+        eol = body.find(b'\r\n', pos)
+        if eol == -1:
+            break
+        size = int(body[pos:eol].split(b';', 1)[0].strip() or b'0', 16)
+        if size == 0:
+            break
+        out += body[eol + 2:eol + 2 + size]
+        pos = eol + 2 + size + 2
+    return bytes(out)
+
+
+def iter_warc(path):
+    """Yield (url, html bytes) for every HTML response record; also ('robots'|'sitemap', url)."""
+    opener = gzip.open if path.endswith('.gz') else open
+    with opener(path, 'rb') as f:
+        while True:
+            line = f.readline()
+            if not line:
+                return
+            if not line.startswith(b'WARC/'):
+                continue
+            headers = {}
+            while True:
+                line = f.readline()
+                if not line or line in (b'\r\n', b'\n'):
+                    break
+                key, _, value = line.decode('utf-8', 'replace').partition(':')
+                headers[key.strip().lower()] = value.strip()
+            block = f.read(int(headers.get('content-length', 0)))
+            if headers.get('warc-type') != 'response':
+                continue
+            url = headers.get('warc-target-uri', '')
+            head, _, body = block.partition(b'\r\n\r\n')
+            lines = head.decode('latin-1').split('\r\n')
+            http = {k.strip().lower(): v.strip() for k, _, v in (l.partition(':') for l in lines[1:])}
+            status = lines[0].split()[1] if len(lines[0].split()) > 1 else ''
+            if 'chunked' in http.get('transfer-encoding', '').lower():
+                body = _dechunk(body)
+            if http.get('content-encoding', '').lower() in ('gzip', 'x-gzip'):
+                try:
+                    body = zlib.decompress(body, 16 + zlib.MAX_WBITS)
+                except zlib.error:
+                    continue
+            path_part = urlsplit(url).path
+            if status.startswith('2') and path_part == '/robots.txt':
+                yield 'robots', url
+            elif status.startswith('2') and path_part.endswith('sitemap.xml'):
+                yield 'sitemap', url
+            elif status.startswith('2') and 'html' in http.get('content-type', ''):
+                yield url, body
+
+
+def _bounded_map(pool, fn, items, window=WINDOW):
+    """pool.map with at most `window` items submitted ahead of the consumer."""
+    pending = []
+    for item in items:
+        pending.append(pool.submit(fn, item))
+        if len(pending) >= window:
+            yield pending.pop(0).result()
+    for fut in pending:
+        yield fut.result()
+
+
+def audit_site(source, workers=None):
+    """Yield page reports in order.
+
+    The generator's return value is the list of site-level findings
+    (robots.txt, sitemap), or None when `source` is a single page.
+    """
+    site = {'robots': False, 'sitemap': False}
+    if os.path.isdir(source):
+        root = os.path.abspath(source)
+        site['robots'] = os.path.isfile(os.path.join(root, 'robots.txt'))
+        site['sitemap'] = any(os.path.isfile(os.path.join(root, n)) for n in ('sitemap.xml', 'sitemap_index.xml'))
+        pages = [(p, root) for p in iter_site(root)]
+        if workers == 1 or len(pages) < 32:
+            yield from map(audit_file, pages)
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                yield from pool.map(audit_file, pages, chunksize=16)
+    elif '.warc' in os.path.basename(source).lower():
+        def records():
+            for key, value in iter_warc(source):
+                if key in site:  # ('robots' | 'sitemap', url)
+                    site[key] = True
+                else:
+                    yield value, key
+        if workers == 1:
+            yield from map(audit_body, records())
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                yield from _bounded_map(pool, audit_body, records())
+    else:
+        yield audit_file((os.path.abspath(source), None))
+        return None
+    return [
+        _finding(rule, 'site', f'{name} not found')
+        for rule, name, ok in zip(SITE_RULES, ('robots.txt', 'sitemap.xml'), (site['robots'], site['sitemap']))
+        if not ok
+    ]
+
+
+def summarize(reports, site_findings):
+    """Site report: site-level findings, checks passed on every page, failing-page counts per rule."""
+    by_rule = {}
+    pages = 0
+    for report in reports:
+        pages += 1
+        for f in report['findings']:
+            by_rule[f['rule']] = by_rule.get(f['rule'], 0) + 1
+    failing = {f['rule'] for f in site_findings or ()} | set(by_rule)
+    rules = RULES + SITE_RULES if site_findings is not None else RULES
+    return {
+        'pages': pages,
+        'findings': list(site_findings or ()),
+        'checks_passed': [r[0] for r in rules if r[0] not in failing],
+        'pages_failing': dict(sorted(by_rule.items(), key=lambda kv: -kv[1])),
+    }
+
+
+def main():
+    p = argparse.ArgumentParser(description='Streaming site-audit over static HTML or a WARC file')
+    p.add_argument('source', help='Site directory, .warc/.warc.gz file or a single .html page')
+    p.add_argument('--workers', type=int, help='Process pool size (default: CPU count)')
+    p.add_argument('--jsonl', help='Write one page report per line to this file')
+    p.add_argument('--summary', action='store_true', help='Print only the site summary')
+    args = p.parse_args()
+
+    started = time.perf_counter()
+    gen = audit_site(args.source, args.workers)
+    reports = []
+    out = open(args.jsonl, 'w', encoding='utf-8') if args.jsonl else None
+    site_findings = None
+    try:
+        while True:
+            try:
+                report = next(gen)
+            except StopIteration as stop:
+                site_findings = stop.value
+                break
+            if out:
+                out.write(json.dumps(report, ensure_ascii=False) + '\n')
+            reports.append({'findings': [{'rule': f['rule']} for f in report['findings']]}
+                           if out or args.summary else report)
+    finally:
+        if out:
+            out.close()
+    summary = summarize(reports, site_findings)
+    elapsed = time.perf_counter() - started
+    if out or args.summary:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    elif len(reports) == 1 and site_findings is None:
+        print(json.dumps(reports[0], ensure_ascii=False, indent=2))
+    else:
+        print(json.dumps({**summary, 'page_reports': reports}, ensure_ascii=False, indent=2))
+    rate = summary['pages'] / elapsed * 60 if elapsed else 0
+    print(f"{summary['pages']} page(s) in {elapsed:.2f}s ({rate:.0f} pages/min)", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
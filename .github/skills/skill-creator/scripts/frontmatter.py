@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Lightweight frontmatter reader for markdown files.
+
+Reads a file only up to the closing `---` line (LF or CRLF) and parses the flat
+`key: value` subset natively: plain scalars, single/double-quoted strings,
+booleans, null and numbers. Anything more complex (lists, nested maps, block
+scalars, flow collections, anchors, escapes, comments) falls back to
+`yaml.safe_load`, which is only imported when needed.
+
+Also used by experiment-management, which loads it by path and falls back to
+its own flat `key: value` parser when skill-creator is not next to it.
+
+Usage: python frontmatter.py <file-or-directory> [...]   # prints JSON lines
+"""
+import datetime
+import json
+import os
+import re
+import sys
+from pathlib import Path
+
+KEY_RE = re.compile(r'^([A-Za-z0-9_][A-Za-z0-9_.-]*):(?:[ \t]+(.*))?$')
+INT_RE = re.compile(r'^(0|[1-9][0-9]*)$')
+FLOAT_RE = re.compile(r'^[0-9]+\.[0-9]*([eE][-+][0-9]+)?$')
+DATE_RE = re.compile(r'^[0-9]{4}-[0-9]{2}-[0-9]{2}$')
+PLAIN_INDICATORS = set('[]{}&*!|>%@`#,?-+.\'"')
+# YAML 1.1 booleans, as resolved by PyYAML.
+BOOLS = {
+    v: flag
+    for flag, words in ((True, ('true', 'yes', 'on')), (False, ('false', 'no', 'off')))
+    for w in words for v in (w, w.capitalize(), w.upper())
+}
+NULLS = {'', '~', 'null', 'Null', 'NULL'}
+
+
+class NeedsYaml(Exception):
+    """Raised internally when a line is outside the natively supported subset."""
+
+
+def split_frontmatter(content):
+    """Return the frontmatter text of a document, or None if it has none."""
+    if content.startswith('\ufeff'):
+        content = content[1:]
+    lines = content.splitlines()
+    if not lines or lines[0].rstrip() != '---':
+        return None
+    for i in range(1, len(lines)):
+        if lines[i].rstrip() == '---':
+            return '\n'.join(lines[1:i])
+    return None
+
+
+def read_frontmatter_text(path):
+    """Read only the frontmatter block of a file; None if absent or unterminated."""
+    with open(path, 'r', encoding='utf-8-sig', newline=None) as f:
+        first = f.readline()
+        if first.rstrip() != '---':
+            return None
+        lines = []
+        for line in f:
+            if line.rstrip() == '---':
+                return ''.join(lines).rstrip('\n')
+            lines.append(line)
+    return None
+
+
+def _scalar(raw):
+    value = raw.strip()
+    if value in NULLS:
+        return None
+    if value[0] == '"':
+        if len(value) < 2 or value[-1] != '"' or '\\' in value or '"' in value[1:-1]:
+            raise NeedsYaml(raw)
+        return value[1:-1]
+    if value[0] == "'":
+        inner = value[1:-1]
+        if len(value) < 2 or value[-1] != "'" or "'" in inner.replace("''", ''):
+            raise NeedsYaml(raw)
+        return inner.replace("''", "'")
+    if value[0] in PLAIN_INDICATORS or ': ' in value or value.endswith(':') or ' #' in value:
+        raise NeedsYaml(raw)
+    if value in BOOLS:
+        return BOOLS[value]
+    if value[0].isdigit():
+        # Only the common numeric/date forms are resolved natively; octal, hex,
+        # sexagesimal, underscores and timestamps are left to PyYAML.
+        if INT_RE.match(value):
+            return int(value)
+        if FLOAT_RE.match(value):
+            return float(value)
+        if DATE_RE.match(value):
+            try:
+                return datetime.date.fromisoformat(value)
+            except ValueError:
+                pass
+        raise NeedsYaml(raw)
+    return value
+
+
+def parse_flat(text):
+    """Parse flat `key: scalar` lines; raises NeedsYaml for anything else."""
+    data = {}
+    for line in text.split('\n'):
+        line = line.rstrip('\r')
+        if not line.strip() or line.lstrip().startswith('#'):
+            continue
+        if line[0] in ' \t':
+            raise NeedsYaml(line)
+        m = KEY_RE.match(line)
+        if not m:
+            raise NeedsYaml(line)
+        data[m.group(1)] = _scalar(m.group(2) or '')
+    return data
+
+
+def parse_frontmatter(text):
+    """Parse frontmatter text natively when flat, else with yaml.safe_load.
+
+    YAML errors propagate to the caller, as with a plain yaml.safe_load.
+    """
+    try:
+        return parse_flat(text)
+    except NeedsYaml:
+        import yaml
+        return yaml.safe_load(text)
+
+
+def load_frontmatter(path):
+    """Read and parse the frontmatter of one file; None if it has none."""
+    text = read_frontmatter_text(path)
+    if text is None:
+        return None
+    return parse_frontmatter(text)
+
+
+def iter_markdown(paths):
+    for p in paths:
+        p = Path(p)
+        if p.is_dir():
+            for dirpath, dirnames, filenames in os.walk(p):
+                dirnames[:] = [d for d in dirnames if d != '.git']
+                for name in filenames:
+                    if name.endswith('.md'):
+                        yield Path(dirpath) / name
+        else:
+            yield p
+
+
+def main():
+    if len(sys.argv) < 2:
+        print('Usage: python frontmatter.py <file-or-directory> [...]')
+        sys.exit(1)
+    for path in iter_markdown(sys.argv[1:]):
+        try:
+            record = {'path': str(path), 'frontmatter': load_frontmatter(path)}
+        except Exception as e:
+            record = {'path': str(path), 'error': str(e)}
+        print(json.dumps(record, ensure_ascii=False, default=str))
+
+
+if __name__ == '__main__':
+    main()
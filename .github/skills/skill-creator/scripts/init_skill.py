@@ -7,7 +7,12 @@ Usage:
 import sys
 from pathlib import Path
 
-SKILL_TEMPLATE = """---
+try:
+    from scripts.templating import Template
+except ImportError:  # run directly as `python init_skill.py`
+    from templating import Template
+
+SKILL_TEMPLATE = Template("""---
 name: {skill_name}
 description: [TODO: Complete and informative explanation of what the skill does and when to use it.]
 ---
@@ -18,9 +23,9 @@ description: [TODO: Complete and informative explanation of what the skill does
 
 [TODO]
 
-"""
+""", names={'skill_name', 'skill_title'}, name='SKILL.md')
 
-EXAMPLE_SCRIPT = '''#!/usr/bin/env python3
+EXAMPLE_SCRIPT = Template('''#!/usr/bin/env python3
 """Example helper script for {skill_name}"""
 
 def main():
@@ -28,12 +33,12 @@ def main():
 
 if __name__ == '__main__':
     main()
-'''
+''', names={'skill_name'}, name='example.py')
 
-EXAMPLE_REFERENCE = """# Reference for {skill_title}
+EXAMPLE_REFERENCE = Template("""# Reference for {skill_title}
 
 This is a placeholder reference document.
-"""
+""", names={'skill_title'}, name='reference.md')
 
 EXAMPLE_ASSET = """Example asset placeholder"""
 
@@ -58,7 +63,7 @@ def init_skill(skill_name, path):
     skill_title = title_case_skill_name(skill_name)
     skill_md_path = skill_dir / 'SKILL.md'
     try:
-        skill_md_path.write_text(SKILL_TEMPLATE.format(skill_name=skill_name, skill_title=skill_title))
+        skill_md_path.write_text(SKILL_TEMPLATE.render(skill_name=skill_name, skill_title=skill_title))
         print("✅ Created SKILL.md")
     except Exception as e:
         print(f"❌ Error creating SKILL.md: {e}")
@@ -68,12 +73,12 @@ def init_skill(skill_name, path):
     try:
         scripts_dir = skill_dir / 'scripts'
         scripts_dir.mkdir(exist_ok=True)
-        (scripts_dir / 'example.py').write_text(EXAMPLE_SCRIPT.format(skill_name=skill_name))
+        (scripts_dir / 'example.py').write_text(EXAMPLE_SCRIPT.render(skill_name=skill_name))
         print("✅ Created scripts/example.py")
 
         references_dir = skill_dir / 'references'
         references_dir.mkdir(exist_ok=True)
-        (references_dir / 'reference.md').write_text(EXAMPLE_REFERENCE.format(skill_title=skill_title))
+        (references_dir / 'reference.md').write_text(EXAMPLE_REFERENCE.render(skill_title=skill_title))
         print("✅ Created references/reference.md")
 
         assets_dir = skill_dir / 'assets'
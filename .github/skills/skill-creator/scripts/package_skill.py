@@ -1,15 +1,22 @@
 #!/usr/bin/env python3
 """
 Package a skill folder into a distributable .skill zip file.
-Usage: python package_skill.py <path/to/skill-folder> [output-directory]
+Usage: python package_skill.py <path/to/skill-folder> [output-directory] [--quiet] [--force]
+
+Builds are reproducible (sorted entries, fixed timestamps) and incremental: a
+`<name>.skill.manifest.json` content manifest is written next to the archive,
+unchanged skills are not repackaged, and unchanged members are reused.
 """
+import os
 import sys
-import zipfile
 from pathlib import Path
 from scripts.quick_validate import validate_skill
+from scripts.skill_archive import (
+    build_manifest, load_manifest, manifest_path_for, reusable_members, save_manifest, write_archive,
+)
 
 
-def package_skill(skill_path, output_dir=None):
+def package_skill(skill_path, output_dir=None, quiet=False, workers=None, force=False):
     skill_path = Path(skill_path).resolve()
     if not skill_path.exists() or not skill_path.is_dir():
         print(f"❌ Error: Skill folder not found: {skill_path}")
@@ -24,13 +31,25 @@ def package_skill(skill_path, output_dir=None):
     else:
         output_path = Path.cwd()
     skill_filename = output_path / f"{skill_path.name}.skill"
+    entries = sorted((
+        (file_path, file_path.relative_to(skill_path.parent).as_posix())
+        for file_path in skill_path.rglob('*') if file_path.is_file()
+    ), key=lambda entry: entry[1])
+    on_added = None if quiet else (lambda arcname: print(f"  Added: {arcname}"))
+    manifest_file = manifest_path_for(skill_filename)
     try:
-        with zipfile.ZipFile(skill_filename, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            for file_path in skill_path.rglob('*'):
-                if file_path.is_file():
-                    arcname = file_path.relative_to(skill_path.parent)
-                    zipf.write(file_path, arcname)
-                    print(f"  Added: {arcname}")
+        manifest = build_manifest(entries, workers=workers)
+        old_manifest = None if force else load_manifest(manifest_file)
+        if old_manifest == manifest and skill_filename.exists():
+            print(f"✅ Up to date: {skill_filename}")
+            return skill_filename
+        reuse = reusable_members(skill_filename, old_manifest, manifest, entries)
+        tmp_filename = skill_filename.with_name(skill_filename.name + '.tmp')
+        write_archive(entries, tmp_filename, workers=workers, on_added=on_added, reuse=reuse)
+        os.replace(tmp_filename, skill_filename)
+        save_manifest(manifest, manifest_file)
+        if reuse and not quiet:
+            print(f"  Reused {len(reuse)} unchanged member(s)")
         print(f"\n✅ Successfully packaged skill to: {skill_filename}")
         return skill_filename
     except Exception as e:
@@ -39,8 +58,13 @@ def package_skill(skill_path, output_dir=None):
 
 
 if __name__ == '__main__':
-    if len(sys.argv) < 2:
-        print('Usage: python package_skill.py <path/to/skill-folder> [output-directory]')
+    flags = {a for a in sys.argv[1:] if a.startswith('-')}
+    args = [a for a in sys.argv[1:] if not a.startswith('-')]
+    if len(args) < 1:
+        print('Usage: python package_skill.py <path/to/skill-folder> [output-directory] [--quiet] [--force]')
         sys.exit(1)
-    result = package_skill(sys.argv[1], sys.argv[2] if len(sys.argv) > 2 else None)
+    result = package_skill(
+        args[0], args[1] if len(args) > 1 else None,
+        quiet=bool(flags & {'-q', '--quiet'}), force='--force' in flags,
+    )
     sys.exit(0 if result else 1)
@@ -5,26 +5,54 @@ Usage: python quick_validate.py <skill_directory>
 """
 import sys
 import re
-import yaml
 from pathlib import Path
 
+try:
+    from scripts.frontmatter import parse_frontmatter, read_frontmatter_text, split_frontmatter
+except ImportError:  # run directly as scripts/quick_validate.py
+    from frontmatter import parse_frontmatter, read_frontmatter_text, split_frontmatter
+
 ALLOWED_PROPERTIES = {'name', 'description', 'license', 'allowed-tools', 'metadata'}
+SKILL_MD_NAMES = ('SKILL.md', 'skill.md')
+
+
+def find_skill_md(skill_path):
+    """Return the skill's SKILL.md (or lowercase skill.md), or None."""
+    for name in SKILL_MD_NAMES:
+        candidate = Path(skill_path) / name
+        if candidate.is_file():
+            return candidate
+    return None
 
 
 def validate_skill(skill_path):
-    skill_path = Path(skill_path)
-    skill_md = skill_path / 'SKILL.md'
-    if not skill_md.exists():
+    skill_md = find_skill_md(skill_path)
+    if skill_md is None:
         return False, 'SKILL.md not found'
-    content = skill_md.read_text(encoding='utf-8')
-    if not content.startswith('---'):
+    # Only the frontmatter block is read, not the whole document.
+    with open(skill_md, 'r', encoding='utf-8-sig') as f:
+        if f.read(3) != '---':
+            return False, 'No YAML frontmatter found'
+    frontmatter_text = read_frontmatter_text(skill_md)
+    if frontmatter_text is None:
+        return False, 'Invalid frontmatter format'
+    return validate_frontmatter_text(frontmatter_text)
+
+
+def validate_content(content):
+    """Validate the text of a SKILL.md; returns (valid, message)."""
+    if not content.lstrip('\ufeff').startswith('---'):
         return False, 'No YAML frontmatter found'
-    match = re.match(r'^---\n(.*?)\n---', content, re.DOTALL)
-    if not match:
+    frontmatter_text = split_frontmatter(content)
+    if frontmatter_text is None:
         return False, 'Invalid frontmatter format'
-    frontmatter_text = match.group(1)
+    return validate_frontmatter_text(frontmatter_text)
+
+
+def validate_frontmatter_text(frontmatter_text):
+    """Validate already-extracted frontmatter text; returns (valid, message)."""
     try:
-        frontmatter = yaml.safe_load(frontmatter_text)
+        frontmatter = parse_frontmatter(frontmatter_text)
         if not isinstance(frontmatter, dict):
             return False, 'Frontmatter must be a YAML dictionary'
     except Exception as e:
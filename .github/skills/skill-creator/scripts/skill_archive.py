@@ -0,0 +1,288 @@
+#!/usr/bin/env python3
+"""
+Streaming, parallel zip writer used by package_skill.py.
+
+Files are compressed in a thread pool (zlib releases the GIL) into spooled
+temporary buffers and written to the archive in order as raw deflate data.
+Already-compressed formats are stored as-is and copied in blocks, so no file
+is ever loaded whole into memory.
+
+Archives are reproducible: entries are written in the given order with a fixed
+timestamp and normalized permissions. A content manifest (arcname -> sha256,
+size, archived mode) stored next to the archive lets rebuilds be skipped entirely when nothing
+changed, or reuse the compressed bytes of unchanged members from the previous
+archive.
+"""
+import hashlib
+import json
+import os
+import shutil
+import struct
+import tempfile
+import time
+import zipfile
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+STORED_EXTS = {
+    '.jpg', '.jpeg', '.png', '.gif', '.webp', '.avif', '.heic',
+    '.zip', '.gz', '.tgz', '.bz2', '.xz', '.7z', '.rar', '.skill',
+    '.mp3', '.mp4', '.mov', '.webm', '.woff', '.woff2', '.pdf',
+}
+
+ZIP_STORED = 0
+ZIP_DEFLATED = 8
+BLOCK_SIZE = 1 << 20
+SPOOL_MAX = 8 << 20
+UTF8_FLAG = 0x800
+ZIP_MAX = 0xFFFFFFFF
+FIXED_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+MANIFEST_FORMAT = 1
+
+FILE_HEADER = struct.Struct('<4s2B4HL2L2H')
+CENTRAL_DIR = struct.Struct('<4s4B4HL2L5H2L')
+END_ARCHIVE = struct.Struct('<4s4H2LH')
+
+
+class Member:
+    """One prepared archive entry: metadata plus a source for its (compressed) bytes."""
+
+    def __init__(self, arcname, method, crc, compress_size, file_size, date_time, mode, source):
+        self.arcname = arcname
+        self.method = method
+        self.crc = crc
+        self.compress_size = compress_size
+        self.file_size = file_size
+        self.date_time = date_time
+        self.mode = mode
+        # file path (stored), spooled temp file (deflated) or ArchiveSlice (reused)
+        self.source = source
+        self.header_offset = 0
+
+    def copy_to(self, out):
+        if isinstance(self.source, ArchiveSlice):
+            self.source.copy_to(out)
+        elif isinstance(self.source, (str, os.PathLike)):
+            with open(self.source, 'rb') as f:
+                shutil.copyfileobj(f, out, BLOCK_SIZE)
+        else:
+            self.source.seek(0)
+            shutil.copyfileobj(self.source, out, BLOCK_SIZE)
+            self.source.close()
+
+
+class ArchiveSlice:
+    """Raw member data inside an existing archive, copied without recompressing."""
+
+    def __init__(self, path, offset, size):
+        self.path = path
+        self.offset = offset
+        self.size = size
+
+    def copy_to(self, out):
+        remaining = self.size
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            while remaining > 0:
+                block = f.read(min(BLOCK_SIZE, remaining))
+                if not block:
+                    raise IOError(f'{self.path}: truncated member data')
+                out.write(block)
+                remaining -= len(block)
+
+
+def normalized_mode(st_mode):
+    """Regular file, 0755 if any execute bit is set, else 0644."""
+    return 0o100755 if st_mode & 0o111 else 0o100644
+
+
+def dos_date_time(date_time):
+    year, month, day, hour, minute, second = date_time[:6]
+    year = max(year, 1980)
+    return (year - 1980) << 9 | month << 5 | day, hour << 11 | minute << 5 | second // 2
+
+
+def prepare_member(path, arcname, level=-1, reproducible=True):
+    """Read `path` once, computing CRC and (unless already compressed) raw deflate data."""
+    path = Path(path)
+    st = path.stat()
+    if reproducible:
+        date_time, mode = FIXED_DATE_TIME, normalized_mode(st.st_mode)
+    else:
+        date_time, mode = time.localtime(st.st_mtime)[:6], st.st_mode & 0xFFFF
+    crc = 0
+    size = 0
+    if path.suffix.lower() in STORED_EXTS:
+        with open(path, 'rb') as f:
+            while True:
+                block = f.read(BLOCK_SIZE)
+                if not block:
+                    break
+                crc = zlib.crc32(block, crc)
+                size += len(block)
+        return Member(arcname, ZIP_STORED, crc, size, size, date_time, mode, path)
+
+    spool = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX)
+    comp = zlib.compressobj(level, zlib.DEFLATED, -15)
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            size += len(block)
+            spool.write(comp.compress(block))
+    spool.write(comp.flush())
+    return Member(arcname, ZIP_DEFLATED, crc, spool.tell(), size, date_time, mode, spool)
+
+
+class ZipStreamWriter:
+    """Write prepared members sequentially, then the central directory."""
+
+    def __init__(self, fileobj):
+        self.fp = fileobj
+        self.members = []
+
+    def write_member(self, m):
+        if m.compress_size > ZIP_MAX or m.file_size > ZIP_MAX:
+            raise ValueError(f'{m.arcname}: entries larger than 4 GiB are not supported')
+        name = m.arcname.encode('utf-8')
+        date, tm = dos_date_time(m.date_time)
+        m.header_offset = self.fp.tell()
+        self.fp.write(FILE_HEADER.pack(
+            b'PK\x03\x04', 20, 0, UTF8_FLAG, m.method, tm, date,
+            m.crc, m.compress_size, m.file_size, len(name), 0))
+        self.fp.write(name)
+        m.copy_to(self.fp)
+        self.members.append(m)
+
+    def close(self):
+        start = self.fp.tell()
+        for m in self.members:
+            name = m.arcname.encode('utf-8')
+            date, tm = dos_date_time(m.date_time)
+            self.fp.write(CENTRAL_DIR.pack(
+                b'PK\x01\x02', 20, 3, 20, 0, UTF8_FLAG, m.method, tm, date,
+                m.crc, m.compress_size, m.file_size, len(name), 0, 0, 0, 0,
+                m.mode << 16, m.header_offset))
+            self.fp.write(name)
+        size = self.fp.tell() - start
+        if len(self.members) > 0xFFFF or start > ZIP_MAX:
+            raise ValueError('archive too large (zip64 is not supported)')
+        self.fp.write(END_ARCHIVE.pack(
+            b'PK\x05\x06', 0, 0, len(self.members), len(self.members), size, start, 0))
+
+
+def write_archive(entries, target, workers=None, level=-1, on_added=None, reuse=None, reproducible=True):
+    """Build a zip at `target` from `(path, arcname)` pairs.
+
+    Members are prepared in a thread pool with a bounded look-ahead window and
+    written in input order. `reuse` maps arcname -> ready Member (e.g. from
+    `reusable_members`) to skip recompression. `on_added(arcname)` is called
+    after each entry.
+    """
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    reuse = reuse or {}
+    window = workers * 2
+
+    def prepare(path, arcname):
+        member = reuse.get(arcname)
+        if member is not None:
+            return member
+        return prepare_member(path, arcname, level, reproducible)
+
+    with open(target, 'wb') as out, ThreadPoolExecutor(max_workers=workers) as pool:
+        writer = ZipStreamWriter(out)
+        pending = deque()
+        for path, arcname in entries:
+            if len(pending) >= window:
+                writer.write_member(pending.popleft().result())
+                if on_added:
+                    on_added(writer.members[-1].arcname)
+            pending.append(pool.submit(prepare, path, arcname))
+        while pending:
+            writer.write_member(pending.popleft().result())
+            if on_added:
+                on_added(writer.members[-1].arcname)
+        writer.close()
+    return target
+
+
+def file_sha256(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            block = f.read(BLOCK_SIZE)
+            if not block:
+                break
+            h.update(block)
+    return h.hexdigest()
+
+
+def build_manifest(entries, workers=None, level=-1):
+    """Return the content manifest for `(path, arcname)` pairs, hashing in parallel."""
+    entries = list(entries)
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        digests = list(pool.map(lambda e: file_sha256(e[0]), entries))
+    files = {}
+    for (path, arcname), digest in zip(entries, digests):
+        st = Path(path).stat()
+        # The archived mode is part of the output, so a chmod +x must invalidate it too.
+        files[arcname] = {'sha256': digest, 'size': st.st_size, 'mode': oct(normalized_mode(st.st_mode) & 0o777)}
+    return {'format': MANIFEST_FORMAT, 'level': level, 'files': files}
+
+
+def manifest_path_for(archive):
+    archive = Path(archive)
+    return archive.with_name(archive.name + '.manifest.json')
+
+
+def load_manifest(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_manifest(manifest, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True, ensure_ascii=False)
+        f.write('\n')
+
+
+def reusable_members(archive, old_manifest, new_manifest, entries):
+    """Members of the previous archive whose content is unchanged, as ready Members.
+
+    Only used when the previous archive was built with the same manifest format
+    and compression level; anything unreadable is simply rebuilt.
+    """
+    if not old_manifest or not Path(archive).exists():
+        return {}
+    if (old_manifest.get('format'), old_manifest.get('level')) != (new_manifest['format'], new_manifest['level']):
+        return {}
+    old_files = old_manifest.get('files', {})
+    new_files = new_manifest['files']
+    paths = {arcname: path for path, arcname in entries}
+    reuse = {}
+    try:
+        with zipfile.ZipFile(archive) as zf, open(archive, 'rb') as raw:
+            for info in zf.infolist():
+                name = info.filename
+                if name not in paths or info.compress_type not in (ZIP_STORED, ZIP_DEFLATED):
+                    continue
+                if old_files.get(name) != new_files.get(name):
+                    continue
+                raw.seek(info.header_offset)
+                header = FILE_HEADER.unpack(raw.read(FILE_HEADER.size))
+                offset = info.header_offset + FILE_HEADER.size + header[-2] + header[-1]
+                mode = normalized_mode(Path(paths[name]).stat().st_mode)
+                reuse[name] = Member(
+                    name, info.compress_type, info.CRC, info.compress_size, info.file_size,
+                    FIXED_DATE_TIME, mode, ArchiveSlice(archive, offset, info.compress_size))
+    except (OSError, zipfile.BadZipFile, struct.error):
+        return {}
+    return reuse
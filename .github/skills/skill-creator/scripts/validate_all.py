@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Bulk validation of every skill under a root (e.g. .github/skills).
+
+Discovers SKILL.md / skill.md files, validates the ones whose content changed
+since the last run in a process pool, and writes one JSON or JUnit report.
+Results are cached by file hash; the cache is invalidated automatically when
+quick_validate.py or frontmatter.py change.
+
+Usage: python -m scripts.validate_all [root] [--format json|junit] [--output report] [--cache file] [--no-cache]
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from scripts.quick_validate import SKILL_MD_NAMES, validate_content
+
+DEFAULT_CACHE = '.skill-validate-cache.json'
+SKIP_DIRS = {'.git', 'node_modules', '__pycache__'}
+
+
+def validator_fingerprint():
+    h = hashlib.sha256()
+    for name in ('quick_validate.py', 'frontmatter.py'):
+        h.update(Path(__file__).with_name(name).read_bytes())
+    return h.hexdigest()
+
+
+def discover_skill_files(root):
+    """Yield SKILL.md / skill.md paths under root, at most one per directory."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(d for d in dirnames if d not in SKIP_DIRS)
+        for name in SKILL_MD_NAMES:
+            if name in filenames:
+                yield Path(dirpath) / name
+                break
+
+
+def _validate_bytes(data):
+    try:
+        content = data.decode('utf-8')
+    except UnicodeDecodeError as e:
+        return False, f'File is not valid UTF-8: {e}'
+    return validate_content(content)
+
+
+def validate_all(root, cache_path=None, workers=None):
+    """Validate every skill under root; returns a list of result dicts."""
+    root = Path(root).resolve()
+    fingerprint = validator_fingerprint()
+    cache = {}
+    if cache_path and Path(cache_path).exists():
+        try:
+            data = json.loads(Path(cache_path).read_text(encoding='utf-8'))
+            if data.get('validator') == fingerprint:
+                cache = data.get('results', {})
+        except ValueError:
+            cache = {}
+
+    results = []
+    todo = []
+    for path in discover_skill_files(root):
+        data = path.read_bytes()
+        rel = path.relative_to(root).as_posix()
+        digest = hashlib.sha256(data).hexdigest()
+        cached = cache.get(rel)
+        if cached and cached['sha256'] == digest:
+            results.append(dict(cached, path=rel, cached=True))
+        else:
+            todo.append((rel, digest, data))
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            outcomes = pool.map(_validate_bytes, [data for _, _, data in todo], chunksize=8)
+            for (rel, digest, _), (valid, message) in zip(todo, outcomes):
+                results.append({'path': rel, 'sha256': digest, 'valid': valid, 'message': message, 'cached': False})
+
+    results.sort(key=lambda r: r['path'])
+    if cache_path:
+        payload = {
+            'validator': fingerprint,
+            'results': {r['path']: {k: r[k] for k in ('sha256', 'valid', 'message')} for r in results},
+        }
+        Path(cache_path).write_text(json.dumps(payload, indent=2, ensure_ascii=False), encoding='utf-8')
+    return results
+
+
+def to_json(results):
+    failed = sum(1 for r in results if not r['valid'])
+    return json.dumps({
+        'total': len(results),
+        'failed': failed,
+        'passed': len(results) - failed,
+        'results': results,
+    }, indent=2, ensure_ascii=False)
+
+
+def to_junit(results):
+    failed = sum(1 for r in results if not r['valid'])
+    suite = ET.Element('testsuite', name='skills', tests=str(len(results)), failures=str(failed), errors='0')
+    for r in results:
+        case = ET.SubElement(suite, 'testcase', classname='skills', name=r['path'])
+        if not r['valid']:
+            ET.SubElement(case, 'failure', message=r['message']).text = r['message']
+    return ET.tostring(suite, encoding='unicode')
+
+
+def main():
+    p = argparse.ArgumentParser(description='Validate all skills under a root directory')
+    p.add_argument('root', nargs='?', default='.', help='Directory to search for SKILL.md / skill.md')
+    p.add_argument('--format', choices=('json', 'junit'), default='json')
+    p.add_argument('--output', help='Write the report to a file instead of stdout')
+    p.add_argument('--cache', default=DEFAULT_CACHE, help='Result cache file')
+    p.add_argument('--no-cache', action='store_true', help='Ignore and do not write the cache')
+    p.add_argument('--workers', type=int, help='Process pool size')
+    args = p.parse_args()
+
+    results = validate_all(args.root, cache_path=None if args.no_cache else args.cache, workers=args.workers)
+    report = to_junit(results) if args.format == 'junit' else to_json(results)
+    if args.output:
+        Path(args.output).write_text(report, encoding='utf-8')
+    else:
+        print(report)
+    sys.exit(0 if all(r['valid'] for r in results) else 1)
+
+
+if __name__ == '__main__':
+    main()